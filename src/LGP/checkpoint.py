@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: checkpoint.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the checkpoints of the run, i.e. the population, statistics, fittest
+           individual and states of the random generators saved as arrays of a .npz file, so a run
+           which has died can be resumed and continues exactly as if it had not been interrupted.
+"""
+
+import os
+import time
+import random
+import threading
+import numpy as np
+from codec import encode, decode, encode_population, decode_population
+from init_params import CHECKPOINT_INTERVAL, CHECKPOINT_SECONDS
+
+CHECKPOINT_VERSION = 2
+
+
+class Checkpointer:
+    """
+    This class saves the checkpoints of the run every CHECKPOINT_INTERVAL generations and/or
+    every CHECKPOINT_SECONDS seconds. The state is encoded by the run, but written by a thread,
+    so the run does not wait for the disk. When the writer is still busy, only the newest
+    checkpoint waits for it.
+    """
+
+    def __init__(self, path, run, interval = CHECKPOINT_INTERVAL, seconds = CHECKPOINT_SECONDS):
+        """
+        Args:
+            path (str): path to the checkpoint
+            run (dict): config, gens, budget, start (perf_counter() of the run) and recording of the run
+            interval (int): generations between the checkpoints, 0 when not used
+            seconds (float): seconds between the checkpoints, 0 when not used
+        """
+        self.path = path
+        self.run = run
+        self.interval = interval
+        self.seconds = seconds
+        self.last = time.monotonic()  # time of the last checkpoint
+
+        self.condition = threading.Condition()
+        self.snapshot = None  # encoded checkpoint waiting for the writer
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_snapshots, daemon=True)
+        self.writer.start()
+
+
+    def save(self, gen, population, fitnesses, best_of_run):
+        """Encodes the state of the run after the generation, if the checkpoint is due.
+
+        Args:
+            gen (int): finished generation
+            population (list): evaluated population
+            fitnesses (dict): statistics of the run
+            best_of_run (dict): fittest individual of the run
+        """
+        due = self.interval and (gen + 1) % self.interval == 0
+        due = due or (self.seconds and time.monotonic() - self.last >= self.seconds)
+        if not due:
+            return
+
+        self.last = time.monotonic()
+        snapshot = encode_state(gen, population, fitnesses, best_of_run, self.run)
+        with self.condition:
+            self.snapshot = snapshot
+            self.condition.notify()
+
+
+    def close(self, finished = True):
+        """Waits for the writer, the checkpoint of a finished run is removed.
+
+        Args:
+            finished (bool): whether the run has finished
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.writer.join()
+
+        if finished and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+    def _write_snapshots(self):
+        """
+        Writes the checkpoints until the checkpointer is closed, the new checkpoint replaces
+        the old one only when it is complete.
+        """
+        while True:
+            with self.condition:
+                while self.snapshot is None and not self.closed:
+                    self.condition.wait()
+                snapshot, self.snapshot = self.snapshot, None
+            if snapshot is None:
+                return
+
+            temporary = self.path + '.writing'
+            with open(temporary, 'wb') as checkpoint_file:
+                np.savez_compressed(checkpoint_file, **snapshot)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+            os.replace(temporary, self.path)
+
+
+def encode_state(gen, population, fitnesses, best_of_run, run):
+    """Encodes the state of the run into numpy arrays, the programs are encoded into one buffer, see codec.py.
+
+    Args:
+        gen (int): finished generation
+        population (list): evaluated population
+        fitnesses (dict): statistics of the run
+        best_of_run (dict): fittest individual of the run
+        run (dict): config, gens, budget, start and recording of the run
+
+    Returns:
+        dict: arrays of the checkpoint
+    """
+    python_state = random.getstate()
+    numpy_state = np.random.get_state()
+
+    state = {
+        'version': np.array(CHECKPOINT_VERSION),
+        'gen': np.array(gen),
+        'config': np.array(run['config'], dtype=np.float64),
+        'gens': np.array(run['gens']),
+        'budget': np.array(run['budget']),
+        'elapsed': np.array(time.perf_counter() - run['start']),
+        'recording': np.array(run['recording'] or ''),
+        'programs': np.frombuffer(encode_population(population), dtype=np.uint8),
+        'fitness': np.array([individual.fitness for individual in population], dtype=np.int16),
+        'numpy_fitness': np.array(isinstance(population[0].fitness, np.generic)), # type of the fitnesses given by the engine
+        'best': np.array(fitnesses['best'], dtype=np.int16),
+        'best_gen': np.array(fitnesses['best_gen'], dtype=np.int16),
+        'avg_gen': np.array(fitnesses['avg_gen'], dtype=np.float64),
+        'worst_gen': np.array(fitnesses['worst_gen'], dtype=np.int16),
+        'saved_gen': np.array(fitnesses['saved_gen'], dtype=np.int64),
+        'best_fitness': np.array(best_of_run['fitness']),
+        'best_found': np.array(best_of_run['gen']),
+        'random_state': np.array(python_state[1], dtype=np.uint32),
+        'random_gauss': np.array(np.nan if python_state[2] is None else python_state[2]),
+        'numpy_keys': numpy_state[1],
+        'numpy_state': np.array(numpy_state[2:4], dtype=np.int64),
+        'numpy_gauss': np.array(numpy_state[4])
+    }
+
+    if best_of_run['individual'] is not None:
+        state['best_program'] = np.frombuffer(encode(best_of_run['individual']), dtype=np.uint8)
+        state['best_path'] = best_of_run['path']
+
+    return state
+
+
+def load_checkpoint(path):
+    """Decodes the checkpoint saved by Checkpointer, the random generators are restored
+        by restore_random() right before the evolution continues.
+
+    Args:
+        path (str): path to the checkpoint
+
+    Returns:
+        dict: state of the run (gen, population, fitnesses, best_of_run, config, gens, budget, elapsed,
+              recording and random), None when there is no checkpoint
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as data:
+        if int(data['version']) != CHECKPOINT_VERSION:
+            raise ValueError("Unsupported version of the checkpoint " + str(int(data['version'])))
+
+        fitness_type = np.int64 if bool(data['numpy_fitness']) else int
+        population = decode_population(data['programs'].tobytes())
+        for individual, fitness in zip(population, data['fitness'].tolist()):
+            individual.fitness = fitness_type(fitness)
+
+        fitnesses = {
+            'all_gen': [individual.fitness for individual in population],
+            'best': [fitness_type(fitness) for fitness in data['best'].tolist()],
+            'best_gen': [fitness_type(fitness) for fitness in data['best_gen'].tolist()],
+            'avg_gen': list(data['avg_gen']),
+            'worst_gen': [fitness_type(fitness) for fitness in data['worst_gen'].tolist()],
+            'saved_gen': data['saved_gen'].tolist()
+        }
+
+        best_of_run = {'individual': None, 'fitness': int(data['best_fitness']), 'gen': int(data['best_found']),
+                       'best_of_run_path': 0}
+        if 'best_program' in data.files:
+            best_of_run['individual'] = decode(data['best_program'].tobytes())
+            best_of_run['fitness'] = fitness_type(data['best_fitness'])
+            best_of_run['path'] = data['best_path']
+
+        gauss = float(data['random_gauss'])
+        pos, has_gauss = data['numpy_state'].tolist()
+        config = data['config'].tolist()
+
+        return {
+            'gen': int(data['gen']),
+            'population': population,
+            'fitnesses': fitnesses,
+            'best_of_run': best_of_run,
+            'config': [int(config[0]), config[1], config[2]],
+            'gens': int(data['gens']),
+            'budget': int(data['budget']),
+            'elapsed': float(data['elapsed']),
+            'recording': str(data['recording']) or None,
+            'random': ((3, tuple(data['random_state'].tolist()), None if np.isnan(gauss) else gauss),
+                       ('MT19937', data['numpy_keys'], pos, has_gauss, float(data['numpy_gauss'])))
+        }
+
+
+def restore_random(state):
+    """
+    Restores the states of the random generators saved in the checkpoint.
+    """
+    python_state, numpy_state = state['random']
+    random.setstate(python_state)
+    np.random.set_state(numpy_state)
+
@@ -7,7 +7,10 @@
     date: 8/5/2023
     brief: This folder contains classes to represent individuals and instructions and their methods.
 """
-import numpy as np
+from ant import AntState
+from interpret import decode_program
+from effective import effective_code
+from init_params import ELIMINATE_INTRONS
 
 class Instruction:
     """Represents instuctions in individuals"""
@@ -24,30 +27,112 @@ class Instruction:
         self.fnc = fnc
 
 
+    def replaced(self, data, fnc=False):
+        """Returns a copy of the instruction with the new data. The instructions are shared
+            by the programs, so the operators replace them instead of set_inst()"""
+        return Instruction(data, self.label, fnc, self.symb)
+
+
+    @staticmethod
+    def parse(data):
+        """Creates the instruction from its text, the flags are derived from it"""
+        if data[0] == '*':
+            return Instruction(data, label=True, symb=data.split()[2][:-1])
+        return Instruction(data, fnc=data[:2] == 'IF')
+
+
 class Individual:
     """Represents individuals in population"""
     instructions = []
 
     def __init__(self):
         self.fitness = 0
-        self.trail = [[0,0]]
-        self.ant = { 'pos': [0,0], 'dir': 'right' }
+        self.ant = AntState()  # ant's position, direction and trail
         self.instructions = []
+        self.decoded = None  # decoded form of the instructions, built lazily by get_decoded()
+        self.effective = None  # effective code without introns, built lazily by get_effective()
+
+
+    @property
+    def trail(self):
+        """Returns ant's trail as an array of [x, y] pairs"""
+        return self.ant.trail
 
 
     def reset_ant_info(self):
-        self.trail = [[0,0]]
-        self.ant = { 'pos': [0,0], 'dir': 'right' }
+        self.ant.reset()
 
 
-    def set_ant_info(self, trail, ant):
-        self.trail = trail
+    def set_ant_info(self, ant):
         self.ant = ant
 
 
     def insert_inst(self, instruction):
         """Inserts instruction at the end of the program"""
         self.instructions.append(instruction)
+        self.decoded = None
+        self.effective = None
+
+
+    def get_decoded(self):
+        """Returns the decoded form of the program, decodes it when the program has changed.
+            With ELIMINATE_INTRONS only the effective code is decoded."""
+        if self.decoded is None:
+            self.decoded = decode_program(self.get_effective() if ELIMINATE_INTRONS else self.instructions)
+        return self.decoded
+
+
+    def get_effective(self):
+        """Returns the effective code of the program as a list of instructions, see effective.py"""
+        if self.effective is None:
+            self.effective = [Instruction.parse(data) for data in effective_code(self.instructions)]
+        return self.effective
+
+
+    def canonical_key(self):
+        """Returns the effective code as a tuple of strings, it is the same for programs
+            differing only in introns and names of subroutines"""
+        return tuple(instruction.data for instruction in self.get_effective())
+
+
+    def copy(self):
+        """Returns a copy of the program sharing its instructions, the decoded form and
+            the effective code. The operators never change the shared instructions in place,
+            they copy the list of the instructions before they change it."""
+        individual = Individual()
+        individual.fitness = self.fitness
+        individual.instructions = list(self.instructions)
+        individual.decoded = self.decoded
+        individual.effective = self.effective
+        return individual
+
+
+    def serialize(self):
+        """Serializes the program into its text, one instruction per line"""
+        return "\n".join(instruction.data for instruction in self.instructions)
+
+
+    @staticmethod
+    def deserialize(text):
+        """Creates the program serialized by serialize().
+
+        Args:
+            text (str): serialized program
+
+        Returns:
+            Individual: program
+        """
+        individual = Individual()
+        if text:
+            individual.instructions = [Instruction.parse(data) for data in text.split("\n")]
+        return individual
+
+
+    def invalidate_decoded(self):
+        """Drops the decoded form and the effective code of the program, must be called
+            whenever its instructions change"""
+        self.decoded = None
+        self.effective = None
         
 
     def get_fitness(self):
@@ -75,7 +160,7 @@ class Individual:
         inst_ord = 0
         while not self.instructions[inst_ord].label:
             length += 1
-            if self.instructions[inst_ord+1] == self.instructions[-1]: break
+            if inst_ord + 1 == len(self.instructions) - 1: break
             inst_ord += 1
         
         return length
@@ -93,7 +178,7 @@ class Individual:
         inst_ord = self.get_first_inst_subroutine(subroutine) + 1  # position
         while not self.instructions[inst_ord].label:
             length += 1
-            if self.instructions[inst_ord] == self.instructions[-1]: # if this is the last instruction
+            if inst_ord == len(self.instructions) - 1: # if this is the last instruction
                 break
             inst_ord += 1
     
@@ -120,19 +205,14 @@ class Individual:
         
         return inst_ord
     
-    def count_fitness(self, array):
-        """ Fitness function, which counts number of ones present in the arrat
+    def count_fitness(self, world):
+        """ Fitness function, which counts the food cells not eaten by the ant
 
         Args:
-            ant_path (array): ant's path
-            array (array): food tiles
+            world (World): food map with the food eaten by the ant
 
         Returns:
             int: fitness value
         """
-        fitness_value = None
-        for point in self.trail:
-            array[point[0]][point[1]] = 2
-        fitness_value = np.count_nonzero(array == 1)
-        self.fitness = fitness_value                       
-        return fitness_value
\ No newline at end of file
+        self.fitness = world.remaining_food()
+        return self.fitness
\ No newline at end of file
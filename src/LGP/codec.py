@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: codec.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the versioned codec of the programs. A program is encoded as the table
+           of its segments (main program and subroutines) followed by the stream of the opcodes and
+           operands of its instructions, or as a compact text of one character per opcode or operand.
+           Whole populations are encoded into one buffer, which is sent between the processes
+           and saved in the checkpoints.
+"""
+
+import struct
+import numpy as np
+from classes import Individual, Instruction
+from interpret import OPCODES, OP_IF_FOOD_AHEAD, OP_CALL
+from init_params import SUBROUTINE_SYMBOLS
+
+CODEC_VERSION = 1
+MAGIC = b"LGP"  # binary program or population
+TEXT_MAGIC = "L"  # compact text of a program
+
+MAIN_SEGMENT = 255  # symbol of the main program in the table of the segments
+IF_PREFIX = "IF FOOD_AHEAD ? "
+
+# operands of the branches of IF_FOOD_AHEAD, the subroutines are called by OP_CALL + index of their symbol
+OPERANDS = dict(OPCODES, **{symbol: OP_CALL + i for i, symbol in enumerate(SUBROUTINE_SYMBOLS)})
+OPERAND_NAMES = {operand: name for name, operand in OPERANDS.items()}
+OPCODE_NAMES = {opcode: name for name, opcode in OPCODES.items()}
+
+# characters of the compact text, the upper-case letters are the symbols of the subroutines
+CHARACTERS = {'LEFT': 'l', 'RIGHT': 'r', 'MOVE': 'm', '2XMOVE': 'd'}
+CHARACTER_NAMES = {character: name for name, character in CHARACTERS.items()}
+
+HEADER = struct.Struct("<3sBI")  # magic, version and number of the programs of the population
+SEGMENT = struct.Struct("<BH")  # symbol and number of the instructions of the segment
+
+
+def encode(individual):
+    """Encodes the program into bytes, the header (magic and version) is followed by its body.
+
+    Args:
+        individual (Individual): program
+
+    Returns:
+        bytes: encoded program
+    """
+    return MAGIC + bytes([CODEC_VERSION]) + _encode_body(individual)
+
+
+def decode(data):
+    """Creates the program encoded by encode().
+
+    Args:
+        data (bytes): encoded program
+
+    Returns:
+        Individual: program
+    """
+    data = bytes(data)
+    _check_header(data[:3], data[3])
+    individual, _ = _decode_body(data, 4)
+    return individual
+
+
+def encode_text(individual):
+    """Encodes the program into a compact text, the segments are separated by '|' and every
+        subroutine starts with its symbol, e.g. 'L1:m?Ar|Alm' for the main program
+        'MOVE', 'IF FOOD_AHEAD ? A : RIGHT' and the subroutine A of 'LEFT', 'MOVE'.
+
+    Args:
+        individual (Individual): program
+
+    Returns:
+        str: encoded program
+    """
+    segments = []
+    for symbol, instructions in _segments(individual):
+        text = "" if symbol is None else symbol
+        for instruction in instructions:
+            if instruction.data.startswith(IF_PREFIX):
+                true_opt, false_opt = _branches(instruction.data)
+                text += "?" + CHARACTERS.get(true_opt, true_opt) + CHARACTERS.get(false_opt, false_opt)
+            else:
+                text += _character(instruction.data)
+        segments.append(text)
+
+    return TEXT_MAGIC + str(CODEC_VERSION) + ":" + "|".join(segments)
+
+
+def decode_text(text):
+    """Creates the program encoded by encode_text().
+
+    Args:
+        text (str): encoded program, the surrounding whitespace is ignored
+
+    Returns:
+        Individual: program
+    """
+    header, _, body = text.strip().partition(":")
+    if header != TEXT_MAGIC + str(CODEC_VERSION):
+        raise ValueError("Unsupported header of the encoded program '" + header + "'")
+
+    individual = Individual()
+    for number, segment in enumerate(body.split("|")):
+        if number:
+            individual.instructions.append(_label(segment[0]))
+            segment = segment[1:]
+
+        characters = iter(segment)
+        for character in characters:
+            if character == "?":
+                true_opt, false_opt = next(characters), next(characters)
+                data = IF_PREFIX + CHARACTER_NAMES.get(true_opt, true_opt) + " : " + CHARACTER_NAMES.get(false_opt, false_opt)
+                individual.instructions.append(Instruction(data, fnc=True))
+            else:
+                individual.instructions.append(Instruction(CHARACTER_NAMES[character]))
+
+    return individual
+
+
+def encode_population(population):
+    """Encodes the programs of the population into one buffer. The header is followed by the table
+        of the offsets of the programs (uint32) and the bodies of the programs.
+
+    Args:
+        population (list): programs
+
+    Returns:
+        bytes: encoded population
+    """
+    programs = [_encode_body(individual) for individual in population]
+    offsets = np.cumsum([0] + [len(program) for program in programs], dtype=np.uint32)
+    return HEADER.pack(MAGIC, CODEC_VERSION, len(programs)) + offsets.tobytes() + b"".join(programs)
+
+
+def decode_population(data):
+    """Creates the programs of the population encoded by encode_population().
+
+    Args:
+        data (bytes): encoded population
+
+    Returns:
+        list: programs
+    """
+    data = bytes(data)
+    magic, version, count = HEADER.unpack_from(data)
+    _check_header(magic, version)
+
+    offsets = np.frombuffer(data, dtype=np.uint32, count=count + 1, offset=HEADER.size).tolist()
+    start = HEADER.size + 4 * (count + 1)
+    return [_decode_body(data, start + offsets[i])[0] for i in range(count)]
+
+
+def _encode_body(individual):
+    """
+    Encodes the table of the segments and the stream of the instructions. An instruction is its
+    opcode, IF_FOOD_AHEAD is followed by the operands of its branches, the labels are left out,
+    they are given by the table.
+    """
+    segments = _segments(individual)
+    table = bytearray([len(segments)])
+    stream = bytearray()
+
+    for symbol, instructions in segments:
+        table += SEGMENT.pack(MAIN_SEGMENT if symbol is None else SUBROUTINE_SYMBOLS.index(symbol), len(instructions))
+        for instruction in instructions:
+            if instruction.data.startswith(IF_PREFIX):
+                true_opt, false_opt = _branches(instruction.data)
+                stream += bytes([OP_IF_FOOD_AHEAD, OPERANDS[true_opt], OPERANDS[false_opt]])
+            elif instruction.data in OPCODES:
+                stream.append(OPCODES[instruction.data])
+            else:
+                raise ValueError("Instruction '" + instruction.data + "' cannot be encoded")
+
+    return bytes(table + stream)
+
+
+def _decode_body(data, position):
+    """
+    Decodes the body starting at the position, returns the program and the position after it.
+    """
+    segments = data[position]
+    table = [SEGMENT.unpack_from(data, position + 1 + SEGMENT.size * i) for i in range(segments)]
+    position += 1 + SEGMENT.size * segments
+
+    individual = Individual()
+    for symbol, length in table:
+        if symbol != MAIN_SEGMENT:
+            individual.instructions.append(_label(SUBROUTINE_SYMBOLS[symbol]))
+
+        for _ in range(length):
+            opcode = data[position]
+            if opcode == OP_IF_FOOD_AHEAD:
+                data_if = IF_PREFIX + OPERAND_NAMES[data[position + 1]] + " : " + OPERAND_NAMES[data[position + 2]]
+                individual.instructions.append(Instruction(data_if, fnc=True))
+                position += 3
+            else:
+                individual.instructions.append(Instruction(OPCODE_NAMES[opcode]))
+                position += 1
+
+    return individual, position
+
+
+def _segments(individual):
+    """
+    Splits the program into the segments, i.e. (symbol, instructions) pairs, the symbol
+    of the main program is None.
+    """
+    segments = [(None, [])]
+    for instruction in individual.instructions:
+        if instruction.data[0] == '*':
+            segments.append((_symbol(instruction.data), []))
+        else:
+            segments[-1][1].append(instruction)
+    return segments
+
+
+def _symbol(data):
+    """
+    Returns the symbol of the subroutine's label '* SR A:', the label must be in this form.
+    """
+    symbol = data.split()[2][:-1]
+    if data != _label(symbol).data:
+        raise ValueError("Label '" + data + "' cannot be encoded")
+    return symbol
+
+
+def _label(symbol):
+    """
+    Returns the label of the subroutine.
+    """
+    if symbol not in SUBROUTINE_SYMBOLS:
+        raise ValueError("Unknown subroutine '" + symbol + "'")
+    return Instruction("* SR " + symbol + ":", label=True, symb=symbol)
+
+
+def _branches(data):
+    """
+    Returns the options of the branches of IF_FOOD_AHEAD.
+    """
+    words = data.split() # [IF, FOOD_AHEAD, ?, E, :, B]
+    if len(words) != 6 or words[3] not in OPERANDS or words[5] not in OPERANDS\
+            or data != IF_PREFIX + words[3] + " : " + words[5]:
+        raise ValueError("Instruction '" + data + "' cannot be encoded")
+    return words[3], words[5]
+
+
+def _character(data):
+    """
+    Returns the character of the instruction in the compact text.
+    """
+    if data not in CHARACTERS:
+        raise ValueError("Instruction '" + data + "' cannot be encoded")
+    return CHARACTERS[data]
+
+
+def _check_header(magic, version):
+    """
+    Raises ValueError when the data are not encoded by this version of the codec.
+    """
+    if magic != MAGIC:
+        raise ValueError("The data are not an encoded program")
+    if version != CODEC_VERSION:
+        raise ValueError("Unsupported version of the encoded program " + str(version))
@@ -11,7 +11,6 @@
 """
 from random import randint
 from classes import Individual
-from copy import deepcopy
 from init_params import MAX_PROGRAM_LENGTH, MAX_SUBROUTINES, MIN_PROGRAM_LENGTH
 
 
@@ -29,28 +28,28 @@ def subroutines_crossover(individual_1, individual_2, new_individual_1, new_indi
     pos = first_sr_pos
     while not new_individual_1.instructions[pos+1].label:
         del new_individual_1.instructions[pos+1]
-        if new_individual_1.instructions[pos] == new_individual_1.instructions[-1]:
+        if pos == len(new_individual_1.instructions) - 1:
             break
 
     pos = second_sr_pos
     while not new_individual_2.instructions[pos+1].label:
         del new_individual_2.instructions[pos+1]
-        if new_individual_2.instructions[pos] == new_individual_2.instructions[-1]:
+        if pos == len(new_individual_2.instructions) - 1:
             break
 
     # insert subroutines into new individuals
     while not individual_2.instructions[second_sr_pos_old+1].label:
-        new_individual_1.instructions.insert(first_sr_pos+1,deepcopy(individual_2.instructions[second_sr_pos_old+1]))
+        new_individual_1.instructions.insert(first_sr_pos+1,individual_2.instructions[second_sr_pos_old+1])
         second_sr_pos_old += 1
         first_sr_pos += 1
-        if individual_2.instructions[second_sr_pos_old] == individual_2.instructions[-1]:
+        if second_sr_pos_old == len(individual_2.instructions) - 1:
             break
 
     while not individual_1.instructions[first_sr_pos_old+1].label:
-        new_individual_2.instructions.insert(second_sr_pos+1,deepcopy(individual_1.instructions[first_sr_pos_old+1]))
+        new_individual_2.instructions.insert(second_sr_pos+1,individual_1.instructions[first_sr_pos_old+1])
         first_sr_pos_old += 1
         second_sr_pos += 1
-        if individual_1.instructions[first_sr_pos_old] == individual_1.instructions[-1]:
+        if first_sr_pos_old == len(individual_1.instructions) - 1:
             break
 
     return new_individual_1, new_individual_2
@@ -59,6 +58,7 @@ def one_point_crossover(individual_1, individual_2):
     """Simple one-point crossovers where last two segments replace each other 
     both parents. Randomly selected subroutine from each parents will also change
     their place.
+    The offspring share the instructions with the parents, they are not copied.
 
     Args:
         individual_1 (Individual): first parent
@@ -80,25 +80,25 @@ def one_point_crossover(individual_1, individual_2):
     # copy the first part of the first parent to the new individual
     inst_ord = 0
     while inst_ord < crossover_point_1:
-        new_individual_1.instructions.append(deepcopy(individual_1.instructions[inst_ord]))
+        new_individual_1.instructions.append(individual_1.instructions[inst_ord])
         inst_ord += 1
 
     # copy the first part of the second parent to the new individual
     inst_ord = 0
     while inst_ord < crossover_point_2:
-        new_individual_2.instructions.append(deepcopy(individual_2.instructions[inst_ord]))
+        new_individual_2.instructions.append(individual_2.instructions[inst_ord])
         inst_ord += 1
 
     # copy the second part of the first parent to the second new individual
     inst_ord = crossover_point_1
     while inst_ord < individual_1.get_length():
-        new_individual_2.instructions.append(deepcopy(individual_1.instructions[inst_ord]))
+        new_individual_2.instructions.append(individual_1.instructions[inst_ord])
         inst_ord += 1
 
     # copy the second part of the second part to the first new individual
     inst_ord = crossover_point_2
     while inst_ord < individual_2.get_length():
-        new_individual_1.instructions.append(deepcopy(individual_2.instructions[inst_ord]))
+        new_individual_1.instructions.append(individual_2.instructions[inst_ord])
         inst_ord += 1
 
     # check whether the new offspring fits in the limit size or not
@@ -128,6 +128,7 @@ def two_point_crossover(individual_1, individual_2):
     """Simple two-point crossovers where the midle segments replace each other 
     both parents. Randomly selected subroutine from each parents will also change
     their place.
+    The offspring share the instructions with the parents, they are not copied.
 
     Args:
         individual_1 (Individual): first parent
@@ -156,37 +157,37 @@ def two_point_crossover(individual_1, individual_2):
     # copy the left segment from the first parent to the first new individual
     inst_ord = 0
     while inst_ord < crossover_point_1:
-        new_individual_1.instructions.append(deepcopy(individual_1.instructions[inst_ord]))
+        new_individual_1.instructions.append(individual_1.instructions[inst_ord])
         inst_ord += 1
 
     # copy the left segment from the second parent to the second new individual
     inst_ord = 0
     while inst_ord < crossover_point_2:
-        new_individual_2.instructions.append(deepcopy(individual_2.instructions[inst_ord]))
+        new_individual_2.instructions.append(individual_2.instructions[inst_ord])
         inst_ord += 1
 
     # copy the middle segment from the first parent to the second new individual
     inst_ord = crossover_point_1
     while inst_ord < segment_ind1:
-        new_individual_2.instructions.append(deepcopy(individual_1.instructions[inst_ord]))
+        new_individual_2.instructions.append(individual_1.instructions[inst_ord])
         inst_ord += 1
 
     # copy the middle segment from the second parent to the first new individual
     inst_ord = crossover_point_2
     while inst_ord < segment_ind2:
-        new_individual_1.instructions.append(deepcopy(individual_2.instructions[inst_ord]))
+        new_individual_1.instructions.append(individual_2.instructions[inst_ord])
         inst_ord += 1
     
     # copy the right segment from the first parent to the first new individual
     inst_ord = segment_ind1
     while inst_ord < individual_1.get_length():
-        new_individual_1.instructions.append(deepcopy(individual_1.instructions[inst_ord]))
+        new_individual_1.instructions.append(individual_1.instructions[inst_ord])
         inst_ord += 1
 
      # copy the right segment from the second parent to the second new individual
     inst_ord = segment_ind2
     while inst_ord < individual_2.get_length():
-        new_individual_2.instructions.append(deepcopy(individual_2.instructions[inst_ord]))
+        new_individual_2.instructions.append(individual_2.instructions[inst_ord])
         inst_ord += 1
 
     # check whether the new offspring fits in the limit size or not
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: effective.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains an analysis searching for the effective code of LGP programs,
+           i.e. the code without introns, in a canonical form.
+"""
+
+from interpret import (decode_program, OPCODES, OP_NOP, OP_LEFT, OP_RIGHT,
+                       OP_IF_FOOD_AHEAD, OP_CALL)
+from init_params import SUBROUTINE_SYMBOLS
+
+INSTRUCTIONS = {opcode: name for name, opcode in OPCODES.items()}  # names of the opcodes
+MISSING_SUBROUTINE = 'NOP'  # branch calling a subroutine which does not exist
+
+# shortest sequence of turns for each net rotation by 90° clockwise
+TURNS = [[], ['RIGHT'], ['RIGHT', 'RIGHT'], ['LEFT']]
+
+
+def effective_code(instructions):
+    """Computes the effective code of the program. Only the main program and subroutines
+        reachable from it are kept, instructions doing nothing are dropped, IF_FOOD_AHEAD
+        with the same instruction in both branches is replaced by the instruction and
+        every run of turns is replaced by the shortest run with the same rotation.
+        Subroutines are renamed by the order of their first call, so programs behaving
+        in the same way usually end up with the same code.
+
+        The effective code is interpreted exactly as the original program, including
+        the unusual cases like calls from subroutines or a main program starting with
+        a label, which executes the subroutine behind the label.
+
+    Args:
+        instructions (list): instructions of the program
+
+    Returns:
+        list: instructions of the effective code as strings
+    """
+    if not instructions:
+        return []
+
+    ops, branches, segment_end, _ = decode_program(instructions)
+    symbols = {} # canonical symbols of reachable subroutines by position of their labels
+    starts = [] # positions of labels of reachable subroutines in the order of their first call
+
+    main = _effective_segment(0, ops, branches, segment_end, symbols, starts)
+    if not main: # the pass of the program does nothing
+        return []
+
+    code = main
+    for start in starts: # the list grows while new calls are found
+        code.append("* SR " + symbols[start] + ":")
+        code.extend(_effective_segment(start, ops, branches, segment_end, symbols, starts))
+
+    return code
+
+
+def _effective_segment(start, ops, branches, segment_end, symbols, starts):
+    """Computes the effective code of one segment (main program or subroutine).
+
+    Args:
+        start (int): position of the first instruction (label) of the segment
+        ops (list): decoded opcodes
+        branches (tuple): decoded branches of IF_FOOD_AHEAD
+        segment_end (list): ends of segments
+        symbols (dict): canonical symbols of already reachable subroutines
+        starts (list): positions of already reachable subroutines
+
+    Returns:
+        list: effective instructions of the segment as strings
+    """
+    true_ops, true_targets, false_ops, false_targets = branches
+    code = []
+    rotation = 0 # net rotation of the current run of turns
+
+    position = start
+    while True:
+        op = ops[position]
+
+        if op == OP_IF_FOOD_AHEAD:
+            true_branch = _branch_symbol(true_ops[position], true_targets[position], symbols, starts)
+            false_branch = _branch_symbol(false_ops[position], false_targets[position], symbols, starts)
+
+            if true_branch == false_branch and true_ops[position] != OP_CALL:
+                op = true_ops[position] # the condition does not matter
+            else:
+                code.extend(TURNS[rotation])
+                rotation = 0
+                code.append("IF FOOD_AHEAD ? " + true_branch + " : " + false_branch)
+
+        if op == OP_RIGHT:
+            rotation = (rotation + 1) % 4
+        elif op == OP_LEFT:
+            rotation = (rotation + 3) % 4
+        elif op != OP_NOP and op != OP_IF_FOOD_AHEAD:
+            code.extend(TURNS[rotation])
+            rotation = 0
+            code.append(INSTRUCTIONS[op])
+
+        if segment_end[position]:
+            break
+        position += 1
+
+    code.extend(TURNS[rotation])
+
+    return code
+
+
+def _branch_symbol(op, target, symbols, starts):
+    """Returns the canonical symbol of the branch of IF_FOOD_AHEAD, the subroutine called
+        for the first time gets the next free symbol.
+
+    Args:
+        op (int): decoded opcode of the branch
+        target (int): position of the called subroutine
+        symbols (dict): canonical symbols of already reachable subroutines
+        starts (list): positions of already reachable subroutines
+
+    Returns:
+        str: instruction or symbol of the subroutine
+    """
+    if op == OP_CALL:
+        if target not in symbols:
+            symbols[target] = SUBROUTINE_SYMBOLS[len(starts)]
+            starts.append(target)
+        return symbols[target]
+
+    if op == OP_NOP:
+        return MISSING_SUBROUTINE
+
+    return INSTRUCTIONS[op]
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: executor.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains evaluation backends running the simulations of a batch
+           of programs serially, in a pool of threads or in a pool of processes, which
+           get the programs either pickled or through shared memory, or by the workers
+           of an evaluation broker.
+"""
+
+import os
+import threading
+import numpy as np
+from copy import deepcopy
+from itertools import repeat
+from multiprocessing import Process
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from ant import run_passes, TRAIL_CAPACITY
+from world import World
+from classes import Individual
+from shared_arena import SharedArena, view
+from broker import Broker, run_worker
+from interpret import interpret_trail, run_decoded, decode_program, flatten_program, unflatten_program
+from init_params import (EVAL_ENGINE, EVAL_BACKEND, EVAL_WORKERS, EVAL_CHUNKSIZE,
+                         EVAL_BROKER_HOST, EVAL_BROKER_PORT)
+
+BACKENDS = ('SERIAL', 'THREADS', 'PROCESSES', 'SHARED_MEMORY', 'BROKER')
+FLAT_ENGINE = 'DECODED'  # engine of the programs in shared memory
+CHUNKS_PER_WORKER = 4  # chunks of the batch for every worker when the chunk size is automatic
+
+_local = threading.local()  # world and individual holding the ant of the evaluating thread
+_process_world = None  # world of the run published to the worker process, see _init_process()
+
+
+def encode_program(individual, flat = False):
+    """Converts the individual to the form sent to the workers, i.e. the decoded program
+        or the instructions for the 'TEXT' engine.
+
+    Args:
+        individual (Individual): individual to be evaluated
+        flat (bool): whether the program is going to be placed in shared memory,
+                     it is always decoded and packed by flatten_program() then
+
+    Returns:
+        tuple/list/ndarray: program to be evaluated by evaluate_programs()
+    """
+    if flat:
+        return flatten_program(individual.get_decoded() if EVAL_ENGINE == 'DECODED'
+                               else decode_program(individual.instructions))
+    if EVAL_ENGINE == 'DECODED':
+        return individual.get_decoded()
+    return individual.instructions
+
+
+def load_program(flat):
+    """Converts the program read from shared memory to the form of FLAT_ENGINE.
+
+    Args:
+        flat (ndarray): program packed by flatten_program()
+
+    Returns:
+        tuple: decoded program
+    """
+    return unflatten_program(flat)
+
+
+def evaluate_programs(programs, world = None, engine = EVAL_ENGINE):
+    """Lets the ants controlled by the programs walk through the grid one after another.
+        This is the task run by the workers.
+
+    Args:
+        programs (list): programs encoded by encode_program()
+        world (World): food map of the trail, the world published to the process when None
+        engine (str): engine interpreting the programs
+
+    Returns:
+        list: fitness, trail, final state of the ant and skipped passes for each program
+    """
+    world, individual = _worker_state(_process_world if world is None else world)
+    ant = individual.ant
+
+    results = []
+    for program in programs:
+        ant.reset()
+        world.start(ant)
+
+        if engine == 'DECODED':
+            run_decoded(program, ant, world)
+        else:
+            individual.instructions = program
+            run_passes(ant, lambda: interpret_trail(individual, ant, world))
+
+        results.append((world.remaining_food(), ant.trail.copy(), (ant.x, ant.y, ant.dir), ant.saved_steps))
+
+    return results
+
+
+def evaluate_shared(layout, start, stop):
+    """Evaluates the programs of the batch from 'start' to 'stop' placed in shared memory
+        and writes their results back to it. This is the task run by the workers
+        of the 'SHARED_MEMORY' backend.
+
+    Args:
+        layout (dict): descriptions of the shared arrays, see SharedArena.layout()
+        start (int): index of the first program
+        stop (int): index behind the last program
+    """
+    codes, offsets = view(layout, 'programs'), view(layout, 'offsets')
+    programs = [load_program(codes[offsets[i]:offsets[i + 1]]) for i in range(start, stop)]
+
+    fitnesses, lengths, states = view(layout, 'fitnesses'), view(layout, 'lengths'), view(layout, 'states')
+    saved, trails = view(layout, 'saved'), view(layout, 'trails')
+
+    for i, (fitness, trail, state, saved_steps) in enumerate(evaluate_programs(programs, engine=FLAT_ENGINE), start):
+        fitnesses[i] = fitness
+        lengths[i] = len(trail)
+        states[i] = state
+        saved[i] = saved_steps
+        if len(trail) <= trails.shape[1]: # longer trails are evaluated again by the main process
+            trails[i, :len(trail)] = trail
+
+
+def apply_result(individual, result):
+    """Sets the result computed by the worker to the individual as if it had been evaluated.
+
+    Args:
+        individual (Individual): evaluated individual
+        result (tuple): fitness, trail, final state of the ant and skipped passes
+    """
+    fitness, trail, state, saved_steps = result
+
+    individual.reset_ant_info()
+    individual.ant.load(trail, state)
+    individual.ant.saved_steps = saved_steps
+    individual.fitness = fitness
+
+
+def _init_process(world):
+    """
+    Publishes the world of the run to the worker process, it is sent just once.
+    """
+    global _process_world
+    _process_world = world
+
+
+def _init_shared(layout, size):
+    """
+    Creates the world of the worker process from the food map and the table of neighbours
+    published in shared memory, they are published just once.
+    """
+    global _process_world
+    food = view(layout, 'food')[:size * size]
+    food_cells = [divmod(int(cell), size) for cell in np.flatnonzero(food)]
+    _process_world = World(food_cells, size, view(layout, 'ahead').tolist())
+
+
+def _worker_state(world):
+    """Returns the world and the individual interpreting the programs in the current thread.
+        The food eaten by the ant is marked in the world, so every thread works with its own
+        copy of the world.
+
+    Args:
+        world (World): food map of the trail
+
+    Returns:
+        tuple: copy of the world and the individual holding the ant
+    """
+    if getattr(_local, 'source', None) is not world:
+        _local.source = world
+        _local.world = deepcopy(world)
+        _local.individual = Individual()
+
+    return _local.world, _local.individual
+
+
+class Evaluator:
+    """
+    This class evaluates batches of programs by the backend chosen by EVAL_BACKEND
+    in init_params.py. The batch is split into chunks, each chunk is one task
+    of the pool, and the results come back in the order of the batch.
+
+    The 'SHARED_MEMORY' backend places the programs and their results in shared arrays,
+    the tasks of the pool carry just the bounds of the chunks.
+
+    The 'BROKER' backend submits the chunks to the work queue of the broker, they are
+    evaluated by the local workers started here and by any workers joining from other
+    machines, see broker.py.
+    """
+
+    def __init__(self, world, backend = EVAL_BACKEND, workers = EVAL_WORKERS, chunksize = EVAL_CHUNKSIZE):
+        if backend not in BACKENDS:
+            raise ValueError("Unknown evaluation backend '" + str(backend) + "', possible: " + ", ".join(BACKENDS))
+
+        self.world = world
+        self.backend = backend
+        self.workers = 1 if backend == 'SERIAL' else workers or os.cpu_count()
+        self.chunksize = chunksize  # programs in one task, 0 for automatic
+        self.arena = None
+        self.broker = None
+        self.local_workers = []
+
+        if backend == 'THREADS':
+            self.pool = ThreadPoolExecutor(self.workers)
+        elif backend == 'PROCESSES':
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_process, initargs=(world,))
+        elif backend == 'SHARED_MEMORY':
+            self.arena = SharedArena()
+            self.arena.publish('food', np.frombuffer(world.food, dtype=np.uint8))
+            self.arena.publish('ahead', np.array(world.ahead, dtype=np.int32))
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_shared,
+                                            initargs=(self.arena.layout(), world.size))
+        elif backend == 'BROKER':
+            self.pool = ThreadPoolExecutor(self.workers) # waits for the chunks submitted by submit()
+            self.broker = Broker(world, (EVAL_BROKER_HOST, EVAL_BROKER_PORT))
+            for _ in range(self.workers):
+                worker = Process(target=run_worker, args=(self.broker.address, self.broker.authkey, evaluate_programs),
+                                 daemon=True)
+                worker.start()
+                self.local_workers.append(worker)
+        else:
+            self.pool = None
+
+
+    def encode(self, individual):
+        """Converts the individual to the form sent to the workers of the backend, see encode_program()"""
+        return encode_program(individual, flat=self.arena is not None)
+
+
+    def bounds(self, count):
+        """Splits the batch into chunks, automatically into CHUNKS_PER_WORKER chunks
+            for every worker, the serial backend takes the batch as one chunk.
+
+        Args:
+            count (int): number of programs in the batch
+
+        Returns:
+            list: start and stop of each chunk
+        """
+        chunksize = self.chunksize
+        if not chunksize:
+            if self.backend == 'SERIAL':
+                chunksize = count
+            else:
+                chunksize = -(-count // (self.workers * CHUNKS_PER_WORKER))
+        chunksize = max(chunksize, 1)
+
+        return [(start, min(start + chunksize, count)) for start in range(0, count, chunksize)]
+
+
+    def evaluate(self, programs):
+        """Evaluates the batch of programs.
+
+        Args:
+            programs (list): programs encoded by encode_program()
+
+        Returns:
+            list: results of the programs in the order of the batch, see evaluate_programs()
+        """
+        if not programs:
+            return []
+
+        if self.backend == 'SHARED_MEMORY':
+            return self.evaluate_shared(programs)
+
+        chunks = [programs[start:stop] for start, stop in self.bounds(len(programs))]
+
+        if self.backend == 'BROKER':
+            chunk_results = self.broker.evaluate(chunks)
+        elif self.backend == 'THREADS':
+            chunk_results = self.pool.map(evaluate_programs, chunks, [self.world] * len(chunks))
+        elif self.backend == 'PROCESSES':
+            chunk_results = self.pool.map(evaluate_programs, chunks) # the world is already in the workers
+        else:
+            chunk_results = [evaluate_programs(chunk, self.world) for chunk in chunks]
+
+        return [result for chunk in chunk_results for result in chunk]
+
+
+    def evaluate_shared(self, programs):
+        """Evaluates the batch of programs through shared memory.
+
+        Args:
+            programs (list): programs encoded by encode_program() as flat programs
+
+        Returns:
+            list: results of the programs in the order of the batch, see evaluate_programs()
+        """
+        count = len(programs)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(program) for program in programs])
+        self.arena.publish('offsets', offsets)
+        self.arena.publish('programs', np.concatenate([np.asarray(program, dtype=np.int64) for program in programs]))
+
+        fitnesses = self.arena.reserve('fitnesses', count, (), np.int32)
+        lengths = self.arena.reserve('lengths', count, (), np.int32)
+        states = self.arena.reserve('states', count, (3,), np.int32)
+        saved = self.arena.reserve('saved', count, (), np.int32)
+        trails = self.arena.reserve('trails', count, (TRAIL_CAPACITY, 2), np.int16)
+
+        starts, stops = zip(*self.bounds(count))
+        list(self.pool.map(evaluate_shared, repeat(self.arena.layout()), starts, stops)) # waits for all chunks
+
+        results = []
+        for i in range(count):
+            if lengths[i] > TRAIL_CAPACITY: # the trail did not fit into the shared array
+                results.extend(evaluate_programs([load_program(np.asarray(programs[i]))], self.world, FLAT_ENGINE))
+            else:
+                results.append((int(fitnesses[i]), trails[i, :lengths[i]].copy(),
+                                tuple(states[i].tolist()), int(saved[i])))
+
+        return results
+
+
+    def submit(self, programs):
+        """Starts the evaluation of a chunk of programs and does not wait for its results.
+            The shared memory backend sends such chunks pickled.
+
+        Args:
+            programs (list): programs encoded by encode()
+
+        Returns:
+            Future: results of the programs in their order, see evaluate_programs()
+        """
+        if self.backend == 'SERIAL':
+            future = Future()
+            future.set_result(evaluate_programs(programs, self.world))
+            return future
+
+        if self.backend == 'THREADS':
+            return self.pool.submit(evaluate_programs, programs, self.world)
+        if self.backend == 'BROKER':
+            return self.pool.submit(lambda: self.broker.evaluate([programs])[0])
+        if self.backend == 'SHARED_MEMORY':
+            programs = [load_program(np.asarray(program)) for program in programs]
+            return self.pool.submit(evaluate_programs, programs, None, FLAT_ENGINE)
+        return self.pool.submit(evaluate_programs, programs)
+
+
+    def close(self):
+        """
+        Shuts the pool of the workers down.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.arena is not None:
+            self.arena.close()
+            self.arena = None
+        if self.broker is not None:
+            self.broker.close()
+            self.broker = None
+        for worker in self.local_workers:
+            worker.join()
+        self.local_workers = []
@@ -47,3 +47,36 @@ COMPLEX_OUTPUT = True  # possible: True/False
 CREATE_GIF = True  # possible: True/False/'ASK'
 MAX_TIME = 1000  # maximal time stopper, so it does not go into endless loop
 MAX_ANT_TRAIL_LEN = 200  # maximal allowed length of ant's trail
+EVAL_ENGINE = 'DECODED'  # possible: 'TEXT'/'DECODED'
+EVAL_BACKEND = 'SERIAL'  # runs the simulations of a generation, possible: 'SERIAL'/'THREADS'/'PROCESSES'/'SHARED_MEMORY'/'BROKER'
+EVAL_WORKERS = 0  # number of threads, processes or local workers of the broker, possible: 0 (number of CPUs)/positive integer
+EVAL_CHUNKSIZE = 0  # programs in one task of the workers, possible: 0 (automatic)/positive integer
+EVAL_BROKER_HOST = '127.0.0.1'  # address of the broker, other than loopback ('0.0.0.0' lets workers from other machines join) only with a key set in EVAL_BROKER_AUTHKEY_ENV
+EVAL_BROKER_PORT = 0  # port of the broker, possible: 0 (any free port, local workers only)/port number
+EVAL_BROKER_AUTHKEY_ENV = 'GP_BROKER_AUTHKEY'  # environment variable with the key the workers authenticate with, the broker on loopback uses a random key when it is not set
+EVAL_TASK_TIMEOUT = 60  # seconds a worker has for a chunk before it is given to another worker
+ISLANDS = 0  # number of islands of the island model run by run_gp(), possible: 0 (independent runs)/integer > 1
+MIGRATION_INTERVAL = 10  # generations between migrations
+MIGRANTS = 2  # number of the best individuals sent by the island at every migration
+MIGRATION_TOPOLOGY = 'RING'  # possible: 'RING'/'RANDOM'
+EVOLUTION_MODE = 'GENERATIONAL'  # possible: 'GENERATIONAL'/'STEADY_STATE' (asynchronous, offspring replace individuals one by one)
+STEADY_STATE_REPLACEMENT = 'TOURNAMENT'  # individual replaced by the offspring, possible: 'WORST'/'TOURNAMENT' (loser of a tournament)
+ELIMINATE_INTRONS = True  # decoded engine runs only the effective code, possible: True/False
+EVALUATION_BUDGET = 10000  # evaluated individuals of a run, GENS = EVALUATION_BUDGET // POP_SIZE in main.py
+SWEEP_POP_SIZES = [50, 100, 200, 500, 1000]  # population sizes of the parameter sweep run by run_sweep()
+SWEEP_CROSSOVER_RATES = [0.2, 0.5, 0.7, 0.9, 1.0]  # crossover rates of the parameter sweep
+SWEEP_MUTATION_RATES = [0.01, 0.1, 0.2, 0.5, 1.0]  # mutation rates of the parameter sweep
+SWEEP_REPETITIONS = 20  # runs of every configuration of the sweep
+SWEEP_SEED = 0  # seed of the first run of every configuration, the next runs use the next seeds
+SWEEP_WORKERS = 0  # processes of the sweep, possible: 0 (number of CPUs divided by the workers of EVAL_BACKEND)/positive integer
+SWEEP_JOURNAL = './results/sweep.jsonl'  # finished runs skipped by a restarted sweep, possible: None (not resumable)/path
+SWEEP_MIN_BUDGET = 1000  # minimal budget of a run of the first rung of the adaptive sweep run by run_halving()
+SWEEP_ETA = 3  # budget and runs grow eta times every rung, only 1/eta of the configurations is promoted
+RESULT_STORE = './results/runs.jsonl'  # records of the runs, possible: path ending with '.jsonl' (JSON lines)/directory (one .npz file per run)
+FITNESS_RECORDER = None  # directory of the memory-mapped GENS x POP_SIZE fitness matrices of the runs, possible: None (turned off)/path, e.g. './results/fitness'
+RECORD_SIZES = False  # records sizes of the trees/lengths of the programs too, possible: True/False
+CHECKPOINT = None  # checkpoint of a single run of run_gp(), resumed by 'python main.py --resume', possible: None (turned off)/path, e.g. './results/checkpoint.npz'
+CHECKPOINT_INTERVAL = 10  # generations between the checkpoints, possible: 0 (by time only)/positive integer
+CHECKPOINT_SECONDS = 0  # seconds between the checkpoints, possible: 0 (by generations only)/positive number
+CYCLE_DETECTION = True  # stops the walk of an ant in a cycle, possible: True/False
+FITNESS_CACHE_SIZE = 5000  # maximal number of cached results, possible: 0 (turned off)/positive integer
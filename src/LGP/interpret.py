@@ -7,18 +7,32 @@
     date: 14/4/2023
     brief: This component contains an algorithm to interpret the ant's trail.
 """
-from copy import deepcopy
-from init_params import GRID_SIZE, POS_X, POS_Y
+import numpy as np
+from ant import UP, RIGHT, DOWN, LEFT, TURN_LEFT, TURN_RIGHT, run_passes
 
+# opcodes of the decoded program
+OP_NOP = 0  # labels of subroutines and branches jumping to missing subroutines
+OP_LEFT = 1
+OP_RIGHT = 2
+OP_MOVE = 3
+OP_2XMOVE = 4
+OP_IF_FOOD_AHEAD = 5
+OP_CALL = 6  # branch of IF_FOOD_AHEAD jumping to a subroutine
 
-def interpret_trail(individual, ant, trail, array):
+OPCODES = {'LEFT': OP_LEFT, 'RIGHT': OP_RIGHT, 'MOVE': OP_MOVE, '2XMOVE': OP_2XMOVE}
+
+# direction of the ant trying to move over the border of the grid, indexed by its direction
+BORDER_TURN = tuple({UP: RIGHT, RIGHT: DOWN, DOWN: LEFT, LEFT: RIGHT}.get(direction, direction)
+                    for direction in range(8))
+
+
+def interpret_trail(individual, ant, world):
     """Interprets ant's trail.
 
     Args:
         individual (Individual): program to be interpreted
-        ant (dict): info about ant's position and direction
-        trail (list): ant's trail
-        array (array): 2d map
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
     """
 
     list_of_instructions = individual.instructions
@@ -31,21 +45,11 @@ def interpret_trail(individual, ant, trail, array):
 
         instruction = list_of_instructions[i]
         insdata = instruction.data
-        x = ant['pos'][POS_X]
-        y = ant['pos'][POS_Y]
 
         if insdata[:2] == 'IF':
-            food_ahead = False
-
-            # checking the position of the ant and the border of the grid
-            if ant['dir'] == 'right' and not ant['pos'][POS_Y] == GRID_SIZE - 1:
-                food_ahead = array[x][y + 1]
-            if ant['dir'] == 'up' and not ant['pos'][POS_X] == 0:
-                food_ahead = array[x - 1][y]
-            if ant['dir'] == 'down' and not ant['pos'][POS_X] == GRID_SIZE - 1:
-                food_ahead = array[x + 1][y]
-            if ant['dir'] == 'left' and not ant['pos'][POS_Y] == 0:
-                food_ahead = array[x][y - 1]
+
+            # the cell off the grid has no food
+            food_ahead = world.food[world.cell_ahead(ant)]
 
             data = instruction.data.split() # [IF, FOOD_AHEAD, ?, E, :, B]
             # [E, B] ... zero index = true opt, first index = false opt
@@ -84,72 +88,23 @@ def interpret_trail(individual, ant, trail, array):
                             break
 
         if insdata == 'RIGHT':
-            if ant['dir'] == 'up':      ant['dir'] = 'right'
-            elif ant['dir'] == 'right': ant['dir'] = 'down'
-            elif ant['dir'] == 'down':  ant['dir'] = 'left'
-            elif ant['dir'] == 'left':  ant['dir'] = 'up'
+            ant.dir = TURN_RIGHT[ant.dir]
 
         if insdata == 'LEFT':
-            if ant['dir'] == 'up':      ant['dir'] = 'left'
-            elif ant['dir'] == 'right': ant['dir'] = 'up'
-            elif ant['dir'] == 'down':  ant['dir'] = 'right'
-            elif ant['dir'] == 'left':  ant['dir'] = 'down'
+            ant.dir = TURN_LEFT[ant.dir]
 
         if insdata == 'MOVE':
-            if ant['dir'] == 'up':
-                if not ant['pos'][POS_X] == 0:
-                    ant['pos'][POS_X]= x - 1
-                else: 
-                    ant['dir'] = 'right'
-
-            elif ant['dir'] == 'right':
-                if not ant['pos'][POS_Y] == GRID_SIZE - 1:
-                    ant['pos'][POS_Y]= y + 1
-                else:
-                    ant['dir'] = 'down'
-
-            elif ant['dir'] == 'down':
-                if not ant['pos'][POS_X] == GRID_SIZE - 1:
-                    ant['pos'][POS_X]= x + 1
-                else:
-                    ant['dir'] = 'left'
-
-            if ant['dir'] == 'left':
-                if not ant['pos'][POS_Y] == 0:
-                    ant['pos'][POS_Y] = y - 1
-                else:
-                    ant['dir'] = 'right'
-                    
-            trail.append(deepcopy(ant['pos']))
+            _move(ant, world)
 
         # ? Expansion 2XMOVE
         if insdata == '2XMOVE':
-            first_move = None
-
-            if ant['dir'] == 'up' and ant['pos'][POS_X] > 1:
-                first_move = x - 1
-                ant['pos'][POS_X] = x - 2
-
-            elif ant['dir'] == 'right' and ant['pos'][POS_Y] < GRID_SIZE-2:
-                first_move = y + 1
-                ant['pos'][POS_Y] = y + 2
-
-            elif ant['dir'] == 'down' and ant['pos'][POS_X] < GRID_SIZE-2:
-                first_move = x + 1
-                ant['pos'][POS_X] = x + 2
-
-            if ant['dir'] == 'left' and ant['pos'][POS_Y] > 1:
-                first_move = y - 1
-                ant['pos'][POS_Y] = y - 2
-
-            trail.append(deepcopy(first_move))
-            trail.append(deepcopy(ant['pos']))
+            _double_move(ant, world)
 
         # when subroutine is executed
         if subroutine_ex: 
             # check for the end of it, whether it is end of the whole program
             # or another subroutine
-            if  individual.instructions[i] == individual.instructions[-1] \
+            if  i == len(individual.instructions) - 1 \
                 or individual.instructions[i+1].data[0] == '*':
                 i = callback_pos
                 callback_pos = None
@@ -157,8 +112,237 @@ def interpret_trail(individual, ant, trail, array):
 
         # same as with subroutines but for the main program
         if not subroutine_ex and \
-           (individual.instructions[i] == individual.instructions[-1] \
+           (i == len(individual.instructions) - 1 \
             or individual.instructions[i+1].data[0] == '*'):
             break
 
-        i = i + 1
\ No newline at end of file
+        i = i + 1
+
+
+def decode_program(instructions):
+    """Decodes the text of the instructions into integer opcodes, so they do not have to
+        be parsed again during every pass of the program.
+
+        Each branch of IF_FOOD_AHEAD is decoded into an opcode and a target, the target
+        is the position of the subroutine's label for OP_CALL. The instruction ending
+        a segment (main program or subroutine) is marked the same way as interpret_trail()
+        checks it.
+
+    Args:
+        instructions (list): instructions of the program
+
+    Returns:
+        tuple: opcodes, (true opcodes, true targets, false opcodes, false targets),
+               ends of segments and table of labels
+    """
+    length = len(instructions)
+
+    # table of labels, the first occurrence of a label wins
+    labels = {}
+    for position, instruction in enumerate(instructions):
+        if instruction.data[0] == '*' and instruction.data not in labels:
+            labels[instruction.data] = position
+
+    ops = [OP_NOP] * length
+    true_ops, true_targets = [OP_NOP] * length, [0] * length
+    false_ops, false_targets = [OP_NOP] * length, [0] * length
+    segment_end = [False] * length
+
+    for position, instruction in enumerate(instructions):
+        insdata = instruction.data
+
+        if insdata[:2] == 'IF':
+            data = insdata.split() # [IF, FOOD_AHEAD, ?, E, :, B]
+            ops[position] = OP_IF_FOOD_AHEAD
+            true_ops[position], true_targets[position] = _decode_branch(data[3], labels)
+            false_ops[position], false_targets[position] = _decode_branch(data[5], labels)
+
+        elif insdata in OPCODES:
+            ops[position] = OPCODES[insdata]
+
+        segment_end[position] = position == length - 1 or instructions[position + 1].data[0] == '*'
+
+    return ops, (true_ops, true_targets, false_ops, false_targets), segment_end, labels
+
+
+def _decode_branch(symbol, labels):
+    """Decodes one branch of IF_FOOD_AHEAD.
+
+    Args:
+        symbol (str): instruction or symbol of the subroutine
+        labels (dict): table of labels
+
+    Returns:
+        tuple: opcode and target
+    """
+    if symbol in OPCODES:
+        return OPCODES[symbol], 0
+
+    label = "* SR " + symbol + ":"
+    if label in labels:
+        return OP_CALL, labels[label]
+
+    return OP_NOP, 0
+
+
+def flatten_program(program):
+    """Packs the decoded program into a flat array of integers, one row of opcode, both branches
+        and the end of segment mark for each instruction. The table of labels is not needed
+        for the interpretation and is left out.
+
+    Args:
+        program (tuple): decoded program, see decode_program()
+
+    Returns:
+        ndarray: flat program
+    """
+    ops, (true_ops, true_targets, false_ops, false_targets), segment_end, _ = program
+    rows = np.array([ops, true_ops, true_targets, false_ops, false_targets, segment_end], dtype=np.int64)
+    return rows.T.ravel()
+
+
+def unflatten_program(flat):
+    """Unpacks the decoded program packed by flatten_program().
+
+    Args:
+        flat (ndarray): flat program
+
+    Returns:
+        tuple: decoded program with an empty table of labels
+    """
+    ops, true_ops, true_targets, false_ops, false_targets, segment_end = flat.reshape(-1, 6).T.tolist()
+    return ops, (true_ops, true_targets, false_ops, false_targets), segment_end, {}
+
+
+def interpret_decoded(program, ant, world):
+    """Interprets one pass of the decoded program, it behaves exactly as interpret_trail().
+
+    Args:
+        program (tuple): decoded program, see decode_program()
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    ops, (true_ops, true_targets, false_ops, false_targets), segment_end, _ = program
+    direction = ant.dir
+    food, ahead, off_grid = world.food, world.ahead, world.off_grid
+    cell_x, cell_y = world.cell_x, world.cell_y
+    cell = world.cell(ant.x, ant.y)
+
+    subroutine_ex = False
+    callback_pos = None  # callback position after execution of subroutine
+
+    i = 0
+    length = len(ops)
+    while i < length:
+        op = ops[i]
+
+        if op == OP_IF_FOOD_AHEAD:
+            if food[ahead[cell * 8 + direction]]:
+                op, target = true_ops[i], true_targets[i]
+            else:
+                op, target = false_ops[i], false_targets[i]
+
+            # program is going to jump to subroutine's label
+            if op == OP_CALL:
+                callback_pos = i
+                i = target
+                subroutine_ex = True
+
+        if op == OP_RIGHT:
+            direction = TURN_RIGHT[direction]
+
+        elif op == OP_LEFT:
+            direction = TURN_LEFT[direction]
+
+        elif op == OP_MOVE:
+            # see _move()
+            target = ahead[cell * 8 + direction]
+            if target == off_grid:
+                direction = BORDER_TURN[direction]
+                if direction == LEFT:
+                    target = ahead[cell * 8 + LEFT]
+                    if target == off_grid: direction = RIGHT
+            if target != off_grid:
+                cell = target
+
+            ant.x, ant.y = cell_x[cell], cell_y[cell]
+            ant.record()
+            world.visit_cell(cell)
+
+        elif op == OP_2XMOVE:
+            ant.x, ant.y, ant.dir = cell_x[cell], cell_y[cell], direction
+            _double_move(ant, world)
+            cell = world.cell(ant.x, ant.y)
+
+        # end of the subroutine returns back behind the calling instruction
+        if subroutine_ex and segment_end[i]:
+            i = callback_pos
+            callback_pos = None
+            subroutine_ex = False
+
+        # end of the main program
+        if not subroutine_ex and segment_end[i]:
+            break
+
+        i = i + 1
+
+    ant.x, ant.y, ant.dir = cell_x[cell], cell_y[cell], direction
+
+    return ant
+
+
+def _move(ant, world):
+    """Moves the ant to the cell in front of it and records the cell in the trail. At the border
+        of the grid the ant turns instead of moving (up to right, right to down, down to left
+        and left to right), the ant turning from down to left moves left right away if it can.
+
+    Args:
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    cell = world.cell_ahead(ant)
+    if cell == world.off_grid:
+        ant.dir = BORDER_TURN[ant.dir]
+        if ant.dir == LEFT:
+            cell = world.cell_ahead(ant)
+            if cell == world.off_grid: ant.dir = RIGHT
+
+    if cell != world.off_grid:
+        ant.x, ant.y = world.cell_x[cell], world.cell_y[cell]
+
+    ant.record()
+    world.visit(ant.x, ant.y)
+
+
+def _double_move(ant, world):
+    """Moves the ant by two cells, both of them are recorded in the trail. At the border
+        of the grid the ant stays on the spot.
+
+    Args:
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    middle = world.cell_ahead(ant)
+    cell = world.ahead[middle * 8 + ant.dir]  # neighbours of the cell off the grid are off the grid
+
+    if cell != world.off_grid:
+        ant.x, ant.y = world.cell_x[middle], world.cell_y[middle]
+        ant.record()
+        world.visit_cell(middle)
+        ant.x, ant.y = world.cell_x[cell], world.cell_y[cell]
+    else:
+        ant.record()
+    ant.record()
+    world.visit(ant.x, ant.y)
+
+
+def run_decoded(program, ant, world):
+    """Repeatedly interprets the decoded program until the maximal time or the maximal
+        length of the ant's trail is reached, see run_passes() in ant.py.
+
+    Args:
+        program (tuple): decoded program, see decode_program()
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    return run_passes(ant, lambda: interpret_decoded(program, ant, world))
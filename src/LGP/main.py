@@ -8,31 +8,46 @@
     brief: This file contains the main GP's program.
 """
 
+import sys
+import time
 import numpy as np
 import trails_plots
 from copy import deepcopy
 from mutation import mutate
-from multiprocessing import Process
-from interpret import interpret_trail
+from world import World
+from executor import Evaluator, apply_result
+from islands import run_islands
+from sweep import run_sweep, run_halving
+from result_store import ResultStore
+from fitness_recorder import new_recorder
+from checkpoint import Checkpointer, load_checkpoint, restore_random
+from codec import encode_text, decode_text, TEXT_MAGIC, CODEC_VERSION
 from random import randint, choice, random
+from concurrent.futures import Future, wait, FIRST_COMPLETED
 from classes import Instruction, Individual
+from fitness_cache import FitnessCache, trail_id
 from crossovers import one_point_crossover as crossover
-from selection import tournament_selection as selection  # rewrite x in "import x as" to change a selection operator
-from print_stats import print_stats_gen_avg_fitness, print_best_of_run, print_final_results
+from selection import tournament_selection as selection, tournament_replacement, worst_replacement  # rewrite x in "import x as" to change a selection operator
+from print_stats import print_stats_gen_avg_fitness, print_best_of_run, print_final_results, print_cache_stats
 from init_params import (
     MAX_PROGRAM_LENGTH, MIN_PROGRAM_LENGTH, POP_SIZE,
-    GRID_SIZE, MUTATION_RATE, POS_X, POS_Y, GENS,
+    MUTATION_RATE, GENS,
     MAX_SUBROUTINES, MAX_SUBROUTINE_LENGTH, MIN_SUBROUTINE_LENGTH,
     XO_RATE, INSTRUCTION_LIST, SUBROUTINE_SYMBOLS,
-    INIT_TYPE, INIT_PROGRAM_CONST, MAX_TIME, MAX_ANT_TRAIL_LEN
+    INIT_TYPE, INIT_PROGRAM_CONST, FITNESS_CACHE_SIZE,
+    ISLANDS, EVOLUTION_MODE, STEADY_STATE_REPLACEMENT, EVALUATION_BUDGET, CHECKPOINT
 )
 
+# results of already evaluated programs, shared by all the runs of the process
+fitness_cache = FitnessCache(FITNESS_CACHE_SIZE)
+
 
 def verify_program():
     """
     Verify's the already generated solution. Just copy solution from the terminal into
     program.txt file and change generate_program() for verify_program() when initializing
-    population.
+    population. The program encoded by encode_text() (the 'program' of the records of the runs)
+    can be on the first line of program.txt too.
     """
 
     ins = []
@@ -41,6 +56,9 @@ def verify_program():
     with open('program.txt', 'r') as input_file:
         for line in input_file:
             ins.append(line.strip())
+
+    if ins and ins[0].startswith(TEXT_MAGIC + str(CODEC_VERSION) + ":"):
+        return decode_text(ins[0])
     
     for inst in ins:
         if 'IF FOOD_AHEAD ? ' in inst:
@@ -104,7 +122,235 @@ def generate_program():
     return program
 
 
-def liner_genetic_programming(change_params, params):
+def evaluate_population(population, evaluator):
+    """Evaluates all individuals of the population as one batch of the evaluator, the walks
+        are interpreted by the engine chosen by EVAL_ENGINE in init_params.py. With the fitness
+        cache turned on, only the programs whose effective code is not found in the cache
+        are simulated, each of them just once.
+
+    Args:
+        population (list): individuals to be evaluated
+        evaluator (Evaluator): backend evaluating the batch
+
+    Returns:
+        int: number of passes of the programs skipped thanks to the cycle detection
+    """
+    if FITNESS_CACHE_SIZE:
+        trail = trail_id(evaluator.world)
+        pending = {} # individuals waiting for evaluation grouped by the key
+
+        for individual in population:
+            key = fitness_cache.key(individual, trail)
+            if key in pending: # the same program is already going to be evaluated
+                pending[key].append(individual)
+                continue
+
+            entry = fitness_cache.lookup(key)
+            if entry is None:
+                pending[key] = [individual]
+            else:
+                fitness_cache.restore(entry, individual)
+
+        population = [group[0] for group in pending.values()]
+
+    results = evaluator.evaluate([evaluator.encode(individual) for individual in population])
+    for individual, result in zip(population, results):
+        apply_result(individual, result)
+
+    saved_steps = sum(individual.ant.saved_steps for individual in population)
+
+    if FITNESS_CACHE_SIZE:
+        for key, group in pending.items():
+            entry = fitness_cache.store(key, group[0])
+            for individual in group[1:]:
+                fitness_cache.lookup(key) # counts the saved simulation
+                fitness_cache.restore(entry, individual)
+
+    return saved_steps
+
+
+def breed(population):
+    """Breeds one offspring of the population by selection, crossover and mutation.
+
+    Args:
+        population (list): evaluated population
+
+    Returns:
+        Individual: offspring
+    """
+    parent1 = selection(population) # selecting two parents for evolution, they are shared, not copied
+    parent2 = selection(population)
+    offspring = parent1
+
+    if random() < XO_RATE: # crossover 
+        offspring = crossover(parent1, parent2)
+
+    offspring = mutate(offspring, MUTATION_RATE) # mutation
+
+    # the operators copy only what they change, the unchanged parent gets its own copy
+    return offspring if offspring is not parent1 else parent1.copy()
+
+
+def record_generation(gen, population, fitnesses, best_of_run, island = None, recorder = None):
+    """Records statistics of the generation and searches for a better individual of the run.
+
+    Args:
+        gen (int): generation
+        population (list): evaluated population
+        fitnesses (dict): statistics of the run
+        best_of_run (dict): fittest individual of the run
+        island (Island): connection to the other islands, None for a single run
+        recorder (FitnessRecorder): recorder of the fitnesses of the whole population, None when turned off
+    """
+    if recorder is not None:
+        recorder.record(gen, population)
+
+    fitnesses['all_gen'] = []
+    for individual in population:
+        fitnesses['all_gen'].append(individual.fitness)
+
+    print_stats_gen_avg_fitness(gen, fitnesses['all_gen'], island.label if island else "")
+
+    fitnesses['best_gen'].append(min(fitnesses['all_gen']))
+    fitnesses['avg_gen'].append(np.round(np.average(fitnesses['all_gen'])))
+    fitnesses['worst_gen'].append(max(fitnesses['all_gen']))
+
+    for individual in population:
+        if individual.fitness < best_of_run['fitness']:
+            best_of_run['fitness'] = deepcopy(individual.fitness)
+            best_of_run['gen'] = gen
+            best_of_run['path'] = individual.trail.copy()
+            best_of_run['individual'] = deepcopy(individual)
+            print_best_of_run(best_of_run)
+            fitnesses['best'].append(best_of_run['fitness'])
+
+
+def generational_evolution(population, evaluator, gens, fitnesses, best_of_run, island = None, recorder = None,
+                           first_gen = 0, checkpointer = None):
+    """Evolves the population generation by generation, the best individual always
+        proceeds to the next generation.
+
+    Args:
+        population (list): evaluated initial population
+        evaluator (Evaluator): backend evaluating the generations
+        gens (int): maximal number of generations
+        fitnesses (dict): statistics of the run
+        best_of_run (dict): fittest individual of the run
+        island (Island): connection to the other islands, None for a single run
+        recorder (FitnessRecorder): recorder of the fitnesses of the whole population, None when turned off
+        first_gen (int): first evolved generation, it is not 0 when the run continues from its checkpoint
+        checkpointer (Checkpointer): saves the checkpoints of the run, None when turned off
+
+    Returns:
+        int: number of evolved generations
+    """
+    generations = first_gen
+    for gen in range(first_gen, gens):
+        nextgen_population = []
+
+        # securing that the best individual proceeds to the next generation
+        elite_individual = population[0]
+        for individual in population:
+            if individual.fitness < elite_individual.fitness:
+                elite_individual = individual
+        nextgen_population.append(elite_individual.copy())
+
+        # -1, because elite individual is already in next generation    
+        for _ in range(len(population) - 1): 
+            nextgen_population.append(breed(population))
+
+        population = nextgen_population
+
+        # evaluatiing each individual
+        fitnesses['saved_gen'].append(evaluate_population(population, evaluator))
+        if island is not None:
+            island.migrate(population, gen, lambda migrants: evaluate_population(migrants, evaluator))
+
+        record_generation(gen, population, fitnesses, best_of_run, island, recorder)
+        generations += 1
+
+        if best_of_run['fitness'] == 0: # terminating condition
+            break
+        if island is not None and island.stopped(): # another island has found the solution
+            break
+        if checkpointer is not None:
+            checkpointer.save(gen, population, fitnesses, best_of_run)
+
+    return generations
+
+
+def steady_state_evolution(population, evaluator, gens, fitnesses, best_of_run, island = None, recorder = None):
+    """Evolves the population asynchronously, without generations. Offspring are bred and handed
+        to the evaluator one by one and every evaluated offspring replaces an individual chosen
+        by STEADY_STATE_REPLACEMENT right away, so the workers never wait for the slowest
+        individual of a generation. Statistics are recorded after every len(population)
+        evaluated offspring as if they were a generation.
+
+    Args:
+        population (list): evaluated initial population, changed in place
+        evaluator (Evaluator): backend evaluating the offspring
+        gens (int): maximal number of generations, i.e. gens * len(population) offspring
+        fitnesses (dict): statistics of the run
+        best_of_run (dict): fittest individual of the run
+        island (Island): connection to the other islands, None for a single run
+        recorder (FitnessRecorder): recorder of the fitnesses of the whole population, None when turned off
+
+    Returns:
+        int: number of recorded generations
+    """
+    replacement = tournament_replacement if STEADY_STATE_REPLACEMENT == 'TOURNAMENT' else worst_replacement
+    trail = trail_id(evaluator.world)
+    capacity = 2 * evaluator.workers # offspring evaluated at once, so the workers do not wait for new ones
+    pending = {} # offspring being evaluated and their keys of the fitness cache by the futures
+
+    gen = 0
+    evaluated = 0 # offspring evaluated in the current generation
+    saved_steps = 0
+    while gen < gens:
+        while len(pending) < capacity:
+            offspring = breed(population)
+            key = fitness_cache.key(offspring, trail) if FITNESS_CACHE_SIZE else None
+            entry = fitness_cache.lookup(key) if FITNESS_CACHE_SIZE else None
+            if entry is None:
+                future = evaluator.submit([evaluator.encode(offspring)])
+            else: # already known result, no passes skipped
+                future = Future()
+                future.set_result([entry + (0,)])
+                key = None
+            pending[future] = (offspring, key)
+
+        wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in [future for future in pending if future.done()]: # in the order of breeding
+            offspring, key = pending.pop(future)
+            apply_result(offspring, future.result()[0])
+            if key is not None:
+                fitness_cache.store(key, offspring)
+
+            population[replacement(population)] = offspring
+            saved_steps += offspring.ant.saved_steps
+            evaluated += 1
+
+            if evaluated == len(population) or offspring.fitness == 0:
+                fitnesses['saved_gen'].append(saved_steps)
+                if island is not None:
+                    island.migrate(population, gen, lambda migrants: evaluate_population(migrants, evaluator))
+                record_generation(gen, population, fitnesses, best_of_run, island, recorder)
+
+                gen += 1
+                evaluated = 0
+                saved_steps = 0
+
+                if best_of_run['fitness'] == 0 or (island is not None and island.stopped()):
+                    return gen
+                if gen == gens:
+                    break
+
+    return gen
+
+
+def liner_genetic_programming(change_params, params, island = None, output = True, budget = EVALUATION_BUDGET,
+                              checkpoint = None, resume = False):
     """Main function of the LGP
 
     Args:
@@ -112,8 +358,18 @@ def liner_genetic_programming(change_params, params):
         params (array(int)): changable parameters (population size, crossover rate
                              and mutation rate) in case of running multiple runs 
                              of GP with different setting
+        island (Island): connection to the other islands of the island model, None for a single run
+        output (bool): whether the final results are printed, saved and animated
+        budget (int): number of evaluated individuals of the run, it gives the number of generations
+        checkpoint (str): path to the checkpoint of the run, None when the run is not checkpointed
+        resume (bool): whether the run continues from the checkpoint, if there is any
+
+    Returns:
+        dict: record of the run, i.e. its config, budget, seed (set by the sweep), best fitness and
+              its generation, statistics of the generations, best program and time in seconds
     """
     global POP_SIZE, XO_RATE, MUTATION_RATE
+    start = time.perf_counter() # time of the run
 
     # changable parametrs during running multiple runs of the algorithm
     if change_params:
@@ -123,7 +379,16 @@ def liner_genetic_programming(change_params, params):
     
     # independent of the population, so that the equation 
     # 'population size * generation = constant'is always true
-    GENS = 10000 // POP_SIZE # if wanna use number from init_params, just comment this line
+    GENS = max(1, budget // POP_SIZE) # if wanna use number from init_params, just comment this line
+
+    if checkpoint and EVOLUTION_MODE == 'STEADY_STATE': # offspring are being evaluated at any moment
+        raise ValueError("Checkpoints are supported only by the generational evolution")
+
+    state = load_checkpoint(checkpoint) if checkpoint and resume else None # state of the interrupted run
+    if state is not None:
+        POP_SIZE, XO_RATE, MUTATION_RATE = state['config']
+        GENS, budget = state['gens'], state['budget']
+        start -= state['elapsed']
 
     food_cells = trails_plots.trail_santafe_32x32 # selected trail
 
@@ -132,7 +397,8 @@ def liner_genetic_programming(change_params, params):
         'best': [], # best fitnesses without duplicates
         'best_gen': [], # best individual at each generation 
         'avg_gen': [], # average fitness at each generation
-        'worst_gen': [] # worst individual at each generation
+        'worst_gen': [], # worst individual at each generation
+        'saved_gen': [] # passes skipped thanks to the cycle detection at each generation
     }
 
     best_of_run = {
@@ -142,145 +408,115 @@ def liner_genetic_programming(change_params, params):
         "best_of_run_path": None,
     }  
     
-    gen_counter = [] # counts number of generations, used for stats
     trails_plots.plot_food_trail()
 
     # initializing ant's playing field
-    grid = np.zeros((GRID_SIZE, GRID_SIZE)) # generates a 2D matrix
-    grid_copy = deepcopy(grid)
-
-    for food_cell in food_cells:
-        grid[food_cell[POS_X]][food_cell[POS_Y]] = 1
-        grid_copy[food_cell[POS_X]][food_cell[POS_Y]] = 1
-
-    population = []
-    # creating individual population
-    for _ in range(POP_SIZE):
-        program = generate_program()
-        population.append(program)
-
-    for individual in population:
-        individual.reset_ant_info()
-        grid = deepcopy(grid_copy)
-
-        time = 0
-        while time < MAX_TIME:
-            if len(individual.trail) > MAX_ANT_TRAIL_LEN: break # terminating condition
-            interpret_trail(individual, individual.ant, individual.trail, grid)
-
-            time += 1
-
-        for cell in individual.trail: # inserting indivudal's trail to grid
-            grid[cell[POS_X]][cell[POS_Y]] = 2
-
-        individual.count_fitness(grid)
-        fitnesses['all_gen'].append(individual.fitness)
-
-    for gen in range(GENS):
-        nextgen_population = []
-
-        # securing that the best individual proceeds to the next generation
-        elite_individual = population[0]
-        for individual in population:
-            if individual.fitness < elite_individual.fitness:
-                elite_individual = individual
-        nextgen_population.append(deepcopy(elite_individual))
-
-        # -1, because elite individual is already in next generation    
-        for _ in range(POP_SIZE - 1): 
-            parent1 = selection(population) # selecting two parents for evolution
-            parent2 = selection(population)
-
-            if random() < XO_RATE: # crossover 
-                parent1 = crossover(parent1, parent2)
-
-            parent1 = mutate(parent1, MUTATION_RATE) # mutation 
-            nextgen_population.append(parent1)
-    
-        population = nextgen_population
-        fitnesses['all_gen'] = []
-
-        # evaluatiing each individual
+    world = World(food_cells) # grid with the food
+    evaluator = Evaluator(world) # backend evaluating the generations
+    recorder = new_recorder(GENS, POP_SIZE, lambda individual: len(individual.instructions),
+                            state['recording'] if state else None) # fitnesses of the whole population, None when turned off
+
+    if state is None:
+        population = []
+        # creating individual population
+        for _ in range(POP_SIZE):
+            program = generate_program()
+            population.append(program)
+
+        evaluate_population(population, evaluator)
         for individual in population:
-            individual.reset_ant_info()
-            grid = deepcopy(grid_copy)
-
-            time = 0
-            while time < MAX_TIME:
-                if len(individual.trail) > MAX_ANT_TRAIL_LEN: break
-                
-                interpret_trail(individual, individual.ant, individual.trail, grid)
-
-                time += 1
-
-            for cell in individual.trail: # inserting indivudal's trail to grid
-                grid[cell[POS_X]][cell[POS_Y]] = 2
-
-            individual.count_fitness(grid)
             fitnesses['all_gen'].append(individual.fitness)
+    else: # the interrupted run continues from its checkpoint
+        population, fitnesses, best_of_run = state['population'], state['fitnesses'], state['best_of_run']
+        restore_random(state)
+
+    if EVOLUTION_MODE == 'STEADY_STATE':
+        generations = steady_state_evolution(population, evaluator, GENS, fitnesses, best_of_run, island, recorder)
+    else:
+        checkpointer = None
+        if checkpoint:
+            checkpointer = Checkpointer(checkpoint, {'config': [POP_SIZE, XO_RATE, MUTATION_RATE], 'gens': GENS, 'budget': budget,
+                                                     'start': start, 'recording': recorder.path if recorder is not None else None})
+
+        first_gen = state['gen'] + 1 if state is not None else 0
+        generations = generational_evolution(population, evaluator, GENS, fitnesses, best_of_run, island, recorder,
+                                             first_gen, checkpointer)
+        if checkpointer is not None:
+            checkpointer.close()
+
+    evaluator.close()
+    if recorder is not None:
+        recorder.close()
+
+    individual = best_of_run['individual']
+    record = {
+        'config': [POP_SIZE, XO_RATE, MUTATION_RATE],
+        'budget': budget,
+        'seed': None,
+        'fitness': int(best_of_run['fitness']),
+        'gen': best_of_run['gen'],
+        'generations': generations,
+        'best_gen': [int(fitness) for fitness in fitnesses['best_gen']],
+        'avg_gen': [float(fitness) for fitness in fitnesses['avg_gen']],
+        'worst_gen': [int(fitness) for fitness in fitnesses['worst_gen']],
+        'program': encode_text(individual) if individual is not None else None,
+        'time': round(time.perf_counter() - start, 3),
+        'recording': recorder.path if recorder is not None else None
+    }
 
-        print_stats_gen_avg_fitness(gen, fitnesses['all_gen'])
-        fitnesses['best_gen'].append(min(fitnesses['all_gen']))
-        fitnesses['avg_gen'].append(np.round(np.average(fitnesses['all_gen'])))
-        fitnesses['worst_gen'].append(max(fitnesses['all_gen']))
+    if island is not None:
+        island.report(record)
 
-        for individual in population:
-            if individual.fitness < best_of_run['fitness']:
-                best_of_run['fitness'] = deepcopy(individual.fitness)
-                best_of_run['gen'] = gen
-                best_of_run['path'] = deepcopy(individual.trail)
-                best_of_run['individual'] = deepcopy(individual)
-                print_best_of_run(best_of_run)
-                fitnesses['best'].append(best_of_run['fitness'])
-                
-        gen_counter.append(gen)
-        if best_of_run['fitness'] == 0: # terminating condition
-            break
-    
-    print_final_results(fitnesses, best_of_run)
+    if output:
+        print_final_results(fitnesses, best_of_run)
+        if FITNESS_CACHE_SIZE:
+            print_cache_stats(fitness_cache)
 
-def parallel_computing(fns, params, change_params):
-    """Function which runs GP mutilple times using multithreading.
+    return record
 
-    Args:
-        fns (array): array of geneticProgrammingAlg functions
-        params (bool): when True, change params are applied, otherwise not (False)
-        change_params (array): array of three main parameters (POP_SIZE, CROSSOVER_RATE, MUTATION_RATE)
-    """
 
-    proc = [] # processes
-    for function in fns:
-        p = Process(target=function, args=(params, change_params))
-        p.start()
-        proc.append(p)
-    for process in proc:
-        process.join()
-
-
-def run_gp(fns, pop_size, cross_rate, mut_rate):
-    """Function prints settings of algorithm to results.txt file and starts parellel computing
+def run_gp(function, pop_size, cross_rate, mut_rate, runs = 1, store = None, resume = False):
+    """Function starts the runs with the given settings, more runs are computed parallelly
+        by the sweep (see sweep.py)
 
     Args:
-        fns (array): array of geneticProgrammingAlg functions
+        function (function): liner_genetic_programming function
         pop_size (int): population size
         cross_rate (int): crossover rate
         mut_rate (int): mutation rate
+        runs (int): number of the runs
+        store (ResultStore): store the records of the runs are handed to, None when they are not saved
+        resume (bool): whether the single run continues from its checkpoint (CHECKPOINT), if there is any
     """
 
-    f = open("./results/results.txt", "a")
-    f.write("\n")
-    f.write("RUN. Algorithm Settings = POP_SIZE: " + str(pop_size) + ", CROSS_RATE: " + str(cross_rate)  + ", MUT_RATE: " + str(mut_rate) + " :: ")
-    f.write("\n")
-    f.close()
-
     print(" * LGP -- Linear Genetic Programming -- Langton's Ant Problem")
 
-    parallel_computing(fns, params=True, change_params=[pop_size, cross_rate, mut_rate])
+    if ISLANDS: # the runs exchange their best individuals
+        records = run_islands(function, params=True, change_params=[pop_size, cross_rate, mut_rate])
+    elif runs == 1:
+        records = [function(True, [pop_size, cross_rate, mut_rate], checkpoint=CHECKPOINT, resume=resume)]
+    else: # independent runs, not resumable, the sweep hands their records to the store itself
+        run_sweep(function, [pop_size], [cross_rate], [mut_rate], repetitions=runs, journal=None, store=store)
+        return
+
+    if store is not None:
+        for record in records:
+            store.put(record)
 
 
 if __name__ == '__main__':
 
     NUM_OF_RUNS = 1 # number of desired runs which are going to be computed parallelly
-    fns = [liner_genetic_programming for _ in range(NUM_OF_RUNS)]
+    SWEEP = False # runs the grid of parameters from init_params.py instead, see sweep.py, possible: False/'GRID'/'HALVING' (adaptive)
+
+    store = ResultStore() # the only writer of the results of the runs
+
+    if SWEEP == 'HALVING':
+        run_halving(liner_genetic_programming, store=store)
+    elif SWEEP:
+        run_sweep(liner_genetic_programming, store=store)
+    else:
+        run_gp(liner_genetic_programming, pop_size=100, cross_rate=0.7, mut_rate=1, runs=NUM_OF_RUNS, store=store,
+               resume='--resume' in sys.argv)
 
-    run_gp(fns, pop_size=100, cross_rate=0.7, mut_rate=1) 
+    store.close()
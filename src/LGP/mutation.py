@@ -23,17 +23,21 @@ def mutate(individual, mut_rate):
     """ Function to mutate program. Goes inst. after inst. and checks probabilities of 
         inserting, deleting or mutating current inst. 
 
+        The program is not changed, it is copied before the first change and
+        the changed instructions are replaced, see Individual.copy().
+
     Args:
         individual (list): a program to be mutated
     
     Return:
-        individual (list): mutated program
+        individual (list): mutated program, the program itself when nothing has changed
     """
 
     global INSERTION_RATE, MUTATION_RATE, DELETION_RATE, MICROMUT_RATE
     if mut_rate != None:
         MUTATION_RATE, DELETION_RATE, INSERTION_RATE, MICROMUT_RATE = mut_rate, mut_rate, mut_rate, mut_rate
 
+    parent = individual
     MIN_LENGTH = MIN_PROGRAM_LENGTH
     MAX_LENGTH = MAX_PROGRAM_LENGTH
     inst_ord = 0
@@ -56,10 +60,12 @@ def mutate(individual, mut_rate):
                 inst = Instruction(inst_name, fnc=True)
             else:
                 inst = Instruction(inst_name)
+            individual = _writable(individual, parent)
             individual.instructions.insert(inst_ord, inst)
 
         # destructive mutation
         elif length > MIN_LENGTH and random() <= DELETION_RATE:
+            individual = _writable(individual, parent)
             del individual.instructions[inst_ord]
 
         # mutation
@@ -72,7 +78,8 @@ def mutate(individual, mut_rate):
                 false_opt = choice(SUBROUTINE_SYMBOLS[:MAX_SUBROUTINES] + INSTRUCTION_LIST[:-1])
                 inst = inst + true_opt + " : " + false_opt
 
-            individual.instructions[inst_ord].set_inst(inst)
+            individual = _writable(individual, parent)
+            individual.instructions[inst_ord] = individual.instructions[inst_ord].replaced(inst)
 
         # micromutation - can only happen withing if food-ahead instruciton
         elif "IF FOOD_AHEAD" in individual.instructions[inst_ord].data and random() <= MICROMUT_RATE:
@@ -80,7 +87,8 @@ def mutate(individual, mut_rate):
             data[3] = choice(SUBROUTINE_SYMBOLS[:MAX_SUBROUTINES] + INSTRUCTION_LIST[:-1])
             data[5] = choice(SUBROUTINE_SYMBOLS[:MAX_SUBROUTINES] + INSTRUCTION_LIST[:-1])
             data = ' '.join(data)
-            individual.instructions[inst_ord].set_inst(data, fnc=True)
+            individual = _writable(individual, parent)
+            individual.instructions[inst_ord] = individual.instructions[inst_ord].replaced(data, fnc=True)
 
         inst_ord += 1
 
@@ -103,20 +111,33 @@ def mutate(individual, mut_rate):
             if current_length < MAX_LENGTH and random() <= INSERTION_RATE:
                 inst_name = choice(INSTRUCTION_LIST[0:2])
                 inst = Instruction(inst_name)
+                individual = _writable(individual, parent)
                 individual.instructions.insert(first_inst + inst_ord, inst)
 
             # destructive mutation
             elif current_length > MIN_LENGTH and random() <= DELETION_RATE:
+                individual = _writable(individual, parent)
                 del individual.instructions[first_inst + inst_ord]
 
             # mutation    
             elif random() <= MUTATION_RATE:
                 inst = choice(INSTRUCTION_LIST[0:2])
-                individual.instructions[first_inst + inst_ord].set_inst(inst)
+                individual = _writable(individual, parent)
+                individual.instructions[first_inst + inst_ord] = individual.instructions[first_inst + inst_ord].replaced(inst)
 
             # beacuse ternary operator is not allowed in subroutines, there is no need
             # for micromutation
 
             inst_ord += 1
 
-    return individual
\ No newline at end of file
+    if individual is not parent:
+        individual.invalidate_decoded()
+
+    return individual
+
+
+def _writable(individual, parent):
+    """
+    Returns the program which can be changed, the parent is copied before its first change.
+    """
+    return individual.copy() if individual is parent else individual
@@ -14,10 +14,10 @@ from init_params import CREATE_GIF, COMPLEX_OUTPUT
 from trails_plots import plot_result_trail, print_program
 
 
-def print_stats_gen_avg_fitness(gen, fitnesses):
+def print_stats_gen_avg_fitness(gen, fitnesses, prefix = ""):
     """Prints number of average fitness (-> of all individuals) of each generation """
     
-    print("Generation: " + str(gen) + " > Average Fitness: " + str(np.average(fitnesses)))
+    print(prefix + "Generation: " + str(gen) + " > Average Fitness: " + str(np.average(fitnesses)))
 
 
 def print_best_of_run(best_of_run):
@@ -29,10 +29,56 @@ def print_best_of_run(best_of_run):
            + str(best_of_run['gen']) + " and has fitness=" + str(best_of_run['fitness']))
 
 
+def print_cache_stats(cache):
+    """Prints how many simulations were saved by the fitness cache"""
+
+    print("> Fitness Cache > hits: " + str(cache.hits) + ", misses: " + str(cache.misses)\
+          + ", hit rate: " + str(np.round(100 * cache.hit_rate(), 2)) + " %")
+
+
+def print_islands_stats(reports):
+    """Prints results of the islands of the island model"""
+
+    print("\n" + "** ISLANDS ----------------------------------------------------" + "\n")
+    for report in reports:
+        print("> Island " + str(report['island']) + " > Best Fitness: " + str(report['fitness'])\
+              + ", Found at Gen: " + str(report['gen']) + ", Generations: " + str(report['generations'])\
+              + ", Emigrants: " + str(report['emigrants']) + ", Immigrants: " + str(report['immigrants']))
+
+    best = min(reports, key=lambda report: report['fitness'])
+    print("> Best Island > " + str(best['island']) + " > Fitness > " + str(best['fitness']))
+
+
+def print_sweep_results(records):
+    """Prints best fitnesses of the runs of each configuration of the sweep, they are saved
+       into results/sweep.txt in the format of the experiments"""
+
+    configs = {} # best fitnesses of the runs by the configurations and their budgets
+    for record in records:
+        configs.setdefault(tuple(record['config']) + (record['budget'],), []).append(record['result']['fitness'])
+
+    print("\n" + "** SWEEP ----------------------------------------------------" + "\n")
+    for (pop_size, cross_rate, mut_rate, budget), fitnesses in configs.items():
+        print("> POPSIZE: " + str(pop_size) + ", PCROSS: " + str(cross_rate) + ", PMUT: " + str(mut_rate)\
+              + ", BUDGET: " + str(budget) + " > Average Fitness: " + str(np.round(np.average(fitnesses), 2))\
+              + ", Solved: " + str(fitnesses.count(0)) + "/" + str(len(fitnesses)))
+
+    if COMPLEX_OUTPUT:
+        f = open("./results/sweep.txt", "a")
+
+        for (pop_size, cross_rate, mut_rate, budget), fitnesses in configs.items():
+            f.write("---------------------------------------------------" + "\n")
+            f.write("POPSIZE: " + str(pop_size) + ", PCROSS: " + str(cross_rate) + ", PMUT: " + str(mut_rate)\
+                    + ", BUDGET: " + str(budget) + "\n")
+            f.write(",".join(str(fitness) for fitness in fitnesses) + "\n")
+
+        f.close()
+
+
 def print_final_results(fitnesses, best_of_run):
     cell = None
     result_trail = []
-    for pair in best_of_run['path']:
+    for pair in best_of_run['path'].tolist():
         if not pair == cell:
             result_trail.append(pair)
         cell = pair
@@ -45,13 +91,14 @@ def print_final_results(fitnesses, best_of_run):
     print("\n" + "** Solution Info: " + "\n")
     print("> Gen > " + str(best_of_run['gen']))
     print("> Fitness > " + str(best_of_run['fitness']))
-    print("> Trail > " + str(best_of_run['path']))
+    print("> Trail > " + str(best_of_run['path'].tolist()))
     print("> Trail Length > " + str(len(best_of_run['path'])))
     print(" ::: ")
     print("> Best Fitnesses > " + str(sorted(list(set(fitnesses['best_gen'])), reverse=True)))
     print("> Gen Best Fitnesses > " + str(fitnesses['best_gen']))
     print("> Gen Average Fitnesses > " + str(fitnesses['avg_gen']))
     print("> Gen Worst Fitnesses > " + str(fitnesses['worst_gen']))
+    print("> Gen Saved Steps > " + str(fitnesses['saved_gen']))
     print(" ::: ")
     print(" --------------------------------------------------")
 
@@ -64,22 +111,3 @@ def print_final_results(fitnesses, best_of_run):
         answer = input("Do you want to create an animation (gif)? [yes(y)/no]")
         if answer == ('y' or 'yes'):
             create_gif(best_of_run['path'], best_solution)
-
-    if COMPLEX_OUTPUT:
-        f = open("./results/results.txt", "a")
-
-        f.write("RUN -----------------------------------------------" + "\n")
-        f.write("Solution Info: " + "\n")
-        f.write("> Found at Gen > " + str(best_of_run['gen']) + "\n")
-        f.write("> Best Fitness > " + str(best_of_run['fitness']) + "\n")
-        f.write("> Trail > " + str(best_of_run['path']) + "\n")
-        f.write("> Trail Length > " + str(len(best_of_run['path'])) + "\n")
-        f.write(" ::: " + "\n")
-        f.write("> Best Fitnesses > " + str(sorted(list(set(fitnesses['best_gen'])), reverse=True)))
-        f.write("> Gen Best Fitnesses > " + str(fitnesses['best_gen']) + "\n")
-        f.write("> Gen Average Fitnesses > " + str(fitnesses['avg_gen']) + "\n")
-        f.write("> Gen Worst Fitnesses > " + str(fitnesses['worst_gen']) + "\n")
-        f.write(" ::: " + "\n")
-        f.write(" --------------------------------------------------" + "\n")
-
-        f.close()
\ No newline at end of file
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: result_store.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the store of the results of the runs. The records of the runs are
+           handed to the only writer, a thread of the main process, which appends them as JSON lines
+           or saves every run as a .npz file of numpy arrays. It contains the loader of the records too.
+"""
+
+import os
+import json
+import queue
+import threading
+import numpy as np
+from glob import glob
+from init_params import RESULT_STORE
+
+
+def open_lines(path):
+    """Opens the file of JSON lines for appending, a line torn by a crash is ended,
+        so the next record starts on its own line.
+
+    Args:
+        path (str): path to the file
+
+    Returns:
+        file: file opened for appending
+    """
+    torn = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, 'rb') as lines_file:
+            lines_file.seek(-1, os.SEEK_END)
+            torn = lines_file.read(1) != b"\n"
+
+    lines_file = open(path, 'a')
+    if torn:
+        lines_file.write("\n")
+    return lines_file
+
+
+def read_lines(path):
+    """Returns the records of the file of JSON lines, a line torn by a crash is skipped"""
+    records = []
+    if not os.path.exists(path):
+        return records
+
+    with open(path, 'r') as lines_file:
+        for line in lines_file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+
+    return records
+
+
+class ResultStore:
+    """
+    This class writes the records of the runs in its own thread, so the run handing
+    a record over does not wait for the disk. A path ending with '.jsonl' is a file
+    of JSON lines, any other path is a directory of .npz files, one per run.
+    """
+
+    def __init__(self, path = RESULT_STORE):
+        self.path = path
+        self.written = 0  # number of the written records
+        self.records = queue.Queue()  # records waiting for the writer
+        self.writer = threading.Thread(target=self._write_records, daemon=True)
+        self.writer.start()
+
+
+    def put(self, record):
+        """Hands the record of the run over to the writer, it never waits.
+
+        Args:
+            record (dict): config, seed, statistics of the generations, best program and timings of the run
+        """
+        self.records.put(record)
+
+
+    def close(self):
+        """
+        Waits until all the records are written and stops the writer.
+        """
+        self.records.put(None)
+        self.writer.join()
+
+
+    def _write_records(self):
+        """
+        Writes the records until the store is closed.
+        """
+        if self.path.endswith('.jsonl'):
+            output = open_lines(self.path)
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            output = None
+            index = len(glob(os.path.join(self.path, 'run-*.npz'))) # number of the next run file
+
+        while True:
+            record = self.records.get()
+            if record is None:
+                break
+
+            if output is not None:
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+            else:
+                while os.path.exists(os.path.join(self.path, 'run-%06d.npz' % index)):
+                    index += 1
+                self._write_npz(record, os.path.join(self.path, 'run-%06d.npz' % index))
+            self.written += 1
+
+        if output is not None:
+            output.close()
+
+
+    def _write_npz(self, record, run_path):
+        """
+        Saves the record as a .npz file, it is renamed only when it is complete,
+        so there is never a half-written run in the directory.
+        """
+        arrays = {key: np.asarray(value) for key, value in record.items() if value is not None}
+        arrays['none'] = np.array([key for key, value in record.items() if value is None], dtype=str) # e.g. seed of a single run
+
+        temporary = os.path.join(self.path, 'writing.npz')
+        np.savez_compressed(temporary, **arrays)
+        os.replace(temporary, run_path)
+
+
+def load_results(path = RESULT_STORE, **conditions):
+    """Loads the records of the runs written by the store.
+
+    Args:
+        path (str): file of JSON lines or directory of .npz files, see ResultStore
+        conditions (dict): only the records with these values are loaded, e.g. seed=0
+
+    Returns:
+        list: records of the runs, the statistics of the .npz files are numpy arrays
+    """
+    if path.endswith('.jsonl'):
+        records = read_lines(path)
+    else:
+        records = []
+        for run_path in sorted(glob(os.path.join(path, 'run-*.npz'))):
+            with np.load(run_path) as data:
+                record = {key: data[key].item() if data[key].ndim == 0 else data[key] for key in data.files if key != 'none'}
+                record.update((key, None) for key in data['none'])
+                records.append(record)
+
+    return [record for record in records if all(_equal(record.get(key), value) for key, value in conditions.items())]
+
+
+def _equal(stored, value):
+    """
+    Compares the stored value with the wanted one, the lists are loaded as arrays from .npz files.
+    """
+    if isinstance(stored, np.ndarray) or isinstance(value, (list, tuple)):
+        return np.array_equal(np.asarray(stored), np.asarray(value))
+    return stored == value
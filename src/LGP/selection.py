@@ -11,14 +11,14 @@
 
 from init_params import TOURNAMENT_SIZE
 from random import randint, random, uniform
-from copy import deepcopy
 
 
 def tournament_selection(population):
     """
     A small sample of the population is selected and the fittest individual 
     is selected from it using a tournament. The selection pressure is adjustable 
-    by the size of the selected sample of individuals.
+    by the size of the selected sample of individuals. The winner is not copied,
+    the variation operators copy only the parts they change.
     """
     # randomly select tournaments's participants by their position in the population
     tournament_participants = []
@@ -41,7 +41,7 @@ def tournament_selection(population):
         if individual.fitness < winner.fitness:
             winner = individual 
 
-    return deepcopy(winner)
+    return winner
 
 
 def roulette_selection(population, fitnesses, max_fitness):
@@ -49,7 +49,7 @@ def roulette_selection(population, fitnesses, max_fitness):
     Individuals in the population are assigned a portion of a roulette wheel based on 
     their fitness. The overall fitness of the roulette is the sum of all individuals' fitness. 
     An individual is selected at random by generating a number between 0 and 1 and selecting 
-    the individual whose roulette portion contains that number.
+    the individual whose roulette portion contains that number. The individual is not copied.
     """
     # converts STANDARDIZED fitness to RAW fitness
     fitnesses = [max_fitness - f  for f in fitnesses]
@@ -76,13 +76,14 @@ def roulette_selection(population, fitnesses, max_fitness):
     # converts fitness back to STANDARDIZED
     fitnesses = [max_fitness - f  for f in fitnesses]
 
-    return deepcopy(selected_individual)
+    return selected_individual
 
 
 def rank_selection(population):
     """
     Rank selection function that returns the selected parents for reproduction.
     The number of parents to be selected is specified by the 'num_parents' argument.
+    The parent is not copied.
     """
     # assigns a rank to each individual in the population based on their fitness
     ranked_population = sorted(population, key=lambda x: x.fitness, reverse=True)
@@ -103,7 +104,34 @@ def rank_selection(population):
     for i, individual in enumerate(ranked_population):
         partial_sum += ranks[i]
         if partial_sum >= rand_num:
-            selected_individual = deepcopy(individual)
+            selected_individual = individual
             break
 
-    return selected_individual
\ No newline at end of file
+    return selected_individual
+
+def tournament_replacement(population):
+    """
+    Returns position of the individual to be replaced by a new offspring in the steady-state
+    evolution. It is the loser of a tournament, i.e. the least fit individual of a small
+    random sample of the population.
+    """
+    loser = randint(0, len(population) - 1)
+    for _ in range(TOURNAMENT_SIZE - 1):
+        participant = randint(0, len(population) - 1)
+        if population[participant].fitness > population[loser].fitness:
+            loser = participant
+
+    return loser
+
+
+def worst_replacement(population):
+    """
+    Returns position of the least fit individual of the population, which is to be
+    replaced by a new offspring in the steady-state evolution.
+    """
+    worst = 0
+    for position, individual in enumerate(population):
+        if individual.fitness > population[worst].fitness:
+            worst = position
+
+    return worst
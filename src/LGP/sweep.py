@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: sweep.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the parameter sweep, i.e. the runs of the GP for every combination
+           of the population size, crossover rate and mutation rate, repeated with different seeds.
+           The runs are scheduled on a bounded pool of processes and the finished ones are written
+           into a journal, so a sweep restarted after a crash skips them. The adaptive sweep gives
+           the full budget only to the configurations surviving the successive halving.
+"""
+
+import os
+import json
+import math
+import random
+import numpy as np
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from print_stats import print_sweep_results
+from result_store import open_lines, read_lines
+from init_params import (EVAL_BACKEND, EVAL_WORKERS, EVALUATION_BUDGET, SWEEP_POP_SIZES, SWEEP_CROSSOVER_RATES,
+                         SWEEP_MUTATION_RATES, SWEEP_REPETITIONS, SWEEP_SEED, SWEEP_WORKERS, SWEEP_JOURNAL,
+                         SWEEP_MIN_BUDGET, SWEEP_ETA)
+
+
+def sweep_workers(workers = SWEEP_WORKERS):
+    """Returns the number of the processes of the sweep. Every run evaluates its generations
+        by EVAL_BACKEND, so the CPUs are divided by the number of its workers and the machine
+        is not oversubscribed.
+
+    Args:
+        workers (int): requested number of the processes, 0 for the automatic one
+    """
+    if workers:
+        return workers
+
+    cpus = os.cpu_count() or 1
+    run_workers = 1 if EVAL_BACKEND == 'SERIAL' else EVAL_WORKERS or cpus
+    return max(1, cpus // run_workers)
+
+
+def load_journal(journal):
+    """Reads the results of the finished runs from the journal. A line torn by a crash
+        is skipped, so its run is computed again.
+
+    Args:
+        journal (str): path to the journal, None when the sweep is not resumable
+
+    Returns:
+        dict: results of the runs by their (config, seed, budget) jobs
+    """
+    if journal is None:
+        return {}
+    return {(tuple(record['config']), record['seed'], record['budget']): record['result'] for record in read_lines(journal)}
+
+
+def run_jobs(function, jobs, journal = SWEEP_JOURNAL, workers = SWEEP_WORKERS, store = None):
+    """Runs the jobs not found in the journal on the pool of processes. The processes stay alive
+        for all the jobs and keep their fitness caches between the runs.
+
+    Args:
+        function (function): main function of the GP returning the results of the run
+        jobs (list): (config, seed, budget) jobs, config is (POP_SIZE, CROSSOVER_RATE, MUTATION_RATE)
+        journal (str): path to the journal of the finished runs, None when the sweep is not resumable
+        workers (int): number of the processes, 0 for the automatic one, see sweep_workers()
+        store (ResultStore): store the records of the finished runs are handed to, None when they are not saved
+
+    Returns:
+        list: records of the jobs (config, seed, budget, result) in their order
+    """
+    results = load_journal(journal)
+    remaining = [job for job in jobs if job not in results]
+    print("> Sweep > runs: " + str(len(jobs)) + ", finished: " + str(len(jobs) - len(remaining))\
+          + ", processes: " + str(sweep_workers(workers)))
+
+    if remaining:
+        journal_file = open_lines(journal) if journal is not None else None
+        with ProcessPoolExecutor(max_workers=sweep_workers(workers)) as pool:
+            futures = {pool.submit(_run_job, function, *job): job for job in remaining}
+            for future in as_completed(futures):
+                config, seed, budget = job = futures[future]
+                results[job] = future.result()
+                if store is not None:
+                    store.put(results[job])
+
+                if journal_file is not None: # the run is finished only when its line is on the disk
+                    journal_file.write(json.dumps({'config': config, 'seed': seed, 'budget': budget, 'result': results[job]}) + "\n")
+                    journal_file.flush()
+                    os.fsync(journal_file.fileno())
+
+        if journal_file is not None:
+            journal_file.close()
+
+    return [{'config': config, 'seed': seed, 'budget': budget, 'result': results[(config, seed, budget)]}
+            for config, seed, budget in jobs]
+
+
+def run_sweep(function, pop_sizes = SWEEP_POP_SIZES, cross_rates = SWEEP_CROSSOVER_RATES,
+              mut_rates = SWEEP_MUTATION_RATES, repetitions = SWEEP_REPETITIONS, journal = SWEEP_JOURNAL,
+              workers = SWEEP_WORKERS, store = None):
+    """Runs the GP for every configuration of the grid 'repetitions' times with the full budget.
+        The repetition r of every configuration is seeded by SWEEP_SEED + r, so the sweep
+        is reproducible.
+
+    Args:
+        function (function): main function of the GP returning the results of the run
+        pop_sizes (list): population sizes of the grid
+        cross_rates (list): crossover rates of the grid
+        mut_rates (list): mutation rates of the grid
+        repetitions (int): number of the runs of every configuration
+        journal (str): path to the journal of the finished runs, None when the sweep is not resumable
+        workers (int): number of the processes, 0 for the automatic one, see sweep_workers()
+        store (ResultStore): store the records of the finished runs are handed to, None when they are not saved
+
+    Returns:
+        list: records of all the runs (config, seed, budget, result) in the order of the grid
+    """
+    configs = list(product(pop_sizes, cross_rates, mut_rates))
+    jobs = [(config, SWEEP_SEED + repetition, EVALUATION_BUDGET) for config in configs for repetition in range(repetitions)]
+
+    records = run_jobs(function, jobs, journal, workers, store)
+    print_sweep_results(records)
+    return records
+
+
+def halving_rungs(max_budget = EVALUATION_BUDGET, min_budget = SWEEP_MIN_BUDGET, eta = SWEEP_ETA,
+                  repetitions = SWEEP_REPETITIONS):
+    """Returns the budgets and the numbers of the runs of the rungs of the successive halving.
+        Every rung has eta times larger budget and eta times more runs than the previous one,
+        the last rung has the full budget and all the repetitions.
+
+    Args:
+        max_budget (int): evaluations of a run of the last rung
+        min_budget (int): minimal evaluations of a run of the first rung
+        eta (int): factor of the growth of the budget, only 1/eta of the configurations is promoted
+        repetitions (int): runs of a configuration in the last rung
+
+    Returns:
+        list: (budget, runs) pairs of the rungs
+    """
+    rungs = int(math.log(max_budget / min_budget, eta) + 1e-9) + 1 if max_budget > min_budget else 1
+    return [(max_budget // eta ** k, max(1, repetitions // eta ** k)) for k in reversed(range(rungs))]
+
+
+def run_halving(function, pop_sizes = SWEEP_POP_SIZES, cross_rates = SWEEP_CROSSOVER_RATES,
+                mut_rates = SWEEP_MUTATION_RATES, repetitions = SWEEP_REPETITIONS, journal = SWEEP_JOURNAL,
+                workers = SWEEP_WORKERS, min_budget = SWEEP_MIN_BUDGET, eta = SWEEP_ETA, store = None):
+    """Runs the adaptive sweep by the successive halving. All the configurations of the grid
+        are run with a small budget and a few seeds, they are ranked by their average and best
+        fitness and only the best 1/eta of them is promoted to the next rung with a larger budget
+        and more seeds, see halving_rungs(). Every configuration keeps the results of the last rung
+        it has reached, so the heatmaps of the grid can be drawn as from the full sweep.
+
+    Args:
+        function (function): main function of the GP returning the results of the run
+        pop_sizes (list): population sizes of the grid
+        cross_rates (list): crossover rates of the grid
+        mut_rates (list): mutation rates of the grid
+        repetitions (int): number of the runs of every configuration of the last rung
+        journal (str): path to the journal of the finished runs, None when the sweep is not resumable
+        workers (int): number of the processes, 0 for the automatic one, see sweep_workers()
+        min_budget (int): minimal evaluations of a run of the first rung
+        eta (int): factor of the growth of the budget, only 1/eta of the configurations is promoted
+        store (ResultStore): store the records of the finished runs are handed to, None when they are not saved
+
+    Returns:
+        list: records of the runs of the last rung of every configuration (config, seed, budget, result)
+              in the order of the grid
+    """
+    configs = list(product(pop_sizes, cross_rates, mut_rates))
+    reached = {} # records of the last rung reached by the configurations
+
+    survivors = configs
+    rungs = halving_rungs(EVALUATION_BUDGET, min_budget, eta, repetitions)
+    for rung, (budget, runs) in enumerate(rungs):
+        print("> Sweep > rung: " + str(rung) + ", configurations: " + str(len(survivors))\
+              + ", budget: " + str(budget) + ", runs: " + str(runs))
+
+        jobs = [(config, SWEEP_SEED + repetition, budget) for config in survivors for repetition in range(runs)]
+        for record in run_jobs(function, jobs, journal, workers, store):
+            if record['seed'] == SWEEP_SEED: # the first run of the configuration in the rung
+                reached[record['config']] = []
+            reached[record['config']].append(record)
+
+        # ranking by the average and then by the best fitness of the runs, the lower the better
+        ranking = sorted(survivors, key=lambda config: _rank(reached[config]))
+        survivors = ranking[:max(1, len(survivors) // eta)]
+
+    records = [record for config in configs for record in reached[config]]
+    print_sweep_results(records)
+    return records
+
+
+def _rank(records):
+    """
+    Returns the key ranking the configuration by the records of its runs.
+    """
+    fitnesses = [record['result']['fitness'] for record in records]
+    return (sum(fitnesses) / len(fitnesses), min(fitnesses))
+
+
+def _run_job(function, config, seed, budget):
+    """
+    Runs one configuration of the sweep in the worker process, the output of the run is thrown away.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        result = function(True, list(config), output=False, budget=budget)
+    result['seed'] = seed
+
+    return result
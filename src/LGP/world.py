@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: world.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the world the ant walks through, i.e. the food map of the trail
+           and the food eaten by the currently evaluated ant.
+"""
+
+import numpy as np
+from ant import DELTA_X, DELTA_Y
+from init_params import GRID_SIZE, POS_X, POS_Y
+
+
+class World:
+    """
+    This class holds the food map as a flat array of bytes indexed by x * size + y
+    and marks of the food eaten by the ant. The eaten cells are written into an undo log,
+    so only they have to be cleaned before the next ant and their number is the number
+    of eaten food cells.
+
+    Neighbours of the cells are precomputed in the table 'ahead' indexed by cell * 8 + direction,
+    cells off the grid are represented by the extra cell 'off_grid' without food, whose
+    neighbours are off the grid again.
+    """
+
+    def __init__(self, food_cells, size = GRID_SIZE, ahead = None):
+        self.size = size
+        self.cells = size * size
+        self.off_grid = self.cells
+
+        self.food = bytearray(self.cells + 1)  # 1 where the food is, it never changes during the walk
+        for cell in food_cells:
+            self.food[cell[POS_X] * size + cell[POS_Y]] = 1
+        self.food_count = sum(self.food)
+
+        self.eaten = bytearray(self.cells + 1)  # 1 where the food has been eaten by the ant
+        self.undo_log = []  # cells eaten by the ant
+
+        # coordinates of the cells
+        self.cell_x = [cell // size for cell in range(self.cells)]
+        self.cell_y = [cell % size for cell in range(self.cells)]
+
+        # cell in front of the ant for every (cell, direction) pair, unless it has been
+        # already computed by another process
+        if ahead is not None:
+            self.ahead = list(ahead)
+            return
+
+        self.ahead = [self.off_grid] * ((self.cells + 1) * 8)
+        for cell in range(self.cells):
+            for direction in range(8):
+                ahead_x = self.cell_x[cell] + DELTA_X[direction]
+                ahead_y = self.cell_y[cell] + DELTA_Y[direction]
+                if 0 <= ahead_x < size and 0 <= ahead_y < size:
+                    self.ahead[cell * 8 + direction] = ahead_x * size + ahead_y
+
+
+    @property
+    def eaten_count(self):
+        """Returns number of food cells eaten by the ant"""
+        return len(self.undo_log)
+
+
+    def cell(self, x, y):
+        """Returns index of the cell on the position [x, y]"""
+        return x * self.size + y
+
+
+    def cell_ahead(self, ant):
+        """Returns index of the cell in front of the ant, 'off_grid' when it is off the grid"""
+        return self.ahead[(ant.x * self.size + ant.y) * 8 + ant.dir]
+
+
+    def food_at(self, x, y):
+        """Returns 1 when there is food on the cell, 0 otherwise"""
+        return self.food[x * self.size + y]
+
+
+    def visit(self, x, y):
+        """
+        Eats the food on the cell visited by the ant, if there is any.
+        """
+        self.visit_cell(x * self.size + y)
+
+
+    def visit_cell(self, cell):
+        """
+        Eats the food on the cell given by its index, if there is any.
+        """
+        if self.food[cell] and not self.eaten[cell]:
+            self.eaten[cell] = 1
+            self.undo_log.append(cell)
+
+
+    def move(self, ant):
+        """Moves the ant to the cell in front of it, the ant stays on the spot at the border
+            of the grid. The new cell is recorded in the trail and its food is eaten.
+
+        Args:
+            ant (AntState): ant's position, direction and trail
+
+        Returns:
+            bool: whether the ant has moved
+        """
+        cell = self.ahead[(ant.x * self.size + ant.y) * 8 + ant.dir]
+        if cell == self.off_grid:
+            return False
+
+        ant.x, ant.y = self.cell_x[cell], self.cell_y[cell]
+        ant.record()
+        self.visit_cell(cell)
+        return True
+
+
+    def reset(self):
+        """
+        Puts back the food eaten by the previous ant.
+        """
+        for cell in self.undo_log:
+            self.eaten[cell] = 0
+        self.undo_log.clear()
+
+
+    def start(self, ant):
+        """
+        Prepares the world for the ant, which eats the food on its starting cell.
+        """
+        self.reset()
+        self.visit(ant.x, ant.y)
+
+
+    def remaining_food(self):
+        """Returns number of food cells not eaten by the ant"""
+        return self.food_count - len(self.undo_log)
+
+
+    def food_map(self):
+        """Returns the food map as a 2d array"""
+        return np.frombuffer(bytes(self.food[:self.cells]), dtype=np.uint8).reshape(self.size, self.size)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: ant.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains a compact representation of the ant's state and its trail.
+"""
+
+import numpy as np
+from init_params import MAX_TIME, MAX_ANT_TRAIL_LEN, CYCLE_DETECTION, POS_X, POS_Y
+
+# directions are small integers going clockwise, the even ones are the four basic
+# directions, the odd ones are diagonals used only by interpret_diagonals.py
+UP, UP_RIGHT, RIGHT, DOWN_RIGHT, DOWN, DOWN_LEFT, LEFT, UP_LEFT = range(8)
+DIRECTIONS = ['up', 'up-right', 'right', 'down-right', 'down', 'down-left', 'left', 'up-left']
+
+# lookup tables indexed by the direction
+DELTA_X = (-1, -1, 0, 1, 1, 1, 0, -1)
+DELTA_Y = (0, 1, 1, 1, 0, -1, -1, -1)
+TURN_RIGHT = tuple((direction + 2) % 8 for direction in range(8))  # 90° clockwise
+TURN_LEFT = tuple((direction + 6) % 8 for direction in range(8))  # 90° counterclockwise
+
+# the trail is checked only after a whole pass of the program, so it may overgrow
+# MAX_ANT_TRAIL_LEN a bit, the buffer gets reallocated only in the rare case it does not fit
+TRAIL_CAPACITY = 2 * MAX_ANT_TRAIL_LEN + 2
+
+
+class AntState:
+    """
+    This class holds ant's position, its direction and its trail stored
+    in a preallocated buffer of [x, y] pairs.
+    """
+
+    __slots__ = ('x', 'y', 'dir', 'trail_buffer', 'trail_len', 'saved_steps')
+
+    def __init__(self, capacity = TRAIL_CAPACITY):
+        self.trail_buffer = np.zeros((capacity, 2), dtype=np.int16)
+        self.reset()
+
+
+    def reset(self):
+        """
+        Puts the ant back to the upper left corner facing right, the starting
+        cell is the first cell of the trail.
+        """
+        self.x = 0
+        self.y = 0
+        self.dir = RIGHT
+        self.trail_buffer[0] = 0
+        self.trail_len = 1
+        self.saved_steps = 0  # passes of the program skipped thanks to the cycle detection
+
+
+    @property
+    def pos(self):
+        """Returns ant's position as [x, y]"""
+        return [self.x, self.y]
+
+
+    @property
+    def trail(self):
+        """Returns view of the ant's trail so far as an array of [x, y] pairs"""
+        return self.trail_buffer[:self.trail_len]
+
+
+    def record(self):
+        """
+        Appends the current position of the ant to its trail.
+        """
+        if self.trail_len == len(self.trail_buffer):
+            self.grow()
+        self.trail_buffer[self.trail_len, POS_X] = self.x
+        self.trail_buffer[self.trail_len, POS_Y] = self.y
+        self.trail_len += 1
+
+
+    def load(self, trail, state):
+        """Sets the trail and the final state of the ant computed elsewhere.
+
+        Args:
+            trail (array): trail as an array of [x, y] pairs
+            state (tuple): final position and direction of the ant as (x, y, direction)
+        """
+        while len(self.trail_buffer) < len(trail):
+            self.grow()
+        self.trail_buffer[:len(trail)] = trail
+        self.trail_len = len(trail)
+        self.x, self.y, self.dir = state
+
+
+    def grow(self):
+        """
+        Doubles the capacity of the trail buffer.
+        """
+        buffer = np.zeros((2 * len(self.trail_buffer), 2), dtype=np.int16)
+        buffer[:self.trail_len] = self.trail_buffer[:self.trail_len]
+        self.trail_buffer = buffer
+
+
+def run_passes(ant, interpret_pass):
+    """Repeatedly lets the program make a pass until the maximal time or the maximal
+        length of the ant's trail is reached.
+
+        Every pass starts at the beginning of the program and the food map does not
+        change during the walk, so the pass depends only on the position and the direction
+        of the ant. Once the ant starts a pass in the same state again, it is in a cycle
+        and cannot visit any new cell. The rest of the walk is then not interpreted,
+        the trail is just completed by repeating the trails of the passes of the cycle.
+
+    Args:
+        ant (AntState): ant's position, direction and trail
+        interpret_pass (function): interprets one pass of the program
+
+    Returns:
+        AntState: the ant at the end of the walk
+    """
+    seen = {} # time of the pass by the state of the ant at its start
+    states = [] # states of the ant at the start of each pass
+    starts = [] # lengths of the trail at the start of each pass
+
+    time = 0
+    while time < MAX_TIME:
+        if ant.trail_len > MAX_ANT_TRAIL_LEN: break # terminating condition
+
+        if CYCLE_DETECTION:
+            state = (ant.x, ant.y, ant.dir)
+            if state in seen:
+                return _repeat_cycle(ant, seen[state], time, states, starts)
+            seen[state] = time
+            states.append(state)
+            starts.append(ant.trail_len)
+
+        interpret_pass()
+
+        time += 1
+
+    return ant
+
+
+def _repeat_cycle(ant, first, time, states, starts):
+    """Completes the walk of the ant which got into a cycle as if the passes had been interpreted.
+
+    Args:
+        ant (AntState): ant's position, direction and trail
+        first (int): time of the first pass of the cycle
+        time (int): current time, the ant is in the same state as at the time 'first'
+        states (list): states of the ant at the start of each pass
+        starts (list): lengths of the trail at the start of each pass
+
+    Returns:
+        AntState: the ant at the end of the walk
+    """
+    period = time - first
+    starts.append(ant.trail_len)
+    detected = time
+
+    if starts[time] == starts[first]: # the ant does not move anymore
+        time = max(time, MAX_TIME)
+
+    while time < MAX_TIME:
+        if ant.trail_len > MAX_ANT_TRAIL_LEN: break # terminating condition
+
+        # the pass is the same as the corresponding pass of the cycle
+        cycle_pass = first + (time - first) % period
+        segment = ant.trail_buffer[starts[cycle_pass]:starts[cycle_pass + 1]].copy()
+        while ant.trail_len + len(segment) > len(ant.trail_buffer):
+            ant.grow()
+        ant.trail_buffer[ant.trail_len:ant.trail_len + len(segment)] = segment
+        ant.trail_len += len(segment)
+
+        time += 1
+
+    ant.x, ant.y, ant.dir = states[first + (time - first) % period]
+    ant.saved_steps = time - detected
+
+    return ant
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: broker.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains an evaluation broker, i.e. a work queue served over the network,
+           and the loop of the workers taking the chunks of the generations from it.
+           Workers on other machines are started by 'python broker.py HOST PORT', they need
+           the same init_params.py as the run and the key of the broker in the environment
+           variable EVAL_BROKER_AUTHKEY_ENV. The data of the broker are pickled, so anyone
+           holding the key can run code on the broker and on the workers.
+"""
+
+import os
+import sys
+import time
+import secrets
+import threading
+import ipaddress
+from collections import deque
+from multiprocessing.managers import BaseManager
+from init_params import EVAL_BROKER_AUTHKEY_ENV, EVAL_TASK_TIMEOUT
+
+_work_queue = None  # work queue of the broker process, see _get_work_queue()
+
+
+class WorkQueue:
+    """
+    This class holds the chunks of the generation waiting for workers and the results
+    of the finished ones. A chunk taken by a worker is leased to it for EVAL_TASK_TIMEOUT
+    seconds, a chunk not finished in time (e.g. its worker has left) is given to another
+    worker. The first result of the chunk wins, the retried chunks give the same results.
+    """
+
+    def __init__(self, timeout = EVAL_TASK_TIMEOUT):
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.world = None  # food map of the run
+        self.next_id = 0
+        self.pending = deque()  # ids of the chunks waiting for a worker
+        self.tasks = {}  # programs of the unfinished chunks by their ids
+        self.leases = {}  # deadlines of the chunks taken by the workers
+        self.results = {}  # results of the finished chunks
+        self.retried = 0  # number of chunks given to another worker
+
+
+    def publish_world(self, world):
+        """
+        Sets the food map of the run, the workers get it when they join.
+        """
+        with self.condition:
+            self.world = world
+            self.condition.notify_all()
+
+
+    def get_world(self):
+        """Returns the food map of the run, it waits until the map is published"""
+        with self.condition:
+            while self.world is None:
+                self.condition.wait()
+            return self.world
+
+
+    def submit(self, chunks):
+        """Puts the chunks of the generation into the queue.
+
+        Args:
+            chunks (list): chunks of the encoded programs
+
+        Returns:
+            list: ids of the chunks
+        """
+        with self.condition:
+            ids = list(range(self.next_id, self.next_id + len(chunks)))
+            self.next_id += len(chunks)
+            for task_id, chunk in zip(ids, chunks):
+                self.tasks[task_id] = chunk
+                self.pending.append(task_id)
+            self.condition.notify_all()
+        return ids
+
+
+    def take(self, timeout):
+        """Leases the next chunk to the worker.
+
+        Args:
+            timeout (float): maximal time of waiting for a chunk in seconds
+
+        Returns:
+            tuple: id and programs of the chunk, None when there is no chunk
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                self._expire()
+                while self.pending:
+                    task_id = self.pending.popleft()
+                    if task_id in self.tasks: # it is not finished by a slow worker yet
+                        self.leases[task_id] = time.monotonic() + self.timeout
+                        return task_id, self.tasks[task_id]
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(min(remaining, self.timeout))
+
+
+    def complete(self, task_id, results):
+        """
+        Stores the results of the chunk computed by the worker.
+        """
+        with self.condition:
+            if task_id in self.tasks:
+                del self.tasks[task_id]
+                self.leases.pop(task_id, None)
+                self.results[task_id] = results
+                self.condition.notify_all()
+
+
+    def collect(self, ids):
+        """Waits for the results of the chunks.
+
+        Args:
+            ids (list): ids of the chunks
+
+        Returns:
+            list: results of the chunks in the order of the ids
+        """
+        with self.condition:
+            while not all(task_id in self.results for task_id in ids):
+                self._expire()
+                self.condition.wait(1)
+            return [self.results.pop(task_id) for task_id in ids]
+
+
+    def _expire(self):
+        """
+        Returns the chunks whose leases have expired back to the queue.
+        """
+        now = time.monotonic()
+        for task_id, deadline in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[task_id]
+                self.pending.appendleft(task_id)
+                self.retried += 1
+                self.condition.notify_all()
+
+
+def _get_work_queue():
+    """Returns the work queue of the broker process, all the clients share it"""
+    global _work_queue
+    if _work_queue is None:
+        _work_queue = WorkQueue()
+    return _work_queue
+
+
+class BrokerManager(BaseManager):
+    """
+    This class serves the work queue to the run and to the workers.
+    """
+
+BrokerManager.register('work_queue', callable=_get_work_queue)
+
+
+def environment_authkey():
+    """
+    Returns the key of the broker set in the environment variable EVAL_BROKER_AUTHKEY_ENV, empty when it is not set.
+    """
+    return os.environ.get(EVAL_BROKER_AUTHKEY_ENV, '').encode()
+
+
+def is_loopback(host):
+    """
+    Returns whether the host is reachable only from this machine.
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Broker:
+    """
+    This class starts the broker process serving the work queue on the given address,
+    the port 0 chooses a free port. Without a key the broker is bound only to loopback
+    with a random key known just to the local workers.
+    """
+
+    def __init__(self, world, address, authkey = None):
+        if authkey is None:
+            authkey = environment_authkey()
+        if not authkey:
+            if not is_loopback(address[0]):
+                raise ValueError("The broker on '" + str(address[0]) + "' is reachable from other machines, "
+                                 "set its key in the environment variable " + EVAL_BROKER_AUTHKEY_ENV)
+            authkey = secrets.token_bytes(32)
+
+        self.manager = BrokerManager(address=address, authkey=authkey)
+        self.manager.start()
+        self.address = self.manager.address
+        self.authkey = authkey
+        self.queue = self.manager.work_queue()
+        self.queue.publish_world(world)
+
+
+    def evaluate(self, chunks):
+        """Lets the workers evaluate the chunks and waits for their results.
+
+        Args:
+            chunks (list): chunks of the encoded programs
+
+        Returns:
+            list: results of the chunks in their order
+        """
+        return self.queue.collect(self.queue.submit(chunks))
+
+
+    def close(self):
+        """
+        Stops the broker process, the workers connected to it leave.
+        """
+        self.manager.shutdown()
+
+
+def run_worker(address, authkey, evaluate, poll = 1.0):
+    """Connects to the broker and evaluates its chunks until the broker stops.
+
+    Args:
+        address (tuple): host and port of the broker
+        authkey (bytes): authentication key of the broker
+        evaluate (function): evaluates a chunk of programs in the given world, see evaluate_programs()
+        poll (float): time of waiting for a chunk before asking again in seconds
+    """
+    try:
+        manager = BrokerManager(address=address, authkey=authkey)
+        manager.connect()
+        queue = manager.work_queue()
+        world = queue.get_world()
+
+        while True:
+            task = queue.take(poll)
+            if task is not None:
+                task_id, programs = task
+                queue.complete(task_id, evaluate(programs, world))
+
+    except (EOFError, OSError): # the broker has stopped
+        pass
+
+
+if __name__ == '__main__':
+    from executor import evaluate_programs
+
+    if len(sys.argv) != 3:
+        print("usage: python broker.py HOST PORT")
+        sys.exit(1)
+
+    if not environment_authkey():
+        print("the key of the broker is not set in the environment variable " + EVAL_BROKER_AUTHKEY_ENV)
+        sys.exit(1)
+
+    run_worker((sys.argv[1], int(sys.argv[2])), environment_authkey(), evaluate_programs)
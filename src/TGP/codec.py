@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: codec.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the versioned codec of the trees. A tree is encoded as the opcode bytes
+           of its nodes in prefix order (see GPTree.serialize(), the linear genome is encoded the same way),
+           or as a compact text of one character per node. Whole populations are encoded into one buffer,
+           which is sent between the processes and saved in the checkpoints.
+"""
+
+import struct
+import numpy as np
+from genome import Genome
+
+CODEC_VERSION = 1
+MAGIC = b"GPT"  # binary tree or population
+TEXT_MAGIC = "T"  # compact text of a tree
+
+# characters of the opcodes in the compact text, an opcode holds the symbol and three bits of the sub-trees
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+/"
+
+HEADER = struct.Struct("<3sBI")  # magic, version and number of the programs of the population
+
+
+def encode(individual):
+    """Encodes the tree into bytes, the header (magic and version) is followed by its opcodes.
+
+    Args:
+        individual (GPTree/LinearTree): tree
+
+    Returns:
+        bytes: encoded tree
+    """
+    return MAGIC + bytes([CODEC_VERSION]) + individual.serialize()
+
+
+def decode(data):
+    """Creates the tree encoded by encode().
+
+    Args:
+        data (bytes): encoded tree
+
+    Returns:
+        GPTree/LinearTree: tree, see GENOME in init_params.py
+    """
+    _check_header(bytes(data[:3]), data[3])
+    return Genome.deserialize(data[4:])
+
+
+def encode_text(individual):
+    """Encodes the tree into a compact text, one character per node, e.g. 'T1:e53' for PROGN2 of MOVE and LEFT.
+
+    Args:
+        individual (GPTree/LinearTree): tree
+
+    Returns:
+        str: encoded tree
+    """
+    return TEXT_MAGIC + str(CODEC_VERSION) + ":" + "".join(ALPHABET[opcode] for opcode in individual.serialize())
+
+
+def decode_text(text):
+    """Creates the tree encoded by encode_text().
+
+    Args:
+        text (str): encoded tree, the surrounding whitespace is ignored
+
+    Returns:
+        GPTree/LinearTree: tree, see GENOME in init_params.py
+    """
+    header, _, body = text.strip().partition(":")
+    if header != TEXT_MAGIC + str(CODEC_VERSION):
+        raise ValueError("Unsupported header of the encoded tree '" + header + "'")
+    return Genome.deserialize(bytes(ALPHABET.index(character) for character in body))
+
+
+def encode_population(population):
+    """Encodes the trees of the population into one buffer. The header is followed by the table
+        of the offsets of the programs (uint32) and the opcodes of the programs.
+
+    Args:
+        population (list): trees
+
+    Returns:
+        bytes: encoded population
+    """
+    programs = [individual.serialize() for individual in population]
+    offsets = np.cumsum([0] + [len(program) for program in programs], dtype=np.uint32)
+    return HEADER.pack(MAGIC, CODEC_VERSION, len(programs)) + offsets.tobytes() + b"".join(programs)
+
+
+def decode_population(data):
+    """Creates the trees of the population encoded by encode_population().
+
+    Args:
+        data (bytes): encoded population
+
+    Returns:
+        list: trees, their sub-trees are shared when HASH_CONSING is turned on
+    """
+    data = bytes(data)
+    magic, version, count = HEADER.unpack_from(data)
+    _check_header(magic, version)
+
+    offsets = np.frombuffer(data, dtype=np.uint32, count=count + 1, offset=HEADER.size).tolist()
+    programs = data[HEADER.size + 4 * (count + 1):]
+    return [Genome.deserialize(programs[offsets[i]:offsets[i + 1]]).share() for i in range(count)]
+
+
+def _check_header(magic, version):
+    """
+    Raises ValueError when the data are not encoded by this version of the codec.
+    """
+    if magic != MAGIC:
+        raise ValueError("The data are not an encoded tree")
+    if version != CODEC_VERSION:
+        raise ValueError("Unsupported version of the encoded tree " + str(version))
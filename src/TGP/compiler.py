@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: compiler.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains a compiler translating GP trees into flat arrays of opcodes
+           and a non-recursive interpreter of those arrays.
+"""
+
+from array import array
+from tree import SYMBOLS
+from init_params import POS_X, POS_Y
+from ant import TURN_LEFT, TURN_RIGHT, run_passes
+
+# every instruction of the compiled program is a single integer packing
+# the opcode into the lowest bits and the jump target into the rest of them
+OP_MOVE = 0
+OP_LEFT = 1
+OP_RIGHT = 2
+OP_IF_FOOD_AHEAD = 3
+OP_BITS = 2
+OP_MASK = (1 << OP_BITS) - 1
+
+OPCODES = {'MOVE': OP_MOVE, 'LEFT': OP_LEFT, 'RIGHT': OP_RIGHT, 'IF_FOOD_AHEAD': OP_IF_FOOD_AHEAD}
+
+
+def compile_tree(tree):
+    """Compiles the tree into a prefix-order array of opcodes.
+
+        Functions PROGN2 and PROGN3 only sequence their sub-trees, so they
+        disappear from the compiled program. IF_FOOD_AHEAD keeps its place and
+        its jump target points to the first instruction of the false branch,
+        the true branch starts right behind it. Terminals carry the target
+        of the instruction executed after them, which is usually the next one,
+        but the last terminal of a true branch skips the whole false branch.
+        Target equal to the length of the array ends the pass of the program.
+
+    Args:
+        tree (GPTree): tree to be compiled
+
+    Returns:
+        array: compiled program
+    """
+    code = array('l')
+    _emit(tree, code)
+    return code
+
+
+def _emit(tree, code):
+    """Recursively appends instructions of the sub-tree in prefix order.
+
+    Args:
+        tree (GPTree): (sub-)tree to be compiled
+        code (array): compiled program so far
+    """
+    data = tree.data
+
+    if data == 'IF_FOOD_AHEAD':
+        position = len(code)
+        code.append(OP_IF_FOOD_AHEAD)
+        _emit(tree.left, code)
+        false_branch = len(code)
+        _emit(tree.right, code)
+        end = len(code)
+
+        _link_branches(code, position, false_branch, end)
+
+    elif data == 'PROGN2':
+        _emit(tree.left, code)
+        _emit(tree.right, code)
+
+    elif data == 'PROGN3':
+        _emit(tree.left, code)
+        _emit(tree.middle, code)
+        _emit(tree.right, code)
+
+    elif data in OPCODES:
+        code.append(((len(code) + 1) << OP_BITS) | OPCODES[data])
+
+    else:
+        raise ValueError("Unknown instruction '" + str(data) + "' cannot be compiled.")
+
+
+def compile_code(tree_code):
+    """Compiles the code of the linear genome (see linear.py) into the same array
+        as compile_tree() compiles the equal tree.
+
+    Args:
+        tree_code (bytes): indexes of the symbols of the nodes in SYMBOLS in prefix order
+
+    Returns:
+        array: compiled program
+    """
+    code = array('l')
+    _emit_code(tree_code, 0, code)
+    return code
+
+
+def _emit_code(tree_code, node, code):
+    """Recursively appends instructions of the sub-tree starting at the node, see _emit().
+
+    Args:
+        tree_code (bytes): code of the linear genome
+        node (int): index of the root of the sub-tree
+        code (array): compiled program so far
+
+    Returns:
+        int: index behind the sub-tree
+    """
+    data = SYMBOLS[tree_code[node]]
+    node += 1
+
+    if data == 'IF_FOOD_AHEAD':
+        position = len(code)
+        code.append(OP_IF_FOOD_AHEAD)
+        node = _emit_code(tree_code, node, code)
+        false_branch = len(code)
+        node = _emit_code(tree_code, node, code)
+        _link_branches(code, position, false_branch, len(code))
+
+    elif data in ('PROGN2', 'PROGN3'):
+        for _ in range(2 if data == 'PROGN2' else 3):
+            node = _emit_code(tree_code, node, code)
+
+    else:
+        code.append(((len(code) + 1) << OP_BITS) | OPCODES[data])
+
+    return node
+
+
+def _link_branches(code, position, false_branch, end):
+    """
+    Sets the jump target of IF_FOOD_AHEAD at the position to its false branch,
+    the terminals finishing the true branch have to jump over the false branch.
+    """
+    code[position] = (false_branch << OP_BITS) | OP_IF_FOOD_AHEAD
+    for pc in range(position + 1, false_branch):
+        if code[pc] >> OP_BITS == false_branch and code[pc] & OP_MASK != OP_IF_FOOD_AHEAD:
+            code[pc] = (end << OP_BITS) | (code[pc] & OP_MASK)
+
+
+def interpret_compiled(code, ant, world):
+    """Interprets one pass of the compiled program, analogously to interpret_trail()
+        in interpret.py, but without recursion and string comparisons.
+
+    Args:
+        code (array): compiled program
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    direction = ant.dir
+    trail_buffer, trail_len = ant.trail_buffer, ant.trail_len
+    food, eaten, undo_log = world.food, world.eaten, world.undo_log
+    ahead, off_grid, cell_x, cell_y = world.ahead, world.off_grid, world.cell_x, world.cell_y
+    cell = world.cell(ant.x, ant.y)
+
+    pc = 0
+    end = len(code)
+    while pc < end:
+        instruction = code[pc]
+        op = instruction & OP_MASK
+
+        if op == OP_IF_FOOD_AHEAD:
+            if food[ahead[cell * 8 + direction]]:
+                pc += 1  # true branch follows the condition
+                continue
+
+        elif op == OP_MOVE:
+            target = ahead[cell * 8 + direction]
+            if target != off_grid:
+                cell = target
+                if trail_len == len(trail_buffer):
+                    ant.trail_len = trail_len
+                    ant.grow()
+                    trail_buffer = ant.trail_buffer
+                trail_buffer[trail_len, POS_X] = cell_x[cell]
+                trail_buffer[trail_len, POS_Y] = cell_y[cell]
+                trail_len += 1
+
+                if food[cell] and not eaten[cell]: # see World.visit_cell()
+                    eaten[cell] = 1
+                    undo_log.append(cell)
+
+        elif op == OP_LEFT:
+            direction = TURN_LEFT[direction]
+
+        else:
+            direction = TURN_RIGHT[direction]
+
+        pc = instruction >> OP_BITS
+
+    ant.x, ant.y, ant.dir = cell_x[cell], cell_y[cell], direction
+    ant.trail_len = trail_len
+
+    return ant
+
+
+def run_compiled(code, ant, world):
+    """Repeatedly interprets the compiled program until the maximal time or the maximal
+        length of the ant's trail is reached, see run_passes() in ant.py.
+
+    Args:
+        code (array): compiled program
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
+    """
+    return run_passes(ant, lambda: interpret_compiled(code, ant, world))
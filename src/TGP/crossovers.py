@@ -5,19 +5,44 @@
     file: crossovers.py
     author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
     date: 8/5/2023
-    brief: This file contains two different methods that try to deal with the bloat problem with the crossover operator.
+    brief: This file contains three different methods that try to deal with the bloat problem with the crossover operator.
 """
 
-from copy import deepcopy
 from random import randint
 from init_params import MAX_DEPTH
 
+
+class OperatorCost:
+    """
+    This class counts the operations the crossover methods perform, so their costs
+    per offspring can be compared, see CROSSOVER in init_params.py.
+    """
+
+    def __init__(self):
+        self.offspring = 0 # offspring created by the crossover methods
+        self.crossovers = 0 # crossovers, including the retried ones
+        self.mutations = 0 # mutations replacing the failed crossovers
+        self.cuts = 0 # trees aligned to MAX_DEPTH
+
+
+    def per_offspring(self):
+        """Returns the average number of operations per offspring, 0 when there is none"""
+        if not self.offspring:
+            return 0.0
+        return (self.crossovers + self.mutations + self.cuts) / self.offspring
+
+
+# operations of the crossover methods of the process
+operator_cost = OperatorCost()
+
+
 def crossover_twice_mutation(parent1, parent2):
     """ Crossover of two trees with limited height MAX_HEIGHT
 
             Starts as the basic crossover, if the result is not acceptable,
             it runs the crossover again. If the result is not acceptable
-            again, mutation is going to happen.
+            again, mutation is going to happen. The parents are not changed,
+            so they do not have to be copied.
 
         Args:
             parent1 (GPTree): first parent
@@ -26,30 +51,31 @@ def crossover_twice_mutation(parent1, parent2):
         Returns:
             GPTree: offspring
         """
-    copy_parent1  = deepcopy(parent1)
-    copy_parent1_ = deepcopy(parent1)
-    copy_parent2  = deepcopy(parent2)
-   
-    parent1.crossover(parent2) # FIRST crossover
+    operator_cost.offspring += 1
+    operator_cost.crossovers += 1
+    offspring = parent1.crossover(parent2) # FIRST crossover
 
     # check whether the FIRST offspring meets the limit requirements
-    if parent1.height() > MAX_DEPTH:
+    if offspring.height() > MAX_DEPTH:
 
         # if not, do the SECOND crossover
-        copy_parent1.crossover(copy_parent2)
+        operator_cost.crossovers += 1
+        second_offspring = parent1.crossover(parent2)
 
         # check whether the SECOND offspring meets the limit requirements
-        if  copy_parent1.height() > MAX_DEPTH:
+        if second_offspring.height() > MAX_DEPTH:
             
             # if not, do the MUTATION and eventually cut the tree
-            copy_parent1_.mutation([randint(0, parent1.size())])
-            copy_parent1_.align_tree()
-            parent1 = deepcopy(copy_parent1_)
+            operator_cost.mutations += 1
+            mutated = parent1.mutation(randint(0, offspring.size()))
+            offspring = mutated.align_tree()
+            if offspring is not mutated:
+                operator_cost.cuts += 1
 
         else:
-            parent1 = deepcopy(copy_parent1)
+            offspring = second_offspring
 
-    return parent1
+    return offspring
     
 def crossover_and_cut(parent1, parent2):
     """Performs standard crossover and eventually align it
@@ -63,8 +89,29 @@ def crossover_and_cut(parent1, parent2):
     Returns:
         GPTree: offspring
     """
-    parent1.crossover(parent2)
-    if parent1.height() > MAX_DEPTH:
-        parent1.align_tree()
+    operator_cost.offspring += 1
+    operator_cost.crossovers += 1
+    offspring = parent1.crossover(parent2)
+    if offspring.height() > MAX_DEPTH:
+        operator_cost.cuts += 1
+        offspring = offspring.align_tree()
 
-    return parent1
+    return offspring
+
+
+def crossover_depth_aware(parent1, parent2):
+    """Performs crossover taking the sub-tree of the second parent only from
+        those fitting the maximum height at the cross-point, see bounded_crossover()
+        in tree.py. The offspring of the parents within the limits meets them
+        right away, so it is never retried, mutated or cut.
+
+    Args:
+        parent1 (GPTree): first parent
+        parent2 (GPTree): second parent
+
+    Returns:
+        GPTree: offspring
+    """
+    operator_cost.offspring += 1
+    operator_cost.crossovers += 1
+    return parent1.bounded_crossover(parent2)
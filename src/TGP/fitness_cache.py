@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: fitness_cache.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains a bounded cache of already computed fitness values and trails,
+           so the copies of already evaluated trees do not have to be simulated again.
+"""
+
+from collections import OrderedDict
+from init_params import MAX_TIME, MAX_ANT_TRAIL_LEN
+
+
+def trail_id(world):
+    """Identifies the food trail by the content of the map.
+
+    Args:
+        world (World): food map of the trail
+
+    Returns:
+        int: identifier of the trail
+    """
+    return hash((world.size, bytes(world.food)))
+
+
+class FitnessCache:
+    """
+    This class holds results of the evaluations, the least recently used ones
+    are dropped when the cache is full. Hits and misses are counted.
+    """
+
+    def __init__(self, size):
+        self.size = size  # maximal number of stored results
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def key(self, individual, trail):
+        """Creates the key of the individual's result, the result depends on the program,
+            the trail and the limits of the simulation.
+
+        Args:
+            individual (GPTree): evaluated tree
+            trail (int): identifier of the trail
+
+        Returns:
+            tuple: key
+        """
+        return (individual.structural_hash(), trail, MAX_TIME, MAX_ANT_TRAIL_LEN)
+
+
+    def lookup(self, key):
+        """Searches for the result and counts the hit or the miss.
+
+        Args:
+            key (tuple): key of the result
+
+        Returns:
+            tuple: fitness, trail and the final state of the ant, None when missing
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+
+    def store(self, key, individual):
+        """Stores the result of the evaluated individual.
+
+        Args:
+            key (tuple): key of the result
+            individual (GPTree): already evaluated tree
+
+        Returns:
+            tuple: stored entry
+        """
+        ant = individual.ant
+        entry = (individual.fitness, ant.trail.copy(), (ant.x, ant.y, ant.dir))
+
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+        return entry
+
+
+    @staticmethod
+    def restore(entry, individual):
+        """Sets the stored result to the individual as if it had been evaluated.
+
+        Args:
+            entry (tuple): stored result
+            individual (GPTree): tree to be rated
+        """
+        fitness, trail, state = entry
+
+        individual.reset_ant_info()
+        individual.ant.load(trail, state)
+        individual.fitness = fitness
+
+
+    def hit_rate(self):
+        """Returns the ratio of the lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: fitness_recorder.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the recorder of the fitnesses of the whole population at every generation.
+           The GENS x POP_SIZE matrices are memory-mapped .npy files, so neither the run nor the analysis
+           has to hold them in memory.
+"""
+
+import os
+import json
+import tempfile
+import numpy as np
+from init_params import FITNESS_RECORDER, RECORD_SIZES
+
+
+class FitnessRecorder:
+    """
+    This class writes the rows of the generations into the memory-mapped matrices of the run,
+    every run gets its own directory in FITNESS_RECORDER. The fitnesses and sizes are stored
+    as int16, the rows of the generations not evolved are -1.
+    """
+
+    def __init__(self, gens, pop_size, size = None, directory = FITNESS_RECORDER, path = None):
+        """
+        Args:
+            gens (int): maximal number of generations
+            pop_size (int): population size
+            size (function): returns the size of the individual, None when the sizes are not recorded
+            directory (str): directory of the recordings of the runs
+            path (str): recording of the interrupted run continued from its checkpoint, None for a new run
+        """
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = tempfile.mkdtemp(prefix='run-', dir=directory)
+        mode = 'r+' if os.path.exists(os.path.join(path, 'fitness.npy')) else 'w+'
+
+        self.path = path
+        self.size = size
+        self.fitness = self._open('fitness.npy', mode, gens, pop_size)
+        self.sizes = self._open('sizes.npy', mode, gens, pop_size) if size is not None else None
+        self.generations = int(np.count_nonzero(self.fitness[:, 0] >= 0))  # number of the recorded generations
+
+
+    def _open(self, name, mode, gens, pop_size):
+        """
+        Opens the matrix of the recording, the rows of a new matrix are -1.
+        """
+        matrix = np.lib.format.open_memmap(os.path.join(self.path, name), mode=mode, dtype=np.int16, shape=(gens, pop_size))
+        if mode == 'w+':
+            matrix[:] = -1
+        return matrix
+
+
+    def record(self, gen, population):
+        """Writes the row of the generation.
+
+        Args:
+            gen (int): generation
+            population (list): evaluated population
+        """
+        self.fitness[gen] = [individual.fitness for individual in population]
+        if self.sizes is not None:
+            self.sizes[gen] = [self.size(individual) for individual in population]
+        self.generations = max(self.generations, gen + 1)
+
+
+    def close(self):
+        """
+        Writes the matrices to the disk, the number of the recorded generations is saved
+        into meta.json, so the reader ignores the rows not evolved.
+        """
+        self.fitness.flush()
+        if self.sizes is not None:
+            self.sizes.flush()
+
+        with open(os.path.join(self.path, 'meta.json'), 'w') as meta_file:
+            json.dump({'generations': self.generations, 'pop_size': self.fitness.shape[1],
+                       'sizes': self.sizes is not None}, meta_file)
+
+        self.fitness = self.sizes = None
+
+
+def new_recorder(gens, pop_size, size, path = None):
+    """Returns the recorder of the run, None when FITNESS_RECORDER is turned off.
+
+    Args:
+        gens (int): maximal number of generations
+        pop_size (int): population size
+        size (function): returns the size of the individual, it is used only with RECORD_SIZES
+        path (str): recording of the interrupted run continued from its checkpoint, None for a new run
+    """
+    if not FITNESS_RECORDER:
+        return None
+    return FitnessRecorder(gens, pop_size, size if RECORD_SIZES else None, FITNESS_RECORDER, path)
+
+
+class Recording:
+    """
+    This class opens the recorded matrices of the run lazily, the rows are read from the disk
+    only when they are used.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json'), 'r') as meta_file:
+            meta = json.load(meta_file)
+
+        self.path = path
+        self.generations = meta['generations']
+        self.fitness = np.load(os.path.join(path, 'fitness.npy'), mmap_mode='r')[:self.generations]
+        self.sizes = None
+        if meta['sizes']:
+            self.sizes = np.load(os.path.join(path, 'sizes.npy'), mmap_mode='r')[:self.generations]
+
+
+    def stats(self, matrix = None, chunk = 1024):
+        """Computes the best, average and worst value of every generation, only 'chunk'
+            generations are in the memory at once.
+
+        Args:
+            matrix (ndarray): recorded matrix, the fitnesses when None
+            chunk (int): number of the generations read at once
+
+        Returns:
+            tuple: arrays of the minimal, average and maximal values of the generations
+        """
+        matrix = self.fitness if matrix is None else matrix
+        minimum = np.empty(len(matrix), dtype=np.int16)
+        average = np.empty(len(matrix))
+        maximum = np.empty(len(matrix), dtype=np.int16)
+
+        for start in range(0, len(matrix), chunk):
+            rows = np.asarray(matrix[start:start + chunk])
+            minimum[start:start + len(rows)] = rows.min(axis=1)
+            average[start:start + len(rows)] = rows.mean(axis=1)
+            maximum[start:start + len(rows)] = rows.max(axis=1)
+
+        return minimum, average, maximum
+
+
+def open_recordings(directory = FITNESS_RECORDER):
+    """Returns the finished recordings of the runs in the directory"""
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    return [Recording(path) for path in paths if os.path.exists(os.path.join(path, 'meta.json'))]
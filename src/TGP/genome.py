@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: genome.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file selects the representation of the individuals of the runs, see GENOME in init_params.py.
+"""
+
+from tree import GPTree
+from linear import LinearTree
+from init_params import GENOME
+
+GENOMES = ('TREE', 'LINEAR')
+
+if GENOME not in GENOMES:
+    raise ValueError("Unknown genome '" + str(GENOME) + "', possible: " + ", ".join(GENOMES))
+
+Genome = LinearTree if GENOME == 'LINEAR' else GPTree  # class of the individuals of the runs
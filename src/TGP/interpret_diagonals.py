@@ -8,163 +8,88 @@
     brief: This file contains interpret for ant's trail with diagonals motion.
 """
 
-from copy import deepcopy
-from init_params import GRID_SIZE, POS_X, POS_Y
+# RIGHT and LEFT turn the ant to the next basic direction, diagonals are rounded towards it
+TURN_RIGHT_DIAG = tuple((direction + 2 - direction % 2) % 8 for direction in range(8))
+TURN_LEFT_DIAG = tuple((direction - 2 + direction % 2) % 8 for direction in range(8))
 
-def interpret_trail(tree, ant, trail, array):
+# RIGHT+ and LEFT+ turn the ant by 45°
+TURN_RIGHT_HALF = tuple((direction + 1) % 8 for direction in range(8))
+TURN_LEFT_HALF = tuple((direction - 1) % 8 for direction in range(8))
+
+
+def interpret_trail(tree, ant, world):
     """Interprets ant's trail diagonally.
 
     Args:
-        individual (Individual): program to be interpreted
-        ant (dict): info about ant's position and direction
-        trail (list): ant's trail
-        array (array): 2d map
+        tree (GPTree): program to be interpreted
+        ant (AntState): ant's position, direction and trail
+        world (World): food map and the food eaten by the ant
     """
 
     # gets current (non)terminal from a node in a tree
     current_data = str(getattr(tree, "data")) 
 
-    # current ant's position
-    x, y = ant['pos'][POS_X], ant['pos'][POS_Y]
-
     if "IF_FOOD_AHEAD" == current_data:
-        food_ahead = 0
-
-        if ant['dir'] == 'right' and not ant['pos'][POS_Y] == GRID_SIZE - 1:
-            food_ahead = array[x][y + 1]
-
-        if ant['dir'] == 'up' and not ant['pos'][POS_X] == 0:
-            food_ahead = array[x - 1][y]
-
-        if ant['dir'] == 'down' and not ant['pos'][POS_X] == GRID_SIZE - 1:
-            food_ahead = array[x + 1][y]
-
-        if ant['dir'] == 'left' and not ant['pos'][POS_Y] == 0:
-            food_ahead = array[x][y - 1]
-
-        if ant['dir'] == 'up-right' and not (ant['pos'][POS_Y] == GRID_SIZE-1 or ant['pos'][POS_X] == GRID_SIZE-1):
-            food_ahead = array[x - 1][y + 1]
-
-        if ant['dir'] == 'up-left' and not (ant['pos'][POS_Y] == 0 or ant['pos'][POS_X] == 0):
-            food_ahead = array[x - 1][y - 1]
 
-        if ant['dir'] == 'down-right' and not (ant['pos'][POS_Y] == GRID_SIZE-1 or ant['pos'][POS_X] == GRID_SIZE-1):
-            food_ahead = array[x + 1][y + 1]
-
-        if ant['dir'] == 'down-left' and not (ant['pos'][POS_X] == GRID_SIZE-1 or ant['pos'][POS_Y] == 0):
-            food_ahead = array[x+  1][y - 1]
+        # the cell off the grid has no food
+        food_ahead = world.food[world.cell_ahead(ant)]
 
         if food_ahead == 1:
-            ant, trail = interpret_trail(tree.left, ant, trail, array)
+            ant = interpret_trail(tree.left, ant, world)
 
         else:
-            ant, trail = interpret_trail(tree.right, ant,trail, array)
+            ant = interpret_trail(tree.right, ant, world)
 
-        return ant, trail
+        return ant
 
     elif "PROGN2" == current_data:
 
-        ant, trail = interpret_trail(tree.left, ant, trail, array)
-        ant, trail = interpret_trail(tree.right, ant, trail, array)
+        ant = interpret_trail(tree.left, ant, world)
+        ant = interpret_trail(tree.right, ant, world)
 
-        return ant, trail
+        return ant
     
     elif "PROGN3" == current_data:
 
-        ant, trail = interpret_trail(tree.left, ant, trail, array)
-        ant, trail = interpret_trail(tree.middle, ant, trail, array)
-        ant, trail = interpret_trail(tree.right, ant, trail, array)
+        ant = interpret_trail(tree.left, ant, world)
+        ant = interpret_trail(tree.middle, ant, world)
+        ant = interpret_trail(tree.right, ant, world)
 
-        return ant, trail
+        return ant
 
     # the ant turns 45° or 90° clockwise on the spot
     elif "RIGHT" == current_data:
 
-        if   ant['dir'] == 'up':         ant['dir'] = 'right'
-        elif ant['dir'] == 'up-right':   ant['dir'] = 'right'
-        elif ant['dir'] == 'right':      ant['dir'] = 'down'
-        elif ant['dir'] == 'down-right': ant['dir'] = 'down'
-        elif ant['dir'] == 'down':       ant['dir'] = 'left'
-        elif ant['dir'] == 'down-left':  ant['dir'] = 'left'
-        elif ant['dir'] == 'left':       ant['dir'] = 'up'
-        elif ant['dir'] == 'up-left':    ant['dir'] = 'up'
+        ant.dir = TURN_RIGHT_DIAG[ant.dir]
 
-        return ant, trail
+        return ant
 
     # the ant turns 45° or 90° counterclockwise on the spot
     elif "LEFT" == current_data:
 
-        if   ant['dir'] == 'up':         ant['dir'] = 'left'
-        elif ant['dir'] == 'up-left':    ant['dir'] = 'left'
-        elif ant['dir'] == 'left':       ant['dir'] = 'down'
-        elif ant['dir'] == 'down-left':  ant['dir'] = 'down'
-        elif ant['dir'] == 'down':       ant['dir'] = 'right'
-        elif ant['dir'] == 'down-right': ant['dir'] = 'right'
-        elif ant['dir'] == 'right':      ant['dir'] = 'up'
-        elif ant['dir'] == 'up-right':   ant['dir'] = 'up'
+        ant.dir = TURN_LEFT_DIAG[ant.dir]
 
-        return ant, trail
+        return ant
 
     # ^ this instruction needs to be added to instruction list in init_params.py
     # the ant turns 45° clockwise on the spot
     elif "RIGHT+" == current_data:
 
-        if   ant['dir'] == 'up':         ant['dir'] = 'up-right'
-        elif ant['dir'] == 'up-right':   ant['dir'] = 'right'
-        elif ant['dir'] == 'right':      ant['dir'] = 'down-right'
-        elif ant['dir'] == 'down-right': ant['dir'] = 'down'
-        elif ant['dir'] == 'down':       ant['dir'] = 'down-left'
-        elif ant['dir'] == 'down-left':  ant['dir'] = 'left'
-        elif ant['dir'] == 'left':       ant['dir'] = 'up-left'
-        elif ant['dir'] == 'up-left':    ant['dir'] = 'up'
+        ant.dir = TURN_RIGHT_HALF[ant.dir]
 
-        return ant, trail
+        return ant
 
     # ^ this instruction needs to be added to instruction list in init_params.py
     # the ant turns 45° counterclockwise on the spot
     elif "LEFT+" == current_data:
 
-        if   ant['dir'] == 'up':         ant['dir'] = 'up-left'
-        elif ant['dir'] == 'up-left':    ant['dir'] = 'left'
-        elif ant['dir'] == 'left':       ant['dir'] = 'down-left'
-        elif ant['dir'] == 'down-left':  ant['dir'] = 'down'
-        elif ant['dir'] == 'down':       ant['dir'] = 'down-right'
-        elif ant['dir'] == 'down-right': ant['dir'] = 'right'
-        elif ant['dir'] == 'right':      ant['dir'] = 'up-right'
-        elif ant['dir'] == 'up-right':   ant['dir'] = 'up'
+        ant.dir = TURN_LEFT_HALF[ant.dir]
 
-        return ant, trail
+        return ant
 
     elif "MOVE" == current_data:
-        if ant['dir'] == 'up' and not ant['pos'][POS_X] == 0:
-            ant['pos'][POS_X]= x - 1
-
-        elif ant['dir'] == 'right' and not ant['pos'][POS_Y] == GRID_SIZE - 1:
-            ant['pos'][POS_Y]= y + 1
-
-        elif ant['dir'] == 'down' and not ant['pos'][POS_X] == GRID_SIZE - 1:
-            ant['pos'][POS_X]= x + 1
-
-        elif ant['dir'] == 'left' and not ant['pos'][POS_Y] == 0:
-            ant['pos'][POS_Y] = y - 1
-
-        elif ant['dir'] == 'up-right' and not (ant['pos'][POS_Y] == GRID_SIZE - 1 or ant['pos'][POS_X] == 0):
-            ant['pos'][POS_X]= x - 1
-            ant['pos'][POS_Y]= y + 1
-
-        elif ant['dir'] == 'up-left' and not (ant['pos'][POS_Y] == 0 or ant['pos'][POS_X] == 0):
-            ant['pos'][POS_X]= x - 1
-            ant['pos'][POS_Y]= y - 1
-
-        elif ant['dir'] == 'down-right' and not (ant['pos'][POS_Y] == GRID_SIZE - 1 or ant['pos'][POS_X] == GRID_SIZE - 1):
-            ant['pos'][POS_X]= x + 1
-            ant['pos'][POS_Y]= y + 1
-
-        elif ant['dir'] == 'down-left' and not (ant['pos'][POS_X] == GRID_SIZE - 1 or ant['pos'][POS_Y] == 0):
-            ant['pos'][POS_X]= x + 1
-            ant['pos'][POS_Y]= y - 1
 
-        if ant['pos'] != trail[-1]:
-            trail.append(deepcopy(ant['pos']))
+        # the ant stays on the spot at the border of the grid
+        world.move(ant)
 
-        return ant, trail
+        return ant
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: islands.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the island model, i.e. populations evolving in their own processes
+           and exchanging their best individuals every few generations.
+"""
+
+import queue
+from random import seed, choice
+from multiprocessing import Process, Queue, Event
+from codec import encode_population, decode_population
+from print_stats import print_islands_stats
+from init_params import ISLANDS, MIGRATION_INTERVAL, MIGRANTS, MIGRATION_TOPOLOGY
+
+TOPOLOGIES = ('RING', 'RANDOM')
+
+
+class Island:
+    """
+    This class connects the run to the other islands. The migrants are sent encoded
+    into the inboxes of the neighbouring islands, the ring topology sends them to the next
+    island, the random topology to a randomly chosen one. Migrants are not waited for,
+    the ones arrived so far are taken at every migration.
+    """
+
+    def __init__(self, index, inboxes, solved, reports, topology = MIGRATION_TOPOLOGY):
+        if topology not in TOPOLOGIES:
+            raise ValueError("Unknown migration topology '" + str(topology) + "', possible: " + ", ".join(TOPOLOGIES))
+
+        self.index = index
+        self.inboxes = inboxes  # queues of the migrants of all the islands
+        self.solved = solved  # set by the island which has found the solution
+        self.reports = reports  # queue of the results of the islands
+        self.topology = topology
+        self.emigrants = 0
+        self.immigrants = 0
+
+
+    @property
+    def label(self):
+        """Returns the prefix of the island's output"""
+        return "Island " + str(self.index) + " > "
+
+
+    def neighbour(self):
+        """Returns the index of the island the migrants are sent to"""
+        if self.topology == 'RING':
+            return (self.index + 1) % len(self.inboxes)
+        return choice([index for index in range(len(self.inboxes)) if index != self.index])
+
+
+    def migrate(self, population, gen, evaluate):
+        """Every MIGRATION_INTERVAL generations sends copies of the best MIGRANTS individuals
+            to the neighbour and replaces the worst individuals by the arrived migrants.
+
+        Args:
+            population (list): evaluated population of the island, changed in place
+            gen (int): current generation
+            evaluate (function): evaluates a list of individuals
+        """
+        if (gen + 1) % MIGRATION_INTERVAL or len(self.inboxes) < 2:
+            return
+
+        best = sorted(population, key=lambda individual: individual.fitness)[:MIGRANTS]
+        self.inboxes[self.neighbour()].put(encode_population(best))
+        self.emigrants += len(best)
+
+        migrants = []
+        while True:
+            try:
+                migrants.extend(decode_population(self.inboxes[self.index].get_nowait()))
+            except queue.Empty:
+                break
+
+        migrants = migrants[:len(population) - 1] # the elite individual stays
+        if not migrants:
+            return
+
+        evaluate(migrants)
+        worst = sorted(range(len(population)), key=lambda i: population[i].fitness, reverse=True)
+        for i, migrant in zip(worst, migrants):
+            population[i] = migrant
+        self.immigrants += len(migrants)
+
+
+    def stopped(self):
+        """Returns whether some island has already found the solution"""
+        return self.solved.is_set()
+
+
+    def report(self, record):
+        """Sends the results of the island to the main process.
+
+        Args:
+            record (dict): results of the run of the island, see tree_genetic_programming() in main.py
+        """
+        if record['fitness'] == 0:
+            self.solved.set()
+
+        self.reports.put(dict(record, island=self.index, emigrants=self.emigrants, immigrants=self.immigrants))
+
+        # migrants nobody is going to take must not block the end of the process
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
+
+
+def run_islands(function, params, change_params, islands = ISLANDS):
+    """Runs the island model, every island is one run of the GP in its own process.
+
+    Args:
+        function (function): main function of the GP taking the island as its third argument
+        params (bool): when True, change params are applied, otherwise not (False)
+        change_params (array): array of three main parameters (POP_SIZE, CROSSOVER_RATE, MUTATION_RATE)
+        islands (int): number of the islands
+
+    Returns:
+        list: records of the runs of the islands
+    """
+    inboxes = [Queue() for _ in range(islands)]
+    solved = Event()
+    reports = Queue()
+
+    proc = [] # processes
+    for index in range(islands):
+        island = Island(index, inboxes, solved, reports)
+        p = Process(target=_run_island, args=(function, params, change_params, island))
+        p.start()
+        proc.append(p)
+
+    results = sorted((reports.get() for _ in proc), key=lambda report: report['island'])
+    for process in proc:
+        process.join()
+
+    print_islands_stats(results)
+    return results
+
+
+def _run_island(function, params, change_params, island):
+    """
+    Runs one island, the random generator is seeded again, so the islands do not
+    evolve the same populations as copies of the same process.
+    """
+    seed()
+    function(params, change_params, island)
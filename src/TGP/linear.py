@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: linear.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the linear genome of the TGP, the whole tree is one byte string
+           of the symbols of its nodes in prefix order. The sub-trees are found by the arities
+           of the symbols, so the variation operators only slice and join the byte strings.
+"""
+
+from random import random, randint
+from ant import AntState
+from tree import GPTree, SYMBOLS
+from init_params import MIN_DEPTH, MAX_DEPTH, TERMINALS, FUNCTIONS
+
+# number of the sub-trees of the symbols by their indexes in SYMBOLS
+ARITIES = bytes(3 if symbol == 'PROGN3' else 2 if symbol in FUNCTIONS else 0 for symbol in SYMBOLS)
+
+# translations between the symbols and the bytes of GPTree.serialize() with the bits of the sub-trees
+SERIALIZED = bytes.maketrans(bytes(range(len(SYMBOLS))),
+                             bytes(index | (arity > 0) << 3 | (arity == 3) << 4 | (arity > 0) << 5
+                                   for index, arity in enumerate(ARITIES)))
+SYMBOL_BITS = bytes(byte & 7 for byte in range(256))
+
+
+class LinearTree:
+    """
+    This class represents the tree as a byte string, it has the same interface as GPTree,
+    so the runs can use either of them, see GENOME in init_params.py. The byte strings
+    are immutable, the operators create new ones and the unchanged trees share them.
+    """
+
+    def __init__(self, code = b""):
+        self.code = code  # indexes of the symbols of the nodes in SYMBOLS in prefix order
+        self.fitness = 0
+        self.ant = None # holds ant's position, direction and trail, allocated only for evaluated trees
+        self.struct_hash = None # cached hash of the code, None when not computed yet
+        self.depths = None # cached depths of the nodes, None when not computed yet
+        self.heights = None # cached heights of the sub-trees of the nodes, None when not computed yet
+
+
+    @property
+    def trail(self):
+        """Returns ant's trail as an array of [x, y] pairs"""
+        return self.ant.trail
+
+
+    def reset_ant_info(self):
+        """
+        Resets information about ant's position and direction.
+        """
+        if self.ant is None:
+            self.ant = AntState()
+        else:
+            self.ant.reset()
+
+
+    def structural_hash(self):
+        """Counts hash of the code, the code holds only the executed sub-trees,
+            so it is the same for the trees interpreted in the same way.
+
+        Returns:
+            int: structural hash
+        """
+        if self.struct_hash is None:
+            self.struct_hash = hash(self.code)
+        return self.struct_hash
+
+
+    def serialize(self):
+        """Serializes the tree into the same bytes as GPTree.serialize().
+
+        Returns:
+            bytes: serialized tree
+        """
+        return self.code.translate(SERIALIZED)
+
+
+    @staticmethod
+    def deserialize(data):
+        """Creates the tree serialized by serialize() or GPTree.serialize().
+
+        Args:
+            data (bytes): serialized tree
+
+        Returns:
+            LinearTree: tree
+        """
+        data = bytes(data)
+        code = data.translate(SYMBOL_BITS)
+        if code.translate(SERIALIZED) == data:
+            return LinearTree(code)
+        return LinearTree.from_tree(GPTree.deserialize(data)) # sub-trees left under terminals by mutation
+
+
+    @staticmethod
+    def from_tree(tree):
+        """Creates the linear genome of the tree, only the sub-trees executed by the nodes are kept.
+
+        Args:
+            tree (GPTree): tree
+
+        Returns:
+            LinearTree: tree
+        """
+        code = bytearray()
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            symbol = SYMBOLS.index(node.data)
+            code.append(symbol)
+            children = (node.left, node.middle, node.right) if ARITIES[symbol] == 3 else (node.left, node.right)
+            nodes.extend(reversed(children[:ARITIES[symbol]]))
+        return LinearTree(bytes(code))
+
+
+    def build_subtree(self):
+        """Returns the tree as GPTree, e.g. for the 'RECURSIVE' engine"""
+        return GPTree.deserialize(self.serialize())
+
+
+    def print_tree(self, prefix = "", depth = 0):
+        """Prints the tree, see GPTree.print_tree()"""
+        self.build_subtree().print_tree(prefix, depth)
+
+
+    def random_tree(self, grow, max_depth, depth = 0, mutation = False):
+        """Creates random tree using either grow or full method, the symbols are chosen
+            in the same way as by GPTree.random_tree(), but written right into the code.
+
+        Args:
+            grow (bool): if set to true, grow method is turned on, else full method
+            max_depth (int): max depth of generated tree
+            depth (int, optional): curent depth of the tree, defaults set to 0
+            mutation (bool): whether the tree is the new sub-tree of the mutation
+        """
+        code = bytearray()
+        _random_code(code, grow, max_depth, depth, mutation)
+        self.code = bytes(code)
+        self.struct_hash = None
+        self.depths = None
+        self.heights = None
+
+
+    def size(self):
+        """Counts size of the tree.
+
+        Returns:
+            int: size
+        """
+        return len(self.code)
+
+
+    def height(self):
+        """Counts height of the tree.
+
+        Returns:
+            int: height
+        """
+        return max(self.node_depths()) + 1
+
+
+    def node_depths(self):
+        """Returns the depths of the nodes in prefix order, they are cached.
+
+        Returns:
+            list: depths
+        """
+        if self.depths is None:
+            self.depths = []
+            slots = [1] # sub-trees still missing in the functions on the path to the node
+            for symbol in self.code:
+                self.depths.append(len(slots) - 1)
+                slots[-1] -= 1
+                if ARITIES[symbol]:
+                    slots.append(ARITIES[symbol])
+                while slots and not slots[-1]:
+                    slots.pop()
+        return self.depths
+
+
+    def subtree_heights(self):
+        """Returns the heights of the sub-trees of the nodes in prefix order, they are cached.
+
+        Returns:
+            list: heights
+        """
+        if self.heights is None:
+            heights = []
+            stack = [] # heights of the sub-trees following the node not assigned to a function yet
+            for symbol in reversed(self.code): # the sub-trees of a node are found before the node
+                arity = ARITIES[symbol]
+                height = 1 + max(stack[-arity:]) if arity else 1
+                del stack[len(stack) - arity:]
+                stack.append(height)
+                heights.append(height)
+            self.heights = heights[::-1]
+        return self.heights
+
+
+    def end(self, start):
+        """Returns the index behind the sub-tree starting at the index, it is found
+            by the arities of its symbols.
+
+        Args:
+            start (int): index of the root of the sub-tree
+
+        Returns:
+            int: end of the sub-tree
+        """
+        missing = 1
+        position = start
+        while missing:
+            missing += ARITIES[self.code[position]] - 1
+            position += 1
+        return position
+
+
+    def copy(self):
+        """Returns the copy of the tree, the code is shared.
+
+        Returns:
+            LinearTree: copy of the tree
+        """
+        tree = LinearTree(self.code)
+        tree.fitness = self.fitness
+        tree.struct_hash = self.struct_hash
+        tree.depths = self.depths
+        tree.heights = self.heights
+        return tree
+
+
+    def share(self):
+        """Returns the tree itself, the unchanged codes are already shared, see GPTree.share()"""
+        return self
+
+
+    def align_tree(self):
+        """When maximal depth is exceeded, the functions at depth MAX_DEPTH - 1 are replaced
+            by random terminals, see GPTree.align_tree().
+
+        Returns:
+            LinearTree: aligned tree, it is the tree itself when nothing has to be cut
+        """
+        if self.height() <= MAX_DEPTH:
+            return self
+
+        depths = self.node_depths()
+        code = bytearray()
+        position = 0
+        while position < len(self.code):
+            symbol = self.code[position]
+            if depths[position] == MAX_DEPTH - 1 and ARITIES[symbol]:
+                code.append(len(FUNCTIONS) + randint(0, len(TERMINALS)-1))
+                position = self.end(position)
+            else:
+                code.append(symbol)
+                position += 1
+
+        return LinearTree(bytes(code))
+
+
+    def crossover(self, other):
+        """Crossover variation operator with choosing random point in each parent, the points
+            are chosen in the same way as by GPTree.crossover(). Neither of the parents is changed.
+
+        Args:
+            other (LinearTree): second parent, the first parent is "self"
+
+        Returns:
+            LinearTree: offspring
+        """
+        cross_point = randint(1, other.size())  # choose cross-point in second parent
+        start = _index(cross_point)
+        second = other.code[start:other.end(start)]
+
+        cross_point2 = randint(1, self.size())  # select cross-point in the first tree
+        return self.replaced(_index(cross_point2), second)
+
+
+    def bounded_crossover(self, other):
+        """Crossover variation operator choosing the sub-tree of the second parent only among
+            those fitting MAX_DEPTH at the cross-point in the first parent, see
+            GPTree.bounded_crossover(). Neither of the parents is changed.
+
+        Args:
+            other (LinearTree): second parent, the first parent is "self"
+
+        Returns:
+            LinearTree: offspring
+        """
+        cross_point = randint(1, self.size())  # select cross-point in the first tree
+        start = _index(cross_point)
+        limit = max(MAX_DEPTH - self.node_depths()[start], 1)
+
+        fitting = [position for position, height in enumerate(other.subtree_heights()) if height <= limit]
+        second = fitting[randint(1, len(fitting)) - 1]
+        return self.replaced(start, other.code[second:other.end(second)])
+
+
+    def mutation(self, mut_point):
+        """Mutation variation operator replacing the sub-tree at the point by a random one
+            with the maximal depth of 2, see GPTree.mutation().
+
+        Args:
+            mut_point (int): mutation point in the tree, see GPTree.find_node()
+
+        Returns:
+            LinearTree: mutated tree, the same tree when the point is out of it
+        """
+        start = _index(mut_point)
+        if start >= len(self.code):
+            return self
+        subtree = LinearTree()
+        subtree.random_tree(grow=True, max_depth=2, mutation=True)
+        return self.replaced(start, subtree.code)
+
+
+    def replaced(self, start, code):
+        """Returns the tree with the sub-tree starting at the index replaced by the code.
+
+        Args:
+            start (int): index of the root of the replaced sub-tree
+            code (bytes): code of the new sub-tree
+
+        Returns:
+            LinearTree: new tree
+        """
+        return LinearTree(self.code[:start] + code + self.code[self.end(start):])
+
+
+def _index(point):
+    """
+    Returns the index of the node at the point of GPTree.find_node().
+    """
+    return max(point - 1, 1) - 1
+
+
+def _random_code(code, grow, max_depth, depth, mutation = False):
+    """
+    Appends the symbols of a random sub-tree, see GPTree.random_tree().
+    """
+    if not mutation and (depth < MIN_DEPTH or (depth < max_depth and not grow)):
+        symbol = randint(0, len(FUNCTIONS)-1)
+    elif depth >= max_depth:
+        symbol = len(FUNCTIONS) + randint(0, len(TERMINALS)-1)
+    elif random() > 0.5:
+        symbol = len(FUNCTIONS) + randint(0, len(TERMINALS)-1)
+    else:
+        symbol = randint(0, len(FUNCTIONS)-1)
+
+    code.append(symbol)
+    if ARITIES[symbol]:
+        # the sub-trees are drawn in the order left, right, middle as by GPTree.random_tree(),
+        # so the right one is put behind the middle one afterwards
+        _random_code(code, grow, max_depth, depth + 1)
+        right = bytearray()
+        _random_code(right, grow, max_depth, depth + 1)
+        if ARITIES[symbol] == 3:
+            _random_code(code, grow, max_depth, depth + 1)
+        code += right
+
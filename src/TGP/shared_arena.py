@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: shared_arena.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains numpy arrays placed in shared memory blocks, so the batches
+           of programs and their results do not have to be pickled for the worker processes.
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+
+_attached = {}  # arrays attached by the worker process by their keys, see view()
+
+
+class SharedArena:
+    """
+    This class holds the shared arrays of the main process by their keys. An array
+    which is too small for the batch is replaced by a new one twice as large, so the
+    blocks are reallocated only a few times during the run.
+    """
+
+    def __init__(self):
+        self.blocks = {}  # shared memory block, array over the whole block by the key
+
+
+    def reserve(self, key, rows, row_shape = (), dtype = np.int64):
+        """Returns the array of the key with at least the given number of rows.
+
+        Args:
+            key (str): name of the array
+            rows (int): number of needed rows
+            row_shape (tuple): shape of one row
+            dtype (type): type of the items
+
+        Returns:
+            ndarray: first 'rows' rows of the array
+        """
+        block = self.blocks.get(key)
+        if block is None or len(block[1]) < rows:
+            capacity = max(rows, 2 * len(block[1]) if block else 1)
+            if block is not None:
+                block = None
+                self.free(key)
+
+            nbytes = max(capacity * int(np.prod(row_shape)) * np.dtype(dtype).itemsize, 1)
+            memory = shared_memory.SharedMemory(create=True, size=nbytes)
+            array = np.ndarray((capacity,) + tuple(row_shape), dtype=dtype, buffer=memory.buf)
+            self.blocks[key] = (memory, array)
+
+        return self.blocks[key][1][:rows]
+
+
+    def publish(self, key, data):
+        """Copies the data into the shared array of the key.
+
+        Args:
+            key (str): name of the array
+            data (ndarray): published data
+
+        Returns:
+            ndarray: shared copy of the data
+        """
+        array = self.reserve(key, len(data), data.shape[1:], data.dtype)
+        array[:] = data
+        return array
+
+
+    def layout(self):
+        """Returns descriptions of the arrays the workers need to attach them, see view()"""
+        return {key: (memory.name, array.shape, array.dtype.str) for key, (memory, array) in self.blocks.items()}
+
+
+    def free(self, key):
+        """
+        Releases the shared memory block of the key.
+        """
+        memory, array = self.blocks.pop(key)
+        del array # the block cannot be closed while the array uses it
+        memory.close()
+        memory.unlink()
+
+
+    def close(self):
+        """
+        Releases all the shared memory blocks.
+        """
+        for key in list(self.blocks):
+            self.free(key)
+
+
+def view(layout, key):
+    """Attaches the shared array of the key in the worker process. The array stays attached
+        for the next batches until the main process replaces it by a larger one.
+
+    Args:
+        layout (dict): descriptions of the arrays, see SharedArena.layout()
+        key (str): name of the array
+
+    Returns:
+        ndarray: shared array
+    """
+    name, shape, dtype = layout[key]
+
+    if key in _attached and _attached[key][0] != name: # replaced by a larger array
+        _, memory, array = _attached.pop(key)
+        del array # the block cannot be closed while the array uses it
+        memory.close()
+
+    if key not in _attached:
+        memory = shared_memory.SharedMemory(name=name)
+        _attached[key] = (name, memory, np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf))
+
+    return _attached[key][2]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: test_linear.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the tests of the linear genome of the TGP.
+"""
+
+import random
+import unittest
+from tree import GPTree
+from linear import LinearTree
+
+
+class LinearTreeRandomTest(unittest.TestCase):
+
+    def test_random_tree_draws_as_gptree(self):
+        for seed in range(50):
+            random.seed(seed)
+            tree = GPTree()
+            tree.random_tree(grow=seed % 2 == 0, max_depth=5)
+            random.seed(seed)
+            linear = LinearTree()
+            linear.random_tree(grow=seed % 2 == 0, max_depth=5)
+            self.assertEqual(linear.serialize(), tree.serialize())
+
+
+class LinearTreeMutationTest(unittest.TestCase):
+
+    def test_mutation_out_of_range_returns_same_tree(self):
+        tree = LinearTree()
+        tree.random_tree(grow=False, max_depth=4)
+        self.assertIs(tree.mutation(len(tree.code) + 5), tree)
+
+    def test_mutation_in_range_keeps_valid_tree(self):
+        tree = LinearTree()
+        tree.random_tree(grow=False, max_depth=4)
+        mutated = tree.mutation(len(tree.code))
+        self.assertEqual(mutated.end(0), len(mutated.code))
+
+
+if __name__ == '__main__':
+    unittest.main()
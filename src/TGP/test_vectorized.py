@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: test_vectorized.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains the tests of the evaluator stepping the whole population together.
+"""
+
+import random
+import unittest
+import numpy as np
+import trails_plots
+from tree import GPTree
+from world import World
+from compiler import compile_tree
+from executor import evaluate_programs
+
+
+class VectorizedTest(unittest.TestCase):
+
+    def test_same_results_as_compiled(self):
+        random.seed(0)
+        programs = []
+        for i in range(300):
+            tree = GPTree()
+            tree.random_tree(grow=i % 2 == 0, max_depth=2 + i % 5)
+            programs.append(compile_tree(tree))
+        world = World(trails_plots.trail_santafe_32x32)
+
+        compiled = evaluate_programs(programs, world, engine='COMPILED')
+        vectorized = evaluate_programs(programs, world, engine='VECTORIZED')
+        for (fitness, trail, state, saved), expected in zip(vectorized, compiled):
+            self.assertEqual((fitness, state, saved), (expected[0], expected[2], expected[3]))
+            np.testing.assert_array_equal(trail, expected[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
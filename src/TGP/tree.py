@@ -15,9 +15,16 @@
 #    and provided under the terms of the GNU GENERAL PUBLIC LICENSE,                     #
 #    see https://www.gnu.org/licenses/gpl-3.0.txt                                        #
 
-import numpy as np
 from random import random, randint
-from init_params import MIN_DEPTH, MAX_DEPTH, TERMINALS, FUNCTIONS
+from weakref import WeakValueDictionary
+from ant import AntState
+from init_params import MIN_DEPTH, MAX_DEPTH, TERMINALS, FUNCTIONS, HASH_CONSING
+
+SYMBOLS = FUNCTIONS + TERMINALS  # symbols of the nodes by their indexes in serialized trees
+
+# shared sub-trees by their symbol and their shared sub-trees, see GPTree.interned(),
+# the nodes no longer referenced by any tree drop out of the table
+INTERNED = WeakValueDictionary()
 
 
 class GPTree:
@@ -32,16 +39,91 @@ class GPTree:
         self.middle = middle  # reference to mid sub-tree
         self.right = right  # reference to right sub-tree
         self.fitness = 0 
-        self.trail = [[0,0]]
-        self.ant = { 'pos': [0,0], 'dir': 'right' } # holds ant's position and direction in 2d matrix
+        self.ant = None # holds ant's position, direction and trail, allocated only for evaluated trees
+        self.struct_hash = None # cached structural hash of the sub-tree, None when not computed yet
+        self.measures = None # cached size, height and number of nodes of the sub-tree, None when not computed yet
+
+
+    @property
+    def trail(self):
+        """Returns ant's trail as an array of [x, y] pairs"""
+        return self.ant.trail
 
 
     def reset_ant_info(self):
         """ 
         Resets information about ant's position and direction.
         """
-        self.trail = [[0,0]]
-        self.ant = { 'pos': [0,0], 'dir': 'right' }
+        if self.ant is None:
+            self.ant = AntState()
+        else:
+            self.ant.reset()
+
+
+    def structural_hash(self):
+        """Counts hash of the tree from the hashes of its sub-trees (Merkle tree).
+            Only the sub-trees executed by the node take part, so the trees
+            interpreted in the same way have the same hash. The hash is cached
+            in the nodes, the operators changing the tree have to drop it.
+
+        Returns:
+            int: structural hash
+        """
+        if self.struct_hash is None:
+            if self.data == 'PROGN3':
+                children = (self.left, self.middle, self.right)
+            elif self.data in FUNCTIONS:
+                children = (self.left, self.right)
+            else:
+                children = ()
+
+            self.struct_hash = hash((self.data,) + tuple(child.structural_hash() for child in children))
+
+        return self.struct_hash
+
+
+    def serialize(self):
+        """Serializes the tree into bytes, one byte per node in prefix order. The lowest three
+            bits hold the index of the node's symbol in SYMBOLS, the next three bits tell
+            whether the node has the left, the middle and the right sub-tree.
+
+        Returns:
+            bytes: serialized tree
+        """
+        data = bytearray()
+        self._serialize(data)
+        return bytes(data)
+
+
+    def _serialize(self, data):
+        data.append(SYMBOLS.index(self.data) | (self.left is not None) << 3
+                    | (self.middle is not None) << 4 | (self.right is not None) << 5)
+        for child in (self.left, self.middle, self.right):
+            if child is not None:
+                child._serialize(data)
+
+
+    @staticmethod
+    def deserialize(data):
+        """Creates the tree serialized by serialize().
+
+        Args:
+            data (bytes): serialized tree
+
+        Returns:
+            GPTree: tree
+        """
+        return GPTree._deserialize(iter(data))
+
+
+    @staticmethod
+    def _deserialize(nodes):
+        node = next(nodes)
+        tree = GPTree(SYMBOLS[node & 7])
+        if node & 8: tree.left = GPTree._deserialize(nodes)
+        if node & 16: tree.middle = GPTree._deserialize(nodes)
+        if node & 32: tree.right = GPTree._deserialize(nodes)
+        return tree
 
 
     def random_tree(self, grow, max_depth, depth = 0, mutation = False):
@@ -78,18 +160,12 @@ class GPTree:
 
 
     def size(self):
-        """Counts size of the tree.
+        """Counts size of the tree, the terminals are counted without their sub-trees.
 
         Returns:
             int: size
         """
-        if self.data in TERMINALS: return 1
-
-        l = self.left.size() if self.left else 0
-        m = self.middle.size() if self.middle else 0
-        r = self.right.size() if self.right else 0
-
-        return 1 + l + r + m
+        return self._measure()[0]
 
 
     def height(self):
@@ -98,14 +174,28 @@ class GPTree:
         Returns:
             int: height
         """
-        left, middle, right = 0, 0, 0
-        if self == None: return 0    
+        return self._measure()[1]
 
-        if self.left: left = self.left.height()
-        if self.middle: middle = self.middle.height()
-        if self.right: right = self.right.height()
 
-        return max(left, middle, right) + 1
+    def _measure(self):
+        """Counts size, height and number of all the nodes of the sub-tree (the sub-trees left
+            under terminals by mutation are counted too, see find_node()) from the cached
+            measures of its sub-trees. The nodes are never changed once built, see copy(),
+            so the measures are cached in them. A changed tree has new nodes only on the path
+            to the change and only they are counted again.
+
+        Returns:
+            tuple: size, height and number of nodes
+        """
+        if self.measures is None:
+            children = [child._measure() for child in (self.left, self.middle, self.right) if child]
+
+            size = 1 if self.data in TERMINALS else 1 + sum(child[0] for child in children)
+            height = 1 + max([child[1] for child in children], default=0)
+            nodes = 1 + sum(child[2] for child in children)
+            self.measures = (size, height, nodes)
+
+        return self.measures
 
 
     def print_tree(self, prefix = "", depth = 0):
@@ -127,108 +217,270 @@ class GPTree:
     def build_subtree(self):
         t = GPTree()
         t.data = self.data
+        t.struct_hash = self.struct_hash
+        t.measures = self.measures
         if self.left: t.left = self.left.build_subtree()
         if self.middle: t.middle = self.middle.build_subtree()
         if self.right: t.right = self.right.build_subtree()
         return t
 
 
-    def scan_tree(self, count, second):  # note: count is list, so it's passed "by reference"
-        count[0] -= 1
-        if count[0] <= 1:
-            if not second: # return subtree rooted here
-                return self.build_subtree()
-            else: # glue subtree here
-                self.data = second.data
-                self.left = second.left
-                self.middle = second.middle
-                self.right = second.right
-                return self.build_subtree()
-        else:
-            ret = None
-            if self.left and count[0] > 1: ret = self.left.scan_tree(count, second)
-            if self.middle and count[0] > 1: ret = self.middle.scan_tree(count, second)
-            if self.right and count[0] > 1: ret = self.right.scan_tree(count, second)
-            return ret
-    
+    def copy(self):
+        """Copies the root of the tree, the sub-trees are shared. The operators never change
+            the nodes of a tree in place, they copy only the nodes they change, so the trees
+            of the population can share their sub-trees.
+
+        Returns:
+            GPTree: copy of the tree
+        """
+        tree = GPTree(self.data, self.left, self.middle, self.right)
+        tree.fitness = self.fitness
+        tree.struct_hash = self.struct_hash
+        tree.measures = self.measures
+        return tree
+
+
+    def share(self):
+        """Replaces the sub-trees of the tree by the shared ones, see interned(), when HASH_CONSING
+            is turned on. The root stays owned by the tree, it holds the fitness and the ant.
+
+        Returns:
+            GPTree: tree with the shared sub-trees, the tree itself when turned off or already shared
+        """
+        if not HASH_CONSING:
+            return self
+
+        children = [child.interned() if child else None for child in (self.left, self.middle, self.right)]
+        if children == [self.left, self.middle, self.right]:
+            return self
+        tree = GPTree(self.data, *children)
+        tree.fitness = self.fitness
+        tree.struct_hash = self.struct_hash
+        tree.measures = self.measures
+        return tree
+
+
+    def interned(self):
+        """Returns the shared node of the population equal to the sub-tree (hash consing).
+            The equal sub-trees of all the trees are one object, so they are stored once and
+            their hashes and measures are counted once. Two sub-trees made of the shared
+            nodes are equal just when they are the same object. Only the nodes not shared
+            yet are visited, i.e. the path copied by replace_node() or a new random tree.
+
+        Returns:
+            GPTree: shared sub-tree
+        """
+        if INTERNED.get((self.data, self.left, self.middle, self.right)) is self:
+            return self
+
+        # the nodes are compared by identity, so the key is equal for the same shared sub-trees
+        key = (self.data,) + tuple(child.interned() if child else None for child in (self.left, self.middle, self.right))
+        node = INTERNED.get(key)
+        if node is None:
+            if key[1:] == (self.left, self.middle, self.right):
+                node = self
+            else:
+                node = GPTree(*key)
+                node.struct_hash = self.struct_hash
+                node.measures = self.measures
+            INTERNED[key] = node
+
+        return node
+
+
+    def find_node(self, point):
+        """Returns the node at the point, the node is not copied. The point counts the nodes
+            in prefix order from 2 (2 and less is the root, 3 its first sub-tree etc.),
+            the sub-trees left under terminals by mutation are counted too. The node
+            is found in O(depth) by the cached numbers of the nodes of the sub-trees.
+
+        Args:
+            point (int): point in the tree
+
+        Returns:
+            GPTree: sub-tree rooted at the point, None when the tree is smaller
+        """
+        path = self._path(point)
+        return path[-1][0] if path is not None else None
+
+
+    def replace_node(self, point, change):
+        """Copies the path from the root to the node at the point, see find_node(), the copy
+            of the node is changed by the function. The nodes off the path are shared.
+
+        Args:
+            point (int): point in the tree
+            change (function): changes the copy of the node in place
+
+        Returns:
+            GPTree: changed copy of the tree, None when the tree is smaller
+        """
+        path = self._path(point)
+        if path is None:
+            return None
+
+        node, _ = path.pop()
+        tree = GPTree(node.data, node.left, node.middle, node.right)
+        change(tree)
+
+        # the path changes, its nodes are copied without the cached hashes and measures
+        while path:
+            node, slot = path.pop()
+            children = [node.left, node.middle, node.right]
+            children[slot] = tree
+            tree = GPTree(node.data, *children)
+        return tree
+
+
+    def _path(self, point):
+        """
+        Returns the path from the root to the node at the point, see find_node(), as pairs
+        of the node and the slot (0 left, 1 middle, 2 right) of the next node of the path.
+        """
+        position = max(point - 1, 1) # position of the node in prefix order
+        if position > self._measure()[2]:
+            return None
+
+        path = [(self, None)]
+        while position > 1:
+            position -= 1
+            node, _ = path[-1]
+            for slot, child in enumerate((node.left, node.middle, node.right)):
+                if child:
+                    nodes = child._measure()[2]
+                    if position <= nodes:
+                        path[-1] = (node, slot)
+                        path.append((child, None))
+                        break
+                    position -= nodes
+        return path
+
+
     def align_tree(self, depth = 0):
         """When maximal depth is exceeded, the tree is aligned with terminal symobls
         
         Args:
             depth (int): depth of the tree
+
+        Returns:
+            GPTree: aligned tree, it is the tree itself when nothing has to be cut
         """
 
         # when reaches maximal depth, asks whether the current data are terminals
-        # if not, set it to a random chosen terminal symbol and set references to
-        # sub-trees to None
+        # if not, set it to a random chosen terminal symbol and drop the references
+        # to sub-trees
         if depth == MAX_DEPTH - 1:
+            if self.data in TERMINALS and not (self.left or self.middle or self.right):
+                return self
             if not self.data in TERMINALS:
-                self.data = TERMINALS[randint(0, len(TERMINALS)-1)]
-            self.left = None
-            self.middle = None
-            self.right = None
-            return
-        
-        # else just travel recursively in the tree
-        else:
-            ret = None
-            if self.left: self.left.align_tree(depth + 1)
-            if self.middle: self.middle.align_tree(depth + 1)
-            if self.right: self.right.align_tree(depth + 1)
-            return ret
+                return GPTree(TERMINALS[randint(0, len(TERMINALS)-1)])
+            return GPTree(self.data)
+
+        # else just travel recursively in the tree, the nodes above a cut are copied
+        children = [child.align_tree(depth + 1) if child else None for child in (self.left, self.middle, self.right)]
+        if children == [self.left, self.middle, self.right]:
+            return self
+        return GPTree(self.data, *children)
 
 
     def crossover(self, other):
-        """Crossover variation operator with choosing random point in each parent
+        """Crossover variation operator with choosing random point in each parent.
+            Neither of the parents is changed.
 
         Args:
             other (GPTree): second parent, the first parent is "self"
+
+        Returns:
+            GPTree: offspring
         """
 
         cross_point = randint(1, other.size())  # choose cross-point in second parent
-        second = other.scan_tree([cross_point], None) # return the part of the second tree after cross-point
+        second = other.find_node(cross_point) # the part of the second tree after cross-point
 
         cross_point2 = randint(1, self.size())  # select cross-point in the first tree
-        # glue the part of the "second" tree to this one and create new offspring
-        self.scan_tree([cross_point2], second)  
+        # glue the part of the "second" tree to the copy of this one and create new offspring
+        return self.replace_node(cross_point2, lambda node: node._glue(second)) or self
 
 
-    def mutation(self, mut_point):
-        """Mutation variation operator randomly choosing a point in the tree and then 
-        performs mutation with the maximal depth of 2 in the new subtree
+    def bounded_crossover(self, other):
+        """Crossover variation operator choosing the sub-tree of the second parent only among
+            those fitting MAX_DEPTH at the cross-point in the first parent, so the offspring
+            of the parents within the limit is within it too (the initial trees may be one
+            level higher, below MAX_DEPTH only the leaves fit). The sub-trees are found by
+            the cached heights and numbers of nodes, neither of the parents is changed.
 
         Args:
-            mut_point (int): mutation point in the tree
+            other (GPTree): second parent, the first parent is "self"
+
+        Returns:
+            GPTree: offspring
         """
+        cross_point = randint(1, self.size())  # select cross-point in the first tree
+        path = self._path(cross_point)
+        if path is None:
+            return self
+        limit = max(MAX_DEPTH - len(path) + 1, 1) # maximal height of the sub-tree at the depth of the cross-point
 
-        mut_point[0] -= 1  # decrement mutation point by one
+        # every tree has a leaf, so at least one sub-tree of the second tree fits
+        second = other._fitting_node(randint(1, other._fitting(limit)), limit)
+        return self.replace_node(cross_point, lambda node: node._glue(second))
 
-        if mut_point[0] <= 1:  # perform mutation
-            self.random_tree(grow=True, max_depth=2, mutation=True)
 
-        else: # else recursively search the tree
-            ret = None
-            if self.left and mut_point[0] > 1: ret = self.left.mutation(mut_point)
-            if self.middle and mut_point[0] > 1: ret = self.middle.mutation(mut_point)
-            if self.right and mut_point[0] > 1: ret = self.right.mutation(mut_point)
-            return ret
+    def _fitting(self, limit):
+        """
+        Returns the number of the nodes of the sub-tree whose sub-trees are not higher than the limit.
+        """
+        _, height, nodes = self._measure()
+        if height <= limit:
+            return nodes
+        return sum(child._fitting(limit) for child in (self.left, self.middle, self.right) if child)
+
+
+    def _fitting_node(self, index, limit):
+        """
+        Returns the node of the index among the nodes counted by _fitting() in prefix order.
+        """
+        if self._measure()[1] <= limit:
+            return self.find_node(index + 1)
+        for child in (self.left, self.middle, self.right):
+            if child:
+                nodes = child._fitting(limit)
+                if index <= nodes:
+                    return child._fitting_node(index, limit)
+                index -= nodes
 
-    def count_fitness(self, array):
-        """ Fitness function, which counts number of ones (1) present in the array
+
+    def _glue(self, second):
+        self.data = second.data
+        self.left = second.left
+        self.middle = second.middle
+        self.right = second.right
+        self.struct_hash = second.struct_hash
+        self.measures = second.measures
+
+
+    def mutation(self, mut_point):
+        """Mutation variation operator randomly choosing a point in the tree and then 
+        performs mutation with the maximal depth of 2 in the new subtree. The tree
+        is not changed, only the path to the point is copied.
 
         Args:
-            individual (GPTree): the tree 
-            ant_path (array): ant's trail
-            array (array): food tiles
+            mut_point (int): mutation point in the tree, see find_node()
 
         Returns:
-            int: fitness value
+            GPTree: mutated tree
         """
-        fitness_value = None
+        return self.replace_node(mut_point, lambda node: node.random_tree(grow=True, max_depth=2, mutation=True)) or self
 
-        for point in self.trail:
-            array[point[0]][point[1]] = 2
-        fitness_value = np.count_nonzero(array == 1)
-        self.fitness = fitness_value  
+    def count_fitness(self, world):
+        """ Fitness function, which counts the food cells not eaten by the ant
+
+        Args:
+            world (World): food map with the food eaten by the ant
+
+        Returns:
+            int: fitness value
+        """
+        self.fitness = world.remaining_food()
 
-        return fitness_value
\ No newline at end of file
+        return self.fitness
\ No newline at end of file
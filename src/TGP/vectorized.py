@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    file: vectorized.py
+    author: Tadeáš Kachyňa, <xkachy00@fit.vutbr.cz>
+    date: 18/10/2026
+    brief: This file contains an evaluator stepping the ants of the whole population
+           together, one opcode of the compiled programs per step.
+"""
+
+import numpy as np
+from itertools import chain
+from compiler import OP_MOVE, OP_LEFT, OP_RIGHT, OP_IF_FOOD_AHEAD, OP_BITS, OP_MASK
+from ant import TURN_LEFT, TURN_RIGHT, RIGHT
+from init_params import POS_X, POS_Y, MAX_TIME, MAX_ANT_TRAIL_LEN, CYCLE_DETECTION
+
+OP_HALT = OP_MASK + 1  # opcode of the finished ants, it changes nothing and jumps to itself
+
+# with fewer active ants a step of the arrays costs more than interpreting their opcodes
+# one by one, so the last ants finish their walks without NumPy
+SCALAR_ANTS = 128
+
+HISTORY_PASSES = 64  # passes kept for the cycle detection at first, the history doubles when needed
+CYCLE_CHUNK = 1024  # ants whose cycles are completed at once, bounds the temporary arrays
+
+
+def step_tables(world):
+    """Precomputes the effect of every opcode on the ant in every state, the state
+        of the ant is the index of its cell * 8 + its direction.
+
+    Args:
+        world (World): food map of the trail
+
+    Returns:
+        tuple: next states and 1 where the ant moved by the opcode * number of states + state,
+               1 where the food is ahead of the ant by the state
+    """
+    states = world.cells * 8
+    state = np.arange(states)
+    cell, direction = state >> 3, state & 7
+    ahead = np.array(world.ahead[:states], dtype=np.int64)
+    blocked = ahead == world.off_grid
+
+    step = np.empty((OP_HALT + 1, states), dtype=np.int64)
+    step[OP_MOVE] = np.where(blocked, state, ahead * 8 + direction)
+    step[OP_LEFT] = cell * 8 + np.array(TURN_LEFT)[direction]
+    step[OP_RIGHT] = cell * 8 + np.array(TURN_RIGHT)[direction]
+    step[OP_IF_FOOD_AHEAD] = state
+    step[OP_HALT] = state
+
+    moved = np.zeros((OP_HALT + 1, states), dtype=np.int64)
+    moved[OP_MOVE] = ~blocked
+
+    food = np.frombuffer(bytes(world.food), dtype=np.uint8)
+    return step.ravel(), moved.ravel(), food[ahead].astype(np.int64)
+
+
+def pack_programs(codes, states):
+    """Packs compiled programs one after another into arrays of opcodes and jump targets,
+        the last instruction is the program of the finished ants. The end of a program
+        is the start of the next one, so the ends of the passes are found by the program
+        counters only. The targets are indexes into the whole arrays, the targets after
+        food ahead of the ant follow all the targets after no food.
+
+    Args:
+        codes (list): compiled programs
+        states (int): number of the states of the ant, see step_tables()
+
+    Returns:
+        tuple: opcodes * states, jump targets, starts of the programs, their lengths
+               and their numbers of MOVE opcodes
+    """
+    lengths = np.array([len(code) for code in codes], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    code = np.fromiter(chain.from_iterable(codes), dtype=np.int64, count=int(lengths.sum()))
+    offsets = np.repeat(starts, lengths)
+
+    ops = np.append(code & OP_MASK, OP_HALT)
+    targets = np.append((code >> OP_BITS) + offsets, len(code))
+    moves = np.add.reduceat(ops[:-1] == OP_MOVE, starts)
+
+    # true branch of IF_FOOD_AHEAD follows the condition, everything else jumps to its target
+    food_targets = np.where(ops == OP_IF_FOOD_AHEAD, np.arange(len(ops)) + 1, targets)
+
+    return ops * states, np.concatenate((targets, food_targets)), starts, lengths, moves
+
+
+def run_vectorized(codes, world):
+    """Interprets all the compiled programs at once. Every ant executes one opcode per step
+        by looking its new state up in the tables of step_tables(). The finished ants are
+        parked on the program of OP_HALT and dropped out of the arrays once there are enough
+        of them, the last SCALAR_ANTS ants finish their walks in finish_walk(). Ants starting
+        a pass in the same state as before are in a cycle and they are finished right away,
+        the same way as in run_passes() in ant.py, their trails are completed by complete_cycles().
+
+    Args:
+        codes (list): compiled programs
+        world (World): food map of the trail
+
+    Returns:
+        tuple: fitness values, trails as cell indexes, their lengths, final states
+               of the ants (cell, direction) and the numbers of skipped passes
+    """
+    count = len(codes)
+    states = world.cells * 8
+    step, moved, food_ahead = step_tables(world)
+    ops, jumps, program_starts, lengths, moves = pack_programs(codes, states)
+    food_offset = food_ahead * len(ops)  # offset of the targets after food ahead by the state
+    halt = len(ops) - 1
+
+    # a pass of the program can not make more moves than the number of MOVE opcodes
+    capacity = MAX_ANT_TRAIL_LEN + 1 + int(moves.max())
+    trails = np.full((count, capacity), RIGHT, dtype=np.int64)  # states of the ant starting in the cell 0, not cast at every step
+    flat_trails = trails.ravel()
+
+    final_state = np.full(count, RIGHT, dtype=np.int64)
+    final_len = np.ones(count, dtype=np.int64)
+
+    # states and trail lengths at the start of the passes of each ant and a bit for every
+    # state the ant has started a pass in, the first pass of a cycle is looked up in the history
+    if CYCLE_DETECTION:
+        history_states = np.zeros((count, min(HISTORY_PASSES, MAX_TIME + 1)), dtype=np.min_scalar_type(states))
+        history_starts = np.zeros(history_states.shape, dtype=np.min_scalar_type(capacity))
+        history_states[:, 0], history_starts[:, 0] = RIGHT, 1
+        seen = np.zeros((count, states // 8), dtype=np.uint8)
+        seen[:, RIGHT >> 3] = 1 << (RIGHT & 7)
+        flat_seen, seen_bit = seen.ravel(), (1 << (np.arange(states) & 7)).astype(np.uint8)
+    detected = {}  # time each ant got into a cycle
+
+    # states of the active ants, 'ids' maps them back to their programs, the program counters,
+    # ends of the programs and positions behind the trails are indexes into the whole arrays
+    ids = np.arange(count)
+    if MAX_TIME <= 0 or MAX_ANT_TRAIL_LEN < 1:
+        ids = ids[:0]
+    base = program_starts[ids]
+    end = base + lengths[ids]  # -1 for the finished ants
+    row = ids * capacity
+    pc = base.copy()
+    state = np.full(len(ids), RIGHT, dtype=np.int64)
+    time = np.zeros(len(ids), dtype=np.int64)
+    trail_end = row + 1
+    halted = 0
+
+    while len(ids) - halted > SCALAR_ANTS:
+        code = ops[pc]
+        code += state
+        pc = jumps[food_offset[state] + pc]
+        state = step[code]
+
+        # the state is written behind the trail by every ant, only the moves make it longer
+        flat_trails[trail_end] = state
+        trail_end += moved[code]
+
+        # end of the pass, the terminating conditions are checked only here
+        finished_pass = (pc == end).nonzero()[0]
+        if not len(finished_pass):
+            continue
+
+        pc[finished_pass] = base[finished_pass]
+        now = time[finished_pass] + 1
+        time[finished_pass] = now
+        trail_len = trail_end[finished_pass] - row[finished_pass]
+        stop = (now >= MAX_TIME) | (trail_len > MAX_ANT_TRAIL_LEN)
+
+        # the history and the marks are written for the stopped ants too, they are not used then
+        if CYCLE_DETECTION:
+            started, start = ids[finished_pass], state[finished_pass]
+            if history_states.shape[1] <= MAX_TIME and now.max() >= history_states.shape[1]:
+                passes = min(2 * history_states.shape[1], MAX_TIME + 1)
+                history_states = np.pad(history_states, ((0, 0), (0, passes - history_states.shape[1])))
+                history_starts = np.pad(history_starts, ((0, 0), (0, passes - history_starts.shape[1])))
+            history_states[started, now], history_starts[started, now] = start, trail_len
+
+            marks, bit = started * (states // 8) + (start >> 3), seen_bit[start]
+            marked = flat_seen[marks]
+            flat_seen[marks] = marked | bit
+            cycled = ((marked & bit) != 0) & ~stop
+            if cycled.any():
+                for i, detected_time in zip(ids[finished_pass[cycled]].tolist(), now[cycled].tolist()):
+                    detected[i] = detected_time
+                stop |= cycled
+
+        done = finished_pass[stop]
+        if len(done):
+            finished = ids[done]
+            final_state[finished], final_len[finished] = state[done], trail_len[stop]
+            pc[done], base[done], end[done] = halt, halt, -1
+            halted += len(done)
+
+            # drops the finished ants once they are a quarter of the arrays
+            if 4 * halted >= len(ids):
+                active = end >= 0
+                ids, base, end, row, pc = ids[active], base[active], end[active], row[active], pc[active]
+                state, time, trail_end = state[active], time[active], trail_end[active]
+                halted = 0
+
+    # the last ants walk one by one
+    if len(ids) > halted:
+        tables = step.tolist(), moved.tolist(), food_ahead.tolist()
+        for lane in np.flatnonzero(end >= 0):
+            i, now, start, stop = int(ids[lane]), int(time[lane]), int(base[lane]), int(end[lane])
+            program = (ops[start:stop].tolist(), (jumps[start:stop] - start).tolist(),
+                       (jumps[len(ops) + start:len(ops) + stop] - start).tolist())
+            history = ((history_states[i, :now + 1].tolist(), history_starts[i, :now + 1].tolist())
+                       if CYCLE_DETECTION else ([], []))
+            trail = trails[i, :trail_end[lane] - row[lane]].tolist()
+
+            final_state[i], now, cycled = finish_walk(program, tables, int(pc[lane]) - start, stop - start,
+                                                      int(state[lane]), now, trail, history)
+            trails[i, :len(trail)], final_len[i] = trail, len(trail)
+            if cycled:
+                if now >= history_states.shape[1]:
+                    history_states = np.pad(history_states, ((0, 0), (0, now + 1 - history_states.shape[1])))
+                    history_starts = np.pad(history_starts, ((0, 0), (0, now + 1 - history_starts.shape[1])))
+                history_states[i, :now + 1], history_starts[i, :now + 1] = history
+                detected[i] = now
+
+    saved = np.zeros(count, dtype=np.int64)  # passes skipped by the ants in a cycle
+    if detected:
+        cycled, times = np.array(list(detected.keys())), np.array(list(detected.values()))
+        for chunk in range(0, len(cycled), CYCLE_CHUNK):
+            ants, now = cycled[chunk:chunk + CYCLE_CHUNK], times[chunk:chunk + CYCLE_CHUNK]
+            passes = int(now.max()) + 1
+            final_state[ants], saved[ants] = complete_cycles(trails, final_len, ants, now, history_states[:, :passes],
+                                                             history_starts[:, :passes])
+
+    trails >>= 3  # cells of the states
+
+    # number of distinct cells with food visited by each ant
+    food = np.frombuffer(bytes(world.food), dtype=np.uint8) == 1  # the last cell is off the grid
+    visited = np.zeros((count, world.cells + 1), dtype=bool)
+    rows = np.repeat(np.arange(count), final_len)
+    columns = trails[np.arange(capacity) < final_len[:, None]]
+    visited[rows, columns] = True
+    fitnesses = np.count_nonzero(food[:-1]) - np.count_nonzero(visited & food, axis=1)
+
+    return fitnesses, trails, final_len, (final_state >> 3, final_state & 7), saved
+
+
+def finish_walk(program, tables, pc, end, state, time, trail, history):
+    """Continues the walk of a single ant with plain lists, see run_vectorized().
+
+    Args:
+        program (tuple): opcodes * number of states of the program and its jump targets
+                         after no food and after food ahead of the ant, see pack_programs()
+        tables (tuple): tables of step_tables() as lists
+        pc (int): program counter
+        end (int): length of the program
+        state (int): state of the ant (cell * 8 + direction)
+        time (int): current pass
+        trail (list): trail as states of the ant, the moves are appended to it
+        history (tuple): lists of the states and of the trail lengths at the start of the passes
+                         up to the current one, appended to when CYCLE_DETECTION is on
+
+    Returns:
+        tuple: final state of the ant, the time of its last pass and whether it got into a cycle
+    """
+    ops, jumps, food_jumps = program
+    step, moved, food_ahead = tables
+    states, starts = history
+    seen = set(states)
+
+    while True:
+        while pc != end:
+            code = ops[pc] + state
+            pc = food_jumps[pc] if food_ahead[state] else jumps[pc]
+            state = step[code]
+            if moved[code]:
+                trail.append(state)
+
+        pc = 0
+        time += 1
+        if time >= MAX_TIME or len(trail) > MAX_ANT_TRAIL_LEN:
+            return state, time, False
+
+        if CYCLE_DETECTION:
+            states.append(state)
+            starts.append(len(trail))
+            if state in seen:
+                return state, time, True
+            seen.add(state)
+
+
+def complete_cycles(trails, lengths, ants, detected, states, starts):
+    """Completes the trails of the ants which got into a cycle as if the passes of the cycle
+        had been interpreted, see _repeat_cycle() in ant.py.
+
+    Args:
+        trails (ndarray): trails of all the ants, the completed trails are written into them
+        lengths (ndarray): lengths of the trails of all the ants, updated
+        ants (ndarray): ants in a cycle
+        detected (ndarray): times the ants started a pass in the same state as before
+        states (ndarray): states of all the ants at the start of each pass
+        starts (ndarray): lengths of the trails of all the ants at the start of each pass
+
+    Returns:
+        tuple: final states of the ants and the numbers of the skipped passes
+    """
+    rows = np.arange(len(ants))
+    passes = np.arange(states.shape[1])
+    states, starts = states[ants].astype(np.int64), starts[ants].astype(np.int64)
+
+    # the cycle starts with the first pass started in the state of the ant at the detection
+    first = np.argmax((states == states[rows, detected][:, None]) & (passes < detected[:, None]), axis=1)
+    period = detected - first
+    begin, trail_len = starts[rows, first], starts[rows, detected]
+    cycle_len = trail_len - begin
+
+    # the pass is made while the trail is not longer than MAX_ANT_TRAIL_LEN at its start,
+    # 'grown' is the growth of the trail before each pass of the cycle
+    in_cycle = (passes >= first[:, None]) & (passes < detected[:, None])
+    grown = np.where(in_cycle, starts - begin[:, None], MAX_ANT_TRAIL_LEN + 1)
+    budget = MAX_ANT_TRAIL_LEN - trail_len
+    rounds = budget // np.maximum(cycle_len, 1)
+    fitting = np.count_nonzero(grown <= (budget - rounds * cycle_len)[:, None], axis=1)
+    skipped = np.where(cycle_len > 0, np.minimum(MAX_TIME - detected, rounds * period + fitting), MAX_TIME - detected)
+
+    last = first + skipped % period  # pass of the cycle the walk would continue with
+    added = skipped // period * cycle_len + starts[rows, last] - begin
+
+    # the trail goes on by repeating its part walked during the cycle
+    column = np.arange(trails.shape[1])
+    filled = (column >= trail_len[:, None]) & (column < (trail_len + added)[:, None])
+    source = np.where(filled, begin[:, None] + (column - trail_len[:, None]) % np.maximum(cycle_len, 1)[:, None], column)
+    trails[ants] = np.take_along_axis(trails[ants], source, axis=1)
+    lengths[ants] = trail_len + added
+
+    return states[rows, last], skipped
+
+
+def vectorized_results(codes, world):
+    """Evaluates all the compiled programs at once and splits the results by the programs.
+
+    Args:
+        codes (list): compiled programs, see compile_tree()
+        world (World): food map of the trail
+
+    Returns:
+        list: fitness, trail, final state of the ant and skipped passes for each program
+    """
+    fitnesses, trails, lengths, (cells, dirs), saved = run_vectorized(codes, world)
+
+    positions = np.empty(trails.shape + (2,), dtype=np.int16)
+    positions[..., POS_X], positions[..., POS_Y] = np.divmod(trails, world.size)
+    xs, ys = np.divmod(cells, world.size)
+
+    return [(fitness, positions[i, :length].copy(), (x, y, direction), skipped)
+            for i, (fitness, length, x, y, direction, skipped)
+            in enumerate(zip(fitnesses.tolist(), lengths.tolist(), xs.tolist(), ys.tolist(), dirs.tolist(), saved.tolist()))]